@@ -0,0 +1,54 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import ASYNC_DB, AsyncSessionLocal, SessionLocal
+from app.pagination import encode_cursor, page_size
+
+# -------- Read sessions for async endpoints --------
+# get_read_db yields an AsyncSession when ASYNC_DB=1, otherwise a plain
+# Session; read_all / read_first run a select() on either, so one async
+# endpoint body works in both modes.
+
+
+async def get_read_db():
+    if ASYNC_DB:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+
+async def read_all(db, statement):
+    if isinstance(db, AsyncSession):
+        return (await db.execute(statement)).all()
+    return await run_in_threadpool(lambda: db.execute(statement).all())
+
+
+async def read_first(db, statement):
+    rows = await read_all(db, statement.limit(1))
+    return rows[0] if rows else None
+
+
+async def end_read(db):
+    # Returns the connection to the pool before a long await (e.g. bcrypt)
+    if isinstance(db, AsyncSession):
+        await db.rollback()
+    else:
+        await run_in_threadpool(db.rollback)
+
+
+async def fetch_page_async(db, statement, limit, cursor_of):
+    # pagination.fetch_page for select() statements
+    size = page_size(limit)
+    rows = await read_all(db, statement.limit(size + 1))
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(*cursor_of(rows[-1]))
+    return rows, next_cursor
@@ -1,11 +1,14 @@
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.async_db import end_read, get_read_db, read_first
+from app.database import get_db
+from app.passwords import verify_password_async
 from app import models
+from app.services.principal_cache import Principal, principal_cache, principal_of
 from fastapi import HTTPException
 import os
 
@@ -13,27 +16,23 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-# Database dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# Verify password
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
 # Authenticate user
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(models.User).filter(models.User.email == email).first()
+# 🔥 Unknown emails are rejected on the lookup alone; only real accounts
+# queue for bcrypt on the password executor
+async def authenticate_user(db, email: str, password: str):
+    user = await read_first(
+        db,
+        select(models.User.email, models.User.role, models.User.password)
+        .where(models.User.email == email)
+    )
     if not user:
         return False
-    if not verify_password(password, user.password):
+
+    # Don't hold a pooled connection while queued for bcrypt
+    await end_read(db)
+    if not await verify_password_async(password, user.password):
         return False
     return user
 
@@ -44,31 +43,76 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-# Get current user from token
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def email_from_token(token: str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
+            raise credentials_exception()
     except JWTError:
-        raise credentials_exception
+        raise credentials_exception()
+    return email
+
+# Get current user from token
+# 🔥 Returns a Principal (id, email, role, name), served from principal_cache
+# when possible so most requests skip the users lookup entirely
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    email = email_from_token(token)
+
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
 
     user = db.query(models.User).filter(models.User.email == email).first()
     if user is None:
-        raise credentials_exception
-    return user
+        raise credentials_exception()
+
+    principal = principal_of(user)
+    principal_cache.put(email, principal)
+
+    # 🔥 End the read transaction so a request queued for the heavy executor
+    # does not pin a pooled connection (the session is shared with the endpoint)
+    db.rollback()
+    return principal
+
+# Same, for async endpoints (no threadpool hop when ASYNC_DB=1)
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db=Depends(get_read_db)):
+    email = email_from_token(token)
+
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+
+    row = await read_first(db, select(models.User).where(models.User.email == email))
+    if row is None:
+        raise credentials_exception()
+
+    principal = principal_of(row[0])
+    principal_cache.put(email, principal)
+    return principal
+
 def require_role(allowed_roles: list):
-    def role_checker(current_user: models.User = Depends(get_current_user)):
+    def role_checker(current_user: Principal = Depends(get_current_user)):
+        if current_user.role not in allowed_roles:
+            raise HTTPException(
+                status_code=403,
+                detail="Access forbidden: insufficient permissions"
+            )
+        return current_user
+    return role_checker
+def require_role_async(allowed_roles: list):
+    async def role_checker(current_user: Principal = Depends(get_current_user_async)):
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=403,
                 detail="Access forbidden: insufficient permissions"
             )
         return current_user
-    return role_checker
\ No newline at end of file
+    return role_checker
@@ -0,0 +1,354 @@
+# Bulk resume import: a directory or .zip of PDFs -> resumes rows, without
+# one /upload-resume call per file.
+#
+#   python -m app.bulk_import /data/resumes.zip --candidates candidates.csv \
+#       --workers 8 --batch-size 512
+#
+# --candidates maps every file to its candidate: a CSV with an email,filename
+# header (and an optional name column). Candidates are linked by email; missing
+# ones are created with the candidate role and an unusable random password.
+# Files without a row are reported as failed. Each candidate keeps one resume:
+# a file with the content the candidate already has is skipped, a different
+# one replaces it (new version, applications rescored) like a re-upload.
+#
+# Stages per batch: store (hash + content-addressed copy) -> parse (text,
+# skills, skill index on a process pool) -> embed (one large model.encode
+# call over the section-aware chunks of every resume) -> insert
+# (executemany). Files whose content was imported before are served from
+# the extraction cache and skip parse/embed.
+# Finished files are appended to a checkpoint file, so an interrupted import
+# resumes where it stopped.
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import argparse
+import csv
+import multiprocessing
+import os
+import secrets
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.database import SessionLocal
+from app.passwords import hash_password
+from app.services.ingestion import parse_resume
+from app.services.match_engine import encode_chunk_embeddings
+from app.services.match_scoring import refresh_user_scores
+from app.services.model_registry import get_model
+from app.services.resume_chunker import chunk_resume
+from app.services.resume_storage import EXTRACTION_VERSION, load_extraction, store_upload
+
+STAGES = ["store", "parse", "embed", "insert"]
+
+
+def list_sources(source):
+    # -> sorted list of (name, opener) for every PDF in a directory or zip
+    if zipfile.is_zipfile(source):
+        archive = zipfile.ZipFile(source)
+        return [
+            (name, lambda name=name: archive.open(name))
+            for name in sorted(archive.namelist())
+            if name.lower().endswith(".pdf")
+        ]
+
+    paths = []
+    for dirpath, _, filenames in os.walk(source):
+        paths.extend(os.path.join(dirpath, f) for f in filenames if f.lower().endswith(".pdf"))
+    return [
+        (os.path.relpath(path, source), lambda path=path: open(path, "rb"))
+        for path in sorted(paths)
+    ]
+
+
+def read_candidates(path):
+    # -> {filename: (email, name)}; every file and every email appears once
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        missing = {"email", "filename"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"{path}: missing column(s) {', '.join(sorted(missing))}")
+
+        candidates = {}
+        emails = set()
+        for line, row in enumerate(reader, start=2):
+            filename = (row["filename"] or "").strip()
+            email = (row["email"] or "").strip().lower()
+            if not filename or not email:
+                raise ValueError(f"{path}:{line}: email and filename are required")
+            if filename in candidates:
+                raise ValueError(f"{path}:{line}: {filename} is listed twice")
+            if email in emails:
+                raise ValueError(f"{path}:{line}: {email} is listed twice, a candidate has one resume")
+            emails.add(email)
+            name = (row.get("name") or "").strip() or email.split("@")[0]
+            candidates[filename] = (email, name)
+    return candidates
+
+
+def resolve_users(db, candidates, password):
+    # {email: name} -> {email: user_id}; creates the missing candidates.
+    # Existing accounts with another role are left out.
+    def lookup():
+        return db.query(models.User.email, models.User.id, models.User.role).filter(
+            models.User.email.in_(list(candidates))
+        ).all()
+
+    found = lookup()
+    known = {row.email.lower() for row in found}
+    new = [email for email in candidates if email not in known]
+    if new:
+        db.execute(insert(models.User), [
+            {"name": candidates[email], "email": email, "password": password, "role": "candidate"}
+            for email in new
+        ])
+        found = lookup()
+    return {row.email.lower(): row.id for row in found if row.role == "candidate"}
+
+
+def read_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+class StageTimer:
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.items = dict.fromkeys(STAGES, 0)
+
+    def add(self, stage, started, items):
+        self.seconds[stage] += time.perf_counter() - started
+        self.items[stage] += items
+
+    def report(self):
+        return "  ".join(
+            f"{stage} {self.items[stage] / self.seconds[stage]:.1f}/s"
+            if self.seconds[stage] else f"{stage} -"
+            for stage in STAGES
+        )
+
+
+def insert_extractions(db, rows):
+    # An API upload of the same file may cache its extraction between
+    # load_extraction and here: keep that row instead of failing the batch
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        statement = mysql.insert(models.ResumeExtraction)
+        statement = statement.on_duplicate_key_update(content_hash=statement.inserted.content_hash)
+    elif dialect in ("postgresql", "sqlite"):
+        module = postgresql if dialect == "postgresql" else sqlite
+        statement = module.insert(models.ResumeExtraction).on_conflict_do_nothing()
+    else:
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(models.ResumeExtraction), [row])
+            except IntegrityError:
+                pass
+        return
+    db.execute(statement, rows)
+
+
+def import_batch(db, pool, batch, candidates, password, timer, max_bytes, embed_batch_size):
+    # batch: list of (name, opener) -> (imported names, failed names)
+    failed = [(name, "no row in --candidates") for name, _ in batch if name not in candidates]
+    batch = [(name, opener) for name, opener in batch if name in candidates]
+
+    # 🔥 One lookup for the batch's candidates and their current resumes
+    user_ids = resolve_users(db, {candidates[name][0]: candidates[name][1] for name, _ in batch}, password)
+    for name, _ in batch:
+        if candidates[name][0] not in user_ids:
+            failed.append((name, f"{candidates[name][0]} is not a candidate account"))
+    batch = [(name, opener) for name, opener in batch if candidates[name][0] in user_ids]
+    existing = {
+        row.user_id: row
+        for row in db.query(
+            models.Resume.user_id, models.Resume.id, models.Resume.content_hash, models.Resume.version
+        ).filter(models.Resume.user_id.in_(list(user_ids.values()))).all()
+    }
+
+    started = time.perf_counter()
+    stored = []
+    for name, opener in batch:
+        try:
+            with opener() as stream:
+                content_hash, path = store_upload(stream, max_bytes)
+            stored.append((name, content_hash, path))
+        except Exception as e:
+            failed.append((name, e))
+    timer.add("store", started, len(batch))
+
+    results = {}
+    for _, content_hash, _ in stored:
+        if content_hash not in results:
+            cached = load_extraction(db, content_hash)
+            if cached:
+                results[content_hash] = cached
+    todo = {content_hash: path for _, content_hash, path in stored if content_hash not in results}
+    new_hashes = list(todo)
+
+    # 🔥 PDF parsing fans out over the process pool
+    started = time.perf_counter()
+    errors = {}
+    parsed = pool.map(_safe_parse, [todo[h] for h in new_hashes], chunksize=4)
+    for content_hash, result in zip(new_hashes, parsed):
+        if isinstance(result, Exception):
+            errors[content_hash] = result
+        else:
+            results[content_hash] = result
+    timer.add("parse", started, len(new_hashes))
+
+    # 🔥 One encode call for the chunks of the whole batch
+    started = time.perf_counter()
+    new_hashes = [h for h in new_hashes if h not in errors]
+    if new_hashes:
+        chunks = [chunk_resume(results[h]["text"]) for h in new_hashes]
+        vectors = get_model("embedding").encode(
+            [chunk for resume_chunks in chunks for chunk in resume_chunks],
+            batch_size=embed_batch_size
+        )
+        offset = 0
+        for content_hash, resume_chunks in zip(new_hashes, chunks):
+            results[content_hash]["embedding"], results[content_hash]["chunk_embeddings"] = (
+                encode_chunk_embeddings(vectors[offset:offset + len(resume_chunks)])
+            )
+            offset += len(resume_chunks)
+    timer.add("embed", started, len(new_hashes))
+
+    # 🔥 executemany inserts/updates for the resumes and the new cache entries
+    started = time.perf_counter()
+    rows = []
+    replaced = []
+    imported = []
+    for name, content_hash, path in stored:
+        if content_hash in errors:
+            failed.append((name, errors[content_hash]))
+            continue
+        user_id = user_ids[candidates[name][0]]
+        current = existing.get(user_id)
+        imported.append(name)
+        # Reruns: the candidate already has this exact file
+        if current and current.content_hash == content_hash:
+            continue
+
+        result = results[content_hash]
+        row = {
+            "extracted_text": result["text"],
+            "extracted_skills": ", ".join(result["skills"]),
+            "skill_index": result["skill_index"],
+            "embedding": result["embedding"],
+            "chunk_embeddings": result.get("chunk_embeddings"),
+            "file_path": path,
+            "content_hash": content_hash,
+            "processing_status": "ready"
+        }
+        if current:
+            replaced.append(user_id)
+            row.update(id=current.id, version=(current.version or 1) + 1)
+        else:
+            row.update(user_id=user_id, version=1)
+        rows.append(row)
+
+    if rows:
+        new_rows = [row for row in rows if "id" not in row]
+        if new_rows:
+            db.execute(insert(models.Resume), new_rows)
+        if replaced:
+            db.execute(update(models.Resume), [row for row in rows if "id" in row])
+    if new_hashes:
+        insert_extractions(db, [
+            {
+                "content_hash": content_hash,
+                "extraction_version": EXTRACTION_VERSION,
+                "extracted_text": results[content_hash]["text"],
+                "extracted_skills": ", ".join(results[content_hash]["skills"]),
+                "skill_index": results[content_hash]["skill_index"],
+                "embedding": results[content_hash]["embedding"],
+                "chunk_embeddings": results[content_hash]["chunk_embeddings"]
+            }
+            for content_hash in new_hashes
+        ])
+    db.commit()
+
+    # Replaced resumes have applications scored against the old version
+    for user_id in replaced:
+        refresh_user_scores(db, user_id)
+        db.commit()
+    timer.add("insert", started, len(rows))
+
+    return imported, failed
+
+
+def _safe_parse(path):
+    try:
+        return parse_resume(path)
+    except Exception as e:
+        return e
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import a directory or zip of resume PDFs")
+    parser.add_argument("source")
+    parser.add_argument("--candidates", required=True, help="CSV with email,filename[,name] per file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--embed-batch-size", type=int, default=64)
+    parser.add_argument("--max-mb", type=int, default=int(os.getenv("MAX_UPLOAD_MB", "10")))
+    parser.add_argument("--checkpoint", help="default: <source>.import-checkpoint")
+    args = parser.parse_args()
+
+    candidates = read_candidates(args.candidates)
+    # Accounts created by the import get a random password nobody knows
+    password = hash_password(secrets.token_urlsafe(32))
+
+    checkpoint = args.checkpoint or f"{args.source.rstrip(os.sep)}.import-checkpoint"
+    done = read_checkpoint(checkpoint)
+    sources = [(name, opener) for name, opener in list_sources(args.source) if name not in done]
+    print(f"{len(done)} already imported, {len(sources)} to go")
+
+    timer = StageTimer()
+    imported_total = 0
+    failed_total = 0
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    pool = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        with open(checkpoint, "a") as log:
+            for i in range(0, len(sources), args.batch_size):
+                batch = sources[i:i + args.batch_size]
+                imported, failed = import_batch(
+                    db, pool, batch, candidates, password, timer,
+                    args.max_mb * 1024 * 1024, args.embed_batch_size
+                )
+
+                # Checkpoint only after the batch is committed
+                log.writelines(f"{name}\n" for name in imported)
+                log.flush()
+
+                imported_total += len(imported)
+                failed_total += len(failed)
+                for name, error in failed:
+                    print(f"  failed: {name}: {error}")
+
+                elapsed = time.perf_counter() - started
+                print(
+                    f"[{i + len(batch)}/{len(sources)}] imported {imported_total}, failed {failed_total}, "
+                    f"{imported_total / elapsed:.1f} resumes/s | {timer.report()}"
+                )
+    finally:
+        pool.shutdown()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,8 @@
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from app import models, schemas
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def hash_password(password: str):
-    return pwd_context.hash(password)
-
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = hash_password(user.password)
-
+# hashed_password: from passwords.hash_password_async (bcrypt runs off the request thread)
+def create_user(db: Session, user: schemas.UserCreate, hashed_password: str):
     db_user = models.User(
         name=user.name,
         email=user.email,
@@ -2,10 +2,13 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from app.db_pool import pool_options
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 
-engine = create_engine(DATABASE_URL)
+# Pool size/overflow/recycle/pre-ping from the environment (see db_pool)
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL))
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -14,3 +17,49 @@ SessionLocal = sessionmaker(
 )
 
 Base = declarative_base()
+
+
+# -------- Request session --------
+# The one session dependency: FastAPI caches it per request, so
+# get_current_user and the endpoint share a session (and a connection).
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# -------- Optional asyncio engine (ASYNC_DB=1) --------
+# Used by the async read endpoints; needs aiomysql (MySQL) or aiosqlite (SQLite).
+# Without it those endpoints run their queries on the sync engine in the threadpool.
+ASYNC_DB = os.getenv("ASYNC_DB", "0") == "1"
+
+ASYNC_DRIVERS = {
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url):
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if ASYNC_DB:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        **pool_options(ASYNC_DATABASE_URL, async_engine=True)
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
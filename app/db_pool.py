@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# -------- Connection pool settings --------
+# Size the pool for the worker's concurrency: HEAVY_EXECUTOR_THREADS plus
+# the threadpool/async readers that can hold a connection at the same time.
+# /db-pool-stats shows whether requests are waiting for a connection.
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_S = float(os.getenv("DB_POOL_TIMEOUT_S", "30"))
+DB_POOL_RECYCLE_S = int(os.getenv("DB_POOL_RECYCLE_S", "1800"))  # -1 = never
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+
+class PoolMetrics:
+    # Mixin for QueuePool classes: times every checkout (including the wait
+    # for a free connection) and tracks peaks and timeouts.
+    # pool.recreate() (engine.dispose) builds a fresh instance, so counters
+    # restart with the new pool.
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.waited = 0  # checkouts that took longer than 1ms
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            with self._metrics_lock:
+                self.timeouts += 1
+            raise
+        elapsed = time.perf_counter() - start
+
+        with self._metrics_lock:
+            self.checkouts += 1
+            self.wait_total_s += elapsed
+            self.wait_max_s = max(self.wait_max_s, elapsed)
+            if elapsed > 0.001:
+                self.waited += 1
+            # checkedout() counts this connection only once _do_get returns
+            self.peak_checked_out = max(self.peak_checked_out, self.checkedout() + 1)
+            self.peak_overflow = max(self.peak_overflow, self.overflow())
+        return entry
+
+    def stats(self):
+        with self._metrics_lock:
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": max(self.peak_overflow, 0),
+                "checkouts": self.checkouts,
+                "waited": self.waited,
+                "avg_wait_ms": round(self.wait_total_s / self.checkouts * 1000, 3) if self.checkouts else 0,
+                "max_wait_ms": round(self.wait_max_s * 1000, 3),
+                "timeouts": self.timeouts
+            }
+
+
+class InstrumentedQueuePool(PoolMetrics, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(PoolMetrics, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(url, async_engine=False):
+    # In-memory SQLite keeps its default single-connection pool
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if async_engine else InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_S,
+        "pool_recycle": DB_POOL_RECYCLE_S,
+        "pool_pre_ping": DB_POOL_PRE_PING
+    }
+
+
+def pool_stats(engine):
+    pool = engine.pool
+    if isinstance(pool, PoolMetrics):
+        return pool.stats()
+    return {"status": pool.status()}
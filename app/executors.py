@@ -0,0 +1,90 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# -------- Bounded executor for heavy endpoints --------
+# Scoring, embedding waits and upload hashing run here instead of in
+# Starlette's shared threadpool, so a burst of uploads or rankings queues
+# behind HEAVY_EXECUTOR_THREADS workers and light endpoints stay responsive.
+
+HEAVY_EXECUTOR_THREADS = int(os.getenv("HEAVY_EXECUTOR_THREADS", "4"))
+PASSWORD_HASH_THREADS = int(os.getenv("PASSWORD_HASH_THREADS", "2"))
+
+
+class TrackedExecutor(ThreadPoolExecutor):
+    # ThreadPoolExecutor that counts queued and running tasks, so a backlog
+    # (e.g. a login burst waiting on bcrypt) is visible in the stats endpoints
+
+    def __init__(self, max_workers, thread_name_prefix):
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.stats_lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.max_queued = 0
+
+    def submit(self, fn, *args, **kwargs):
+        with self.stats_lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        try:
+            return super().submit(self._tracked, fn, *args, **kwargs)
+        except Exception:
+            with self.stats_lock:
+                self.queued -= 1
+            raise
+
+    def _tracked(self, fn, *args, **kwargs):
+        with self.stats_lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self.stats_lock:
+                self.running -= 1
+                self.completed += 1
+
+    def stats(self):
+        with self.stats_lock:
+            return {
+                "threads": self._max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "max_queued": self.max_queued
+            }
+
+
+heavy_executor = TrackedExecutor(HEAVY_EXECUTOR_THREADS, "heavy")
+
+# Password hashing / verification (bcrypt) gets its own small pool: a login
+# burst queues here instead of occupying the shared threadpool
+password_executor = TrackedExecutor(PASSWORD_HASH_THREADS, "password")
+
+
+async def run_in(executor, fn, *args, **kwargs):
+    # Context is copied so per-request ContextVars (e.g. the query counter) still apply
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        executor,
+        functools.partial(context.run, fn, *args, **kwargs)
+    )
+
+
+async def run_heavy(fn, *args, **kwargs):
+    return await run_in(heavy_executor, fn, *args, **kwargs)
+
+
+def heavy(endpoint):
+    # Turns a sync endpoint into an async one that runs on heavy_executor.
+    # functools.wraps keeps the signature, so FastAPI still sees its parameters.
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        return await run_heavy(endpoint, *args, **kwargs)
+
+    return wrapper
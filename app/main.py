@@ -1,33 +1,150 @@
 from dotenv import load_dotenv
+import logging
 import os
 
 load_dotenv()
-from fastapi import FastAPI, Depends, HTTPException, File, UploadFile
-from sqlalchemy.orm import Session
+from fastapi import FastAPI, Depends, HTTPException, File, UploadFile, Request, Response
+from typing import Optional
+from sqlalchemy.orm import Session, defer
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from datetime import datetime
-from collections import defaultdict
-from sqlalchemy import func
-
-from app.database import engine, SessionLocal
-from app import models, schemas, crud
-from app.auth import authenticate_user, create_access_token, get_current_user, require_role
+from fastapi.responses import FileResponse, JSONResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.database import engine, get_db, SessionLocal
+from app import models, schemas, crud, query_counter
+from app.pagination import DEFAULT_PAGE_SIZE, after_id, after_score, check_status, fetch_page, page_size
+from app.async_db import fetch_page_async, get_read_db, read_all, read_first
+from app.auth import (
+    authenticate_user,
+    create_access_token,
+    get_current_user_async,
+    require_role,
+    require_role_async
+)
+from app.database import ASYNC_DB, async_engine
+from app.db_pool import pool_stats
+from app.executors import heavy, heavy_executor, password_executor
+from app.passwords import hash_password_async
 from app.services.match_engine import (
+    batch_match,
     calculate_match_score,
+    embedding_batcher,
     generate_embedding,
-    skill_gap_analysis
+    job_skill_query,
+    skill_gap_analysis,
+    vector_matrix
+)
+from app.services.embedding_cache import embedding_cache
+from app.services.embedding_codec import decode_embedding
+from app.services.ingestion import ingestion_pipeline
+from app.services.job_stats import (
+    create_job_stats,
+    job_stats_summary,
+    record_application,
+    record_score_changes,
+    record_status_change
+)
+from app.services.score_sketch import job_key, load_global_sketch, load_sketch, rebuild_score_sketches
+from app.services.match_scoring import (
+    RANK_PREFILTER_FACTOR,
+    load_job_embeddings,
+    load_resume_embeddings,
+    load_resume_texts,
+    rank_top_candidates,
+    resume_chunks_for,
+    resume_keys,
+    refresh_stale_scores,
+    refresh_user_scores,
+    score_version
+)
+from app.services.model_registry import WARM_UP_MODELS, warm_up
+from app.services.principal_cache import Principal, principal_cache
+from app.services.recommender import recommend_jobs
+from app.services.response_cache import job_namespace, mark_changed, response_cache, track_invalidations
+from app.services.resume_storage import (
+    STORAGE_ROOT,
+    UploadTooLarge,
+    collect_garbage,
+    load_extraction,
+    save_extraction,
+    store_upload
 )
-from app.services.resume_parser import extract_text_from_pdf, extract_skills
-from app.models import User, Application, Job
+from app.services.vector_index import make_index
+
+logger = logging.getLogger(__name__)
 
 
 app = FastAPI()
+
+# 🔥 Job embedding index for /recommend-jobs (exact or IVF, see VECTOR_INDEX)
+job_index = make_index()
+
+def sync_job_index(db):
+    # Jobs are append-only, so anything above max_id is new
+    # (also picks up jobs created by other workers)
+    rows = db.query(models.Job.id, models.Job.embedding).filter(
+        models.Job.id > job_index.max_id,
+        models.Job.embedding.isnot(None)
+    ).order_by(models.Job.id).yield_per(1000)
+
+    for row in rows:
+        try:
+            job_index.add(row.id, decode_embedding(row.embedding))
+        except Exception:
+            continue
+
 @app.on_event("startup")
 def startup_event():
     models.Base.metadata.create_all(bind=engine)
 
+    if WARM_UP_MODELS:
+        warm_up()
+
+    db = SessionLocal()
+    try:
+        sync_job_index(db)
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    ingestion_pipeline.shutdown()
+    heavy_executor.shutdown(wait=False, cancel_futures=True)
+    password_executor.shutdown(wait=False, cancel_futures=True)
+    if ASYNC_DB:
+        await async_engine.dispose()
+
+# 🔥 Per-request SQL statement counter (X-Query-Count header) to catch N+1 queries
+query_counter.install(engine)
+
+# 🔥 Cached responses are invalidated by version bumps once write transactions commit
+track_invalidations(SessionLocal)
+if ASYNC_DB:
+    query_counter.install(async_engine.sync_engine)
+if query_counter.QUERY_COUNT_HEADER:
+    app.middleware("http")(query_counter.query_count_middleware)
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "10")) * 1024 * 1024
+# Multipart framing (boundary, part headers) around the file itself
+UPLOAD_OVERHEAD_BYTES = 64 * 1024
+
+# 🔥 Starlette spools the whole multipart body before /upload-resume runs, so
+# a declared Content-Length over the limit is refused before any of it is read.
+# Chunked bodies (no Content-Length) still rely on the check in store_upload.
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    if request.url.path == "/upload-resume":
+        length = request.headers.get("content-length", "")
+        if length.isdigit() and int(length) > MAX_UPLOAD_BYTES + UPLOAD_OVERHEAD_BYTES:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"Resume exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"}
+            )
+    return await call_next(request)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -35,24 +152,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# ---------------- DB ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ---------------- AUTH ----------------
+# 🔥 bcrypt runs on the bounded password executor, so a login/register burst
+# queues there instead of taking every threadpool slot from other endpoints
 @app.post("/register", response_model=schemas.UserResponse)
-def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    return crud.create_user(db=db, user=user)
+async def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    hashed_password = await hash_password_async(user.password)
+    return await run_in_threadpool(crud.create_user, db, user, hashed_password)
 
 @app.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db=Depends(get_read_db)):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
@@ -67,63 +180,199 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     }
 
 # ---------------- RESUME ----------------
-import os
-from uuid import uuid4
-
-UPLOAD_FOLDER = "uploaded_resumes"
+if not os.path.exists(STORAGE_ROOT):
+    os.makedirs(STORAGE_ROOT)
+
+def on_resume_ingested(resume_id, file_path, content_hash, cache_result=True):
+    def save(ingestion_id, result):
+        db = SessionLocal()
+        try:
+            # Only the latest upload for this resume may write its results
+            resume = db.query(models.Resume).filter(
+                models.Resume.id == resume_id,
+                models.Resume.ingestion_id == ingestion_id
+            ).first()
+
+            if not resume:
+                return
+
+            resume.extracted_text = result["text"]
+            resume.extracted_skills = ", ".join(result["skills"])
+            resume.skill_index = result["skill_index"]
+            resume.embedding = result["embedding"]
+            resume.chunk_embeddings = result.get("chunk_embeddings")
+            resume.file_path = file_path
+            resume.pending_file_path = None
+            resume.content_hash = content_hash
+            resume.processing_status = "ready"
+            resume.version = (resume.version or 1) + 1
+            db.commit()
+            user_id = resume.user_id
+        finally:
+            db.close()
+
+        # 🔥 The resume is saved: errors from here on must not mark it failed.
+        # Stored scores carry the old resume version, so scoring endpoints
+        # recompute them even if the refresh below does not finish.
+        try:
+            after_save(resume_id, user_id, content_hash, result, cache_result)
+        except Exception:
+            logger.exception("Post-save steps failed for resume %s", resume_id)
+
+    return save
+
+def after_save(resume_id, user_id, content_hash, result, cache_result):
+    db = SessionLocal()
+    try:
+        # 🔥 Later uploads of the same file reuse these results
+        if cache_result:
+            try:
+                save_extraction(db, content_hash, result)
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+
+        # 🔥 Free the cached vector of the old version (lookups by the new
+        # version miss it anyway), then rescore this candidate's applications
+        embedding_cache.invalidate_resume(resume_id)
+        refresh_user_scores(db, user_id)
+        db.commit()
+    finally:
+        db.close()
 
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+def on_resume_ingestion_failed(ingestion_id, error):
+    db = SessionLocal()
+    try:
+        db.query(models.Resume).filter(
+            models.Resume.ingestion_id == ingestion_id
+        ).update({"processing_status": "failed", "pending_file_path": None})
+        db.commit()
+    finally:
+        db.close()
 
-@app.post("/upload-resume")
+@app.post("/upload-resume", status_code=202)
+@heavy
 def upload_resume(
     file: UploadFile = File(...),
-    current_user: models.User = Depends(require_role(["candidate"])),
+    current_user: Principal = Depends(require_role(["candidate"])),
     db: Session = Depends(get_db)
 ):
-    # 🔥 Generate unique filename
-    unique_filename = f"{uuid4()}.pdf"
-    file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-
-    # 🔥 Save file to disk
-    with open(file_path, "wb") as buffer:
-        buffer.write(file.file.read())
-
-    # 🔥 Extract text
-    text = extract_text_from_pdf(open(file_path, "rb"))
-    skills = extract_skills(text)
-    embedding = generate_embedding(text)
+    # 🔥 Stream to disk in chunks while hashing; identical files are stored once
+    try:
+        content_hash, file_path = store_upload(file.file, MAX_UPLOAD_BYTES)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
     existing_resume = db.query(models.Resume).filter(
         models.Resume.user_id == current_user.id
     ).first()
 
+    # 🔥 Same file as the current resume: nothing to redo
+    if (
+        existing_resume
+        and existing_resume.content_hash == content_hash
+        and existing_resume.processing_status == "ready"
+    ):
+        return {
+            "message": "Resume unchanged",
+            "ingestion_id": existing_resume.ingestion_id,
+            "status": "completed",
+            "status_url": f"/ingestion-status/{existing_resume.ingestion_id}"
+        }
+
+    ingestion_id = ingestion_pipeline.new_id()
+
+    # 🔥 Existing resume keeps serving its old text/embedding until the new one is ready
     if existing_resume:
-        existing_resume.extracted_text = text
-        existing_resume.extracted_skills = ", ".join(skills)
-        existing_resume.embedding = embedding
-        existing_resume.file_path = file_path
+        resume = existing_resume
     else:
-        new_resume = models.Resume(
+        resume = models.Resume(
             user_id=current_user.id,
-            extracted_text=text,
-            extracted_skills=", ".join(skills),
-            embedding=embedding,
-            file_path=file_path
+            file_path=file_path,
+            content_hash=content_hash
         )
-        db.add(new_resume)
+        db.add(resume)
 
+    resume.processing_status = "processing"
+    resume.ingestion_id = ingestion_id
+    # 🔥 Storage GC keeps this blob until ingestion moves it to file_path
+    resume.pending_file_path = file_path
     db.commit()
 
-    return {"message": "Resume uploaded successfully 🚀"}
+    # 🔥 Seen this file before (same or another candidate): reuse the cached
+    # parse / skills / embedding and skip the ingestion pipeline entirely
+    cached = load_extraction(db, content_hash)
+    if cached:
+        on_resume_ingested(resume.id, file_path, content_hash, cache_result=False)(ingestion_id, cached)
+        return {
+            "message": "Resume uploaded 🚀",
+            "ingestion_id": ingestion_id,
+            "status": "completed",
+            "status_url": f"/ingestion-status/{ingestion_id}"
+        }
+
+    # 🔥 Parse, skill extraction and embedding run on the ingestion process pool
+    ingestion_pipeline.submit(
+        ingestion_id,
+        file_path,
+        current_user.id,
+        on_success=on_resume_ingested(resume.id, file_path, content_hash),
+        on_failure=on_resume_ingestion_failed
+    )
+
+    return {
+        "message": "Resume uploaded, processing started 🚀",
+        "ingestion_id": ingestion_id,
+        "status": "processing",
+        "status_url": f"/ingestion-status/{ingestion_id}"
+    }
+
+@app.get("/ingestion-status/{ingestion_id}")
+def get_ingestion_status(
+    ingestion_id: str,
+    current_user: Principal = Depends(require_role(["candidate"])),
+    db: Session = Depends(get_db)
+):
+    progress = ingestion_pipeline.status(ingestion_id)
+
+    resume = db.query(
+        models.Resume.id,
+        models.Resume.user_id,
+        models.Resume.processing_status
+    ).filter(
+        models.Resume.ingestion_id == ingestion_id
+    ).first()
+
+    owner_id = progress["user_id"] if progress else (resume.user_id if resume else None)
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Ingestion not found")
+
+    # 🔥 Progress lives in the worker that accepted the upload; the row state is the fallback
+    if progress:
+        return {
+            "ingestion_id": ingestion_id,
+            "resume_id": resume.id if resume else None,
+            "status": progress["status"],
+            "stage": progress["stage"],
+            "error": progress["error"]
+        }
+
+    return {
+        "ingestion_id": ingestion_id,
+        "resume_id": resume.id,
+        "status": "completed" if resume.processing_status == "ready" else resume.processing_status,
+        "stage": resume.processing_status,
+        "error": None
+    }
 
 # ---------------- JOBS ----------------
 @app.post("/create-job")
+@heavy
 def create_job(
     title: str,
     description: str,
     required_skills: str,
-    current_user: models.User = Depends(require_role(["recruiter","admin"])),
+    current_user: Principal = Depends(require_role(["recruiter","admin"])),
     db: Session = Depends(get_db)
 ):
     embedding = generate_embedding(description)
@@ -137,44 +386,109 @@ def create_job(
     )
 
     db.add(job)
+    db.flush()
+    create_job_stats(db, job.id)
+    mark_changed(db, "jobs")
     db.commit()
     db.refresh(job)
 
+    job_index.add(job.id, decode_embedding(embedding))
+
     return {"message": "Job created successfully 🚀", "job_id": job.id}
 
+# 🔥 Listings and /rank are keyset-paginated: the cursor for the next page (if
+# any) is always sent in the X-Next-Cursor header, never in the body
+def set_next_cursor(response, next_cursor):
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+def next_cursor_headers(next_cursor):
+    return {"X-Next-Cursor": next_cursor} if next_cursor else None
+
+# 🔥 Serve a response_cache entry; 304 when the client already holds this ETag
+def cached_json_response(request, entry):
+    headers = {"ETag": entry["etag"], "Cache-Control": "private, no-cache", **entry["headers"]}
+    if entry["etag"] in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(entry["body"], media_type="application/json", headers=headers)
+
 @app.get("/my-jobs")
-def get_my_jobs(
-    current_user: models.User = Depends(require_role(["recruiter","admin"])),
-    db: Session = Depends(get_db)
+async def get_my_jobs(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    current_user: Principal = Depends(require_role_async(["recruiter","admin"])),
+    db = Depends(get_read_db)
 ):
-    if current_user.role == "admin":
-        jobs = db.query(models.Job).all()
-    else:
-        jobs = db.query(models.Job).filter(
-            models.Job.recruiter_id == current_user.id
-        ).all()
+    scope = "all" if current_user.role == "admin" else current_user.id
+    key = response_cache.key("my-jobs", ["jobs"], scope, cursor, limit)
+    entry = response_cache.get(key)
+
+    if entry is None:
+        query = select(models.Job.id, models.Job.title, models.Job.required_skills)
+
+        if current_user.role != "admin":
+            query = query.filter(
+                models.Job.recruiter_id == current_user.id
+            )
+
+        jobs, next_cursor = await fetch_page_async(
+            db,
+            after_id(query, models.Job.id, cursor),
+            limit,
+            lambda job: (job.id,)
+        )
+        entry = response_cache.put(
+            key,
+            [{"id": job.id, "title": job.title, "required_skills": job.required_skills} for job in jobs],
+            headers=next_cursor_headers(next_cursor)
+        )
 
-    return [{"id": job.id, "title": job.title, "required_skills": job.required_skills} for job in jobs]
+    return cached_json_response(request, entry)
 
 @app.get("/jobs")
-def get_all_jobs(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_all_jobs(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    current_user: Principal = Depends(get_current_user_async),
+    db = Depends(get_read_db)
 ):
-    jobs = db.query(models.Job).all()
+    # 🔥 Same pages for every user: cached until a job is created
+    key = response_cache.key("jobs", ["jobs"], cursor, limit)
+    entry = response_cache.get(key)
+
+    if entry is None:
+        # Async read: never waits for a threadpool slot when ASYNC_DB=1
+        query = select(models.Job.id, models.Job.title, models.Job.required_skills)
+
+        jobs, next_cursor = await fetch_page_async(
+            db,
+            after_id(query, models.Job.id, cursor),
+            limit,
+            lambda job: (job.id,)
+        )
+        entry = response_cache.put(
+            key,
+            [{"id": job.id, "title": job.title, "required_skills": job.required_skills} for job in jobs],
+            headers=next_cursor_headers(next_cursor)
+        )
 
-    return [{"id": job.id, "title": job.title, "required_skills": job.required_skills} for job in jobs]
+    return cached_json_response(request, entry)
 
 # ---------------- APPLY ----------------
 @app.post("/apply/{job_id}")
+@heavy
 def apply_to_job(
     job_id: int,
-    current_user: models.User = Depends(require_role(["candidate"])),
+    current_user: Principal = Depends(require_role(["candidate"])),
     db: Session = Depends(get_db)
 ):
 
     # 🔥 Check job exists
-    job = db.query(models.Job).filter(
+    job = db.query(models.Job).options(
+        defer(models.Job.embedding)
+    ).filter(
         models.Job.id == job_id
     ).first()
 
@@ -201,60 +515,101 @@ def apply_to_job(
     if existing:
         raise HTTPException(status_code=400, detail="Already applied")
 
-    # 🔥 Create application
+    # 🔥 Create application, scored once here and stored with its version tag
+    # (the refresh also adds the score to the job's analytics rollup)
     match = models.MatchResult(
         user_id=current_user.id,
         job_id=job_id,
-        score=0,
+        score=None,
         status="applied"
     )
 
     db.add(match)
+    db.flush()
+    record_application(db, job_id, match.status)
+    refresh_stale_scores(db, job, user_id=current_user.id)
     db.commit()
 
     return {"message": "Application submitted successfully 🚀"}
 
 # ---------------- RANK (FIXED) ----------------
 @app.post("/rank/{job_id}")
+@heavy
 def rank_candidates(
     job_id: int,
-    current_user: models.User = Depends(require_role(["admin","recruiter"])),
+    response: Response,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    top_k: Optional[int] = None,
+    prefilter_n: Optional[int] = None,
+    current_user: Principal = Depends(require_role(["admin","recruiter"])),
     db: Session = Depends(get_db)
 ):
-    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    check_status(status)
+
+    job = db.query(models.Job).options(
+        defer(models.Job.embedding)
+    ).filter(models.Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    applications = db.query(models.MatchResult).filter(
-        models.MatchResult.job_id == job_id
-    ).all()
-
-    ranking = []
-
-    for app in applications:
-        resume = db.query(models.Resume).filter(
-            models.Resume.user_id == app.user_id
-        ).first()
-
-        if not resume:
-            continue
-
-        score = calculate_match_score(resume, job)
-        app.score = score
+    # 🔥 Two-stage mode (top_k): every application is prefiltered cheaply to
+    # prefilter_n and only those are ranked by exact score; no pagination
+    if top_k is not None:
+        top_k = page_size(top_k)
+        ranking, rescored = rank_top_candidates(
+            db,
+            job,
+            top_k,
+            max(prefilter_n or RANK_PREFILTER_FACTOR * top_k, top_k),
+            status
+        )
+        db.commit()
+
+        return {
+            "job_title": job.title,
+            "ranked_candidates": [
+                {"user_id": user_id, "candidate": name, "score": score}
+                for _, user_id, name, score in ranking
+            ],
+            "rescored": rescored
+        }
+
+    # 🔥 Only applications with a missing or stale score are recomputed
+    refresh_stale_scores(db, job)
+    db.commit()
 
-        user = db.query(models.User).filter(
-            models.User.id == app.user_id
-        ).first()
+    # 🔥 Indexed keyset read on (job_id, score) / (job_id, status, score)
+    query = db.query(
+        models.MatchResult.id,
+        models.MatchResult.user_id,
+        models.User.name,
+        models.MatchResult.score
+    ).join(
+        models.MatchResult.user
+    ).filter(
+        models.MatchResult.job_id == job_id
+    )
 
-        ranking.append({
-            "user_id": app.user_id,
-            "candidate": user.name,
-            "score": score
-        })
+    if status:
+        query = query.filter(models.MatchResult.status == status)
 
-    db.commit()
+    rows, next_cursor = fetch_page(
+        after_score(query, models.MatchResult.score, models.MatchResult.id, cursor),
+        limit,
+        lambda row: (row.score, row.id)
+    )
 
-    ranking = sorted(ranking, key=lambda x: x["score"], reverse=True)
+    ranking = [
+        {
+            "user_id": row.user_id,
+            "candidate": row.name,
+            "score": row.score
+        }
+        for row in rows
+    ]
+    set_next_cursor(response, next_cursor)
 
     return {"job_title": job.title, "ranked_candidates": ranking}
 
@@ -262,33 +617,62 @@ def rank_candidates(
 @app.get("/job-applications/{job_id}")
 def get_job_applications(
     job_id: int,
-    current_user: models.User = Depends(require_role(["admin","recruiter"])),
+    response: Response,
+    status: Optional[str] = None,
+    sort: str = "id",
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    current_user: Principal = Depends(require_role(["admin","recruiter"])),
     db: Session = Depends(get_db)
 ):
-    results = db.query(models.MatchResult).filter(
+    check_status(status)
+    if sort not in ("id", "score"):
+        raise HTTPException(status_code=400, detail="sort must be 'id' or 'score'")
+
+    # 🔥 One query: applicant name and resume id joined in, lean column tuples out
+    query = db.query(
+        models.MatchResult.id,
+        models.MatchResult.user_id,
+        models.User.name,
+        models.Resume.id.label("resume_id"),
+        models.MatchResult.status,
+        models.MatchResult.score
+    ).join(
+        models.MatchResult.user
+    ).outerjoin(
+        models.MatchResult.resume
+    ).filter(
         models.MatchResult.job_id == job_id
-    ).all()
-
-    response = []
-
-    for result in results:
-        user = db.query(models.User).filter(
-            models.User.id == result.user_id
-        ).first()
-
-        resume = db.query(models.Resume).filter(
-            models.Resume.user_id == result.user_id
-        ).first()
+    )
 
-        response.append({
-            "user_id": user.id,
-            "user_name": user.name,
-            "resume_id": resume.id if resume else None,
-            "status": result.status,
-            "score": result.score
-        })
+    # 🔥 Status filter runs in SQL, on the (job_id, status, score) index
+    if status:
+        query = query.filter(models.MatchResult.status == status)
 
-    return response
+    if sort == "score":
+        rows, next_cursor = fetch_page(
+            after_score(query, models.MatchResult.score, models.MatchResult.id, cursor),
+            limit,
+            lambda row: (row.score, row.id)
+        )
+    else:
+        rows, next_cursor = fetch_page(
+            after_id(query, models.MatchResult.id, cursor),
+            limit,
+            lambda row: (row.id,)
+        )
+    set_next_cursor(response, next_cursor)
+
+    return [
+        {
+            "user_id": row.user_id,
+            "user_name": row.name,
+            "resume_id": row.resume_id,
+            "status": row.status,
+            "score": row.score
+        }
+        for row in rows
+    ]
 
 # ---------------- UPDATE STATUS ----------------
 @app.post("/update-status/{job_id}/{user_id}")
@@ -296,7 +680,7 @@ def update_status(
     job_id: int,
     user_id: int,
     status: dict,
-    current_user: models.User = Depends(require_role(["admin","recruiter"])),
+    current_user: Principal = Depends(require_role(["admin","recruiter"])),
     db: Session = Depends(get_db)
 ):
     match = db.query(models.MatchResult).filter(
@@ -307,7 +691,10 @@ def update_status(
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
 
+    old_status = match.status
     match.status = status["status"]
+    db.flush()
+    record_status_change(db, job_id, old_status, match.status)
     db.commit()
 
     return {"message": "Status updated"}
@@ -316,7 +703,7 @@ def update_status(
 @app.post("/skill-gap/{job_id}")
 def analyze_skill_gap(
     job_id: int,
-    current_user: models.User = Depends(require_role(["candidate"])),
+    current_user: Principal = Depends(require_role(["candidate"])),
     db: Session = Depends(get_db)
 ):
 
@@ -350,13 +737,17 @@ def analyze_skill_gap(
     }
 # ---------------- MATCH SCORE ----------------
 @app.post("/match/{job_id}")
+@heavy
 def match_resume(
     job_id: int,
-    current_user: models.User = Depends(require_role(["candidate"])),
+    current_user: Principal = Depends(require_role(["candidate"])),
     db: Session = Depends(get_db)
 ):
 
-    resume = db.query(models.Resume).filter(
+    resume = db.query(models.Resume).options(
+        defer(models.Resume.embedding),
+        defer(models.Resume.chunk_embeddings)
+    ).filter(
         models.Resume.user_id == current_user.id
     ).first()
 
@@ -366,7 +757,9 @@ def match_resume(
             detail="Upload resume before checking match score"
         )
 
-    job = db.query(models.Job).filter(
+    job = db.query(models.Job).options(
+        defer(models.Job.embedding)
+    ).filter(
         models.Job.id == job_id
     ).first()
 
@@ -376,20 +769,224 @@ def match_resume(
             detail="Job not found"
         )
 
-    score = calculate_match_score(resume, job)
+    # 🔥 Reuse the stored score when the candidate applied and it is still fresh
+    application = db.query(models.MatchResult).filter(
+        models.MatchResult.user_id == current_user.id,
+        models.MatchResult.job_id == job_id
+    ).first()
+
+    current_version = score_version(job.version, resume.version)
+    if application and application.score_version == current_version:
+        return {
+            "match_percentage": application.score
+        }
+
+    score = calculate_match_score(
+        resume,
+        job,
+        resume_vector=embedding_cache.get_resume_vector(resume.id, resume.version, lambda: resume.embedding),
+        job_vector=embedding_cache.get_job_vector(job.id, job.version, lambda: job.embedding),
+        resume_chunks=(resume_chunks_for(db, [(resume.id, resume.version)]) or [None])[0]
+    )
+
+    if application:
+        old_score = application.score
+        application.score = score
+        application.score_version = current_version
+        db.flush()
+        record_score_changes(db, job_id, [(old_score, score)])
+        db.commit()
 
     return {
         "match_percentage": score
     }
 
-import os
-from fastapi import HTTPException
-from fastapi.responses import FileResponse
+# ---------------- BATCH MATCH ----------------
+@app.post("/batch-match")
+@heavy
+def batch_match_jobs(
+    body: schemas.BatchMatchJobs,
+    current_user: Principal = Depends(require_role(["candidate"])),
+    db: Session = Depends(get_db)
+):
+    # 🔥 One candidate vs many jobs: one resume load, one job query, one vectorized pass
+    resume = db.query(models.Resume).options(
+        defer(models.Resume.embedding),
+        defer(models.Resume.chunk_embeddings)
+    ).filter(
+        models.Resume.user_id == current_user.id
+    ).first()
+
+    if not resume:
+        raise HTTPException(status_code=400, detail="Upload resume before matching")
+
+    job_ids = list(dict.fromkeys(body.job_ids))
+    jobs = {
+        job.id: job
+        for job in db.query(models.Job.id, models.Job.title, models.Job.required_skills, models.Job.version).filter(
+            models.Job.id.in_(job_ids)
+        )
+    }
+    found_ids = [job_id for job_id in job_ids if job_id in jobs]
+
+    resume_vector = embedding_cache.get_resume_vector(resume.id, resume.version, lambda: resume.embedding)
+    job_vectors = embedding_cache.get_job_vectors(
+        [(job_id, jobs[job_id].version) for job_id in found_ids],
+        lambda ids: load_job_embeddings(db, ids)
+    )
+
+    if resume_vector is not None:
+        resume_matrix = resume_vector.reshape(1, -1)
+        job_matrix = vector_matrix(job_vectors, resume_vector.shape[0])
+    else:
+        resume_matrix = job_matrix = None
+
+    results = batch_match(
+        resume_matrix,
+        job_matrix,
+        [resume.extracted_text] * len(found_ids),
+        [resume.skill_index] * len(found_ids),
+        [jobs[job_id].required_skills for job_id in found_ids],
+        (resume_chunks_for(db, [(resume.id, resume.version)]) or [None]) * len(found_ids)
+    )
+
+    return {
+        "results": [
+            {"job_id": job_id, "job_title": jobs[job_id].title, **result}
+            for job_id, result in zip(found_ids, results)
+        ],
+        "not_found": [job_id for job_id in job_ids if job_id not in jobs]
+    }
+
+@app.post("/batch-match/{job_id}")
+@heavy
+def batch_match_candidates(
+    job_id: int,
+    body: schemas.BatchMatchCandidates,
+    current_user: Principal = Depends(require_role(["admin", "recruiter"])),
+    db: Session = Depends(get_db)
+):
+    # 🔥 Many applicants vs one job
+    job = db.query(models.Job).options(
+        defer(models.Job.embedding)
+    ).filter(
+        models.Job.id == job_id
+    ).first()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if current_user.role != "admin" and job.recruiter_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    user_ids = list(dict.fromkeys(body.user_ids))
+    rows = db.query(
+        models.Resume.id.label("resume_id"),
+        models.Resume.version.label("resume_version"),
+        models.Resume.user_id,
+        models.Resume.skill_index,
+        models.User.name
+    ).join(
+        models.MatchResult, models.MatchResult.user_id == models.Resume.user_id
+    ).join(
+        models.User, models.User.id == models.Resume.user_id
+    ).filter(
+        models.MatchResult.job_id == job_id,
+        models.Resume.user_id.in_(user_ids)
+    ).all()
+    order = {user_id: i for i, user_id in enumerate(user_ids)}
+    rows = sorted(rows, key=lambda row: order[row.user_id])
+
+    job_vector = embedding_cache.get_job_vector(job.id, job.version, lambda: job.embedding)
+    resume_matrix = embedding_cache.get_resume_vectors(
+        resume_keys(rows),
+        lambda ids: load_resume_embeddings(db, ids)
+    )
+
+    # Resume text only where the skill index cannot answer
+    needs_text = job_skill_query(job.required_skills).needs_text
+    texts = load_resume_texts(db, [
+        row.resume_id for row in rows
+        if needs_text or row.skill_index is None
+    ])
+
+    results = batch_match(
+        resume_matrix,
+        job_vector.reshape(1, -1) if job_vector is not None else None,
+        [texts.get(row.resume_id) for row in rows],
+        [row.skill_index for row in rows],
+        [job.required_skills] * len(rows),
+        resume_chunks_for(db, resume_keys(rows))
+    )
+
+    matched_ids = {row.user_id for row in rows}
+    return {
+        "job_title": job.title,
+        "results": [
+            {"user_id": row.user_id, "candidate": row.name, **result}
+            for row, result in zip(rows, results)
+        ],
+        "not_found": [user_id for user_id in user_ids if user_id not in matched_ids]
+    }
+
+# ---------------- RECOMMEND JOBS ----------------
+@app.get("/recommend-jobs")
+@heavy
+def recommend_jobs_for_candidate(
+    k: int = 10,
+    current_user: Principal = Depends(require_role(["candidate"])),
+    db: Session = Depends(get_db)
+):
+    resume = db.query(models.Resume).options(
+        defer(models.Resume.embedding),
+        defer(models.Resume.chunk_embeddings)
+    ).filter(
+        models.Resume.user_id == current_user.id
+    ).first()
+
+    if not resume:
+        raise HTTPException(
+            status_code=400,
+            detail="Upload resume before getting recommendations"
+        )
+
+    resume_vector = embedding_cache.get_resume_vector(resume.id, resume.version, lambda: resume.embedding)
+    if resume_vector is None:
+        raise HTTPException(status_code=400, detail="Resume is not processed yet")
+
+    sync_job_index(db)
+
+    def load_jobs(job_ids):
+        rows = db.query(
+            models.Job.id,
+            models.Job.title,
+            models.Job.required_skills,
+            models.Job.version
+        ).filter(models.Job.id.in_(job_ids)).all()
+        return {row.id: row for row in rows}
+
+    # 🔥 Index search generates candidates; they are scored with the same
+    # pooled chunk similarity as /match
+    recommendations = recommend_jobs(
+        job_index,
+        resume_vector,
+        resume.extracted_text,
+        resume.skill_index,
+        load_jobs,
+        k=max(1, min(k, 100)),
+        resume_chunks=(resume_chunks_for(db, [(resume.id, resume.version)]) or [None])[0],
+        load_job_vectors=lambda keys: embedding_cache.get_job_vectors(
+            keys, lambda missing: load_job_embeddings(db, missing)
+        )
+    )
+
+    return {"recommended_jobs": recommendations}
 
 @app.get("/download-resume/{resume_id}")
 def download_resume(
     resume_id: int,
-    current_user: models.User = Depends(require_role(["admin", "recruiter"])),
+    request: Request,
+    current_user: Principal = Depends(require_role(["admin", "recruiter"])),
     db: Session = Depends(get_db)
 ):
     resume = db.query(models.Resume).filter(
@@ -405,61 +1002,110 @@ def download_resume(
     if not os.path.exists(resume.file_path):
         raise HTTPException(status_code=404, detail="File not found on server")
 
+    # 🔥 Content-addressed files never change, so the hash is a strong ETag.
+    # The URL is the resume id, whose file changes on re-upload: browsers
+    # must revalidate (a 304 while the content is the same).
+    # FileResponse handles Range requests
+    etag = f'"{resume.content_hash}"' if resume.content_hash else None
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"} if etag else None
+    if etag and etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=cache_headers)
+
     return FileResponse(
         resume.file_path,
         media_type="application/pdf",
-        filename="resume.pdf"
+        filename="resume.pdf",
+        headers=cache_headers
     )
 # ---------------- GLOBAL DASHBOARD ANALYTICS ----------------
 @app.get("/dashboard-analytics")
 def dashboard_analytics(
-    current_user: models.User = Depends(require_role(["admin", "recruiter"])),
+    request: Request,
+    current_user: Principal = Depends(require_role(["admin", "recruiter"])),
     db: Session = Depends(get_db)
 ):
 
-    # 🔥 Get only recruiter’s jobs (admin sees all)
-    if current_user.role == "admin":
-        jobs = db.query(models.Job).all()
-    else:
-        jobs = db.query(models.Job).filter(
-            models.Job.recruiter_id == current_user.id
-        ).all()
+    # 🔥 Cached until any job's stats change (apply, status, scores, new job)
+    scope = "all" if current_user.role == "admin" else current_user.id
+    key = response_cache.key("dashboard", ["job_stats"], scope)
+    entry = response_cache.get(key)
+    if entry is not None:
+        return cached_json_response(request, entry)
+
+    # 🔥 Aggregated from the per-job rollup table: O(jobs), not O(applications)
+    # (admin sees all jobs, a recruiter only their own)
+    summary = job_stats_summary(
+        db,
+        recruiter_id=None if current_user.role == "admin" else current_user.id
+    )
+
+    entry = response_cache.put(key, {
+        "total_jobs": summary["total_jobs"],
+        "total_applications": summary["total_applications"],
+        "shortlisted": summary["shortlisted"],
+        "rejected": summary["rejected"],
+        "applied": summary["applied"],
+        "average_match_score": summary["average_score"],
+        "score_distribution": summary["score_distribution"]
+    })
+    return cached_json_response(request, entry)
+# ---------------- JOB ANALYTICS ----------------
+@app.get("/job-analytics/{job_id}")
+def job_analytics(
+    job_id: int,
+    request: Request,
+    current_user: Principal = Depends(require_role(["admin", "recruiter"])),
+    db: Session = Depends(get_db)
+):
 
-    job_ids = [job.id for job in jobs]
+    # 🔥 Cached per job until its stats change; the owner is kept in the
+    # entry so the check below needs no query on a hit
+    key = response_cache.key("job-analytics", [job_namespace(job_id)], job_id)
+    entry = response_cache.get(key)
 
-    total_jobs = len(jobs)
+    if entry is None:
+        job = db.query(models.Job).filter(
+            models.Job.id == job_id
+        ).first()
 
-    # 🔥 Applications only for recruiter jobs
-    applications = db.query(models.MatchResult).filter(
-        models.MatchResult.job_id.in_(job_ids)
-    ).all()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
 
-    total_applications = len(applications)
+        # 🔥 One row from the rollup table instead of every application
+        summary = job_stats_summary(db, job_id=job_id)
 
-    shortlisted = sum(1 for a in applications if a.status == "shortlisted")
-    rejected = sum(1 for a in applications if a.status == "rejected")
-    applied = sum(1 for a in applications if a.status == "applied")
+        entry = response_cache.put(key, {
+            "job_title": job.title,
+            "total_applications": summary["total_applications"],
+            "shortlisted": summary["shortlisted"],
+            "rejected": summary["rejected"],
+            "applied": summary["applied"],
+            "average_score": summary["average_score"],
+            "score_distribution": summary["score_distribution"]
+        }, meta={"recruiter_id": job.recruiter_id})
 
-    scores = [a.score for a in applications if a.score is not None]
-    average_score = round(sum(scores) / len(scores), 2) if scores else 0
+    # 🔒 Recruiter cannot view other recruiter job analytics
+    if current_user.role != "admin" and entry["meta"]["recruiter_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
 
+    return cached_json_response(request, entry)
+# ---------------- SCORE DISTRIBUTION ----------------
+def sketch_summary(sketch):
     return {
-        "total_jobs": total_jobs,
-        "total_applications": total_applications,
-        "shortlisted": shortlisted,
-        "rejected": rejected,
-        "applied": applied,
-        "average_match_score": average_score
+        "count": sketch.count,
+        "p50": sketch.quantile(0.5),
+        "p90": sketch.quantile(0.9),
+        "p99": sketch.quantile(0.99)
     }
-# ---------------- JOB ANALYTICS ----------------
-@app.get("/job-analytics/{job_id}")
-def job_analytics(
+
+@app.get("/job-analytics/{job_id}/distribution")
+def job_score_distribution(
     job_id: int,
-    current_user: models.User = Depends(require_role(["admin", "recruiter"])),
+    user_id: Optional[int] = None,
+    current_user: Principal = Depends(require_role(["admin", "recruiter"])),
     db: Session = Depends(get_db)
 ):
-
-    job = db.query(models.Job).filter(
+    job = db.query(models.Job.id, models.Job.title, models.Job.recruiter_id).filter(
         models.Job.id == job_id
     ).first()
 
@@ -470,64 +1116,138 @@ def job_analytics(
     if current_user.role != "admin" and job.recruiter_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    applications = db.query(models.MatchResult).filter(
-        models.MatchResult.job_id == job_id
-    ).all()
+    # 🔥 Persisted sketches: no per-request sort over the job's scores
+    sketch = load_sketch(db, job_key(job_id))
+    if sketch is None:
+        rebuild_score_sketches(db, [job_id])
+        db.commit()
+        sketch = load_sketch(db, job_key(job_id))
+    overall = load_global_sketch(db)
 
-    total_applications = len(applications)
-    shortlisted = sum(1 for a in applications if a.status == "shortlisted")
-    rejected = sum(1 for a in applications if a.status == "rejected")
-    applied = sum(1 for a in applications if a.status == "applied")
-
-    scores = [a.score for a in applications if a.score is not None]
-    average_score = round(sum(scores) / len(scores), 2) if scores else 0
-
-    return {
+    result = {
+        "job_id": job_id,
         "job_title": job.title,
-        "total_applications": total_applications,
-        "shortlisted": shortlisted,
-        "rejected": rejected,
-        "applied": applied,
-        "average_score": average_score
+        "histogram": sketch.histogram(),
+        **sketch_summary(sketch),
+        "global": sketch_summary(overall)
     }
-# ---------------- MY APPLICATIONS ----------------
-@app.get("/my-applications")
-def get_my_applications(
-    current_user: models.User = Depends(require_role(["candidate"])),
-    db: Session = Depends(get_db)
-):
-    applications = db.query(models.MatchResult).filter(
-        models.MatchResult.user_id == current_user.id
-    ).all()
-
-    result = []
 
-    for app in applications:
-        job = db.query(models.Job).filter(
-            models.Job.id == app.job_id
+    if user_id is not None:
+        match = db.query(models.MatchResult.score).filter(
+            models.MatchResult.job_id == job_id,
+            models.MatchResult.user_id == user_id
         ).first()
 
-        result.append({
-            "job_id": app.job_id,
-            "job_title": job.title if job else "Unknown",
-            "status": app.status,
-            "score": app.score
-        })
+        if not match:
+            raise HTTPException(status_code=404, detail="Application not found")
+
+        result["candidate"] = {
+            "user_id": user_id,
+            "score": match.score,
+            "percentile": sketch.percentile_rank(match.score) if match.score is not None else None
+        }
 
     return result
+
+# ---------------- MY APPLICATIONS ----------------
+@app.get("/my-applications")
+async def get_my_applications(
+    current_user: Principal = Depends(require_role_async(["candidate"])),
+    db = Depends(get_read_db)
+):
+    # 🔥 One query with the job title joined in
+    rows = await read_all(db, select(
+        models.MatchResult.job_id,
+        models.Job.title,
+        models.MatchResult.status,
+        models.MatchResult.score
+    ).outerjoin(
+        models.MatchResult.job
+    ).filter(
+        models.MatchResult.user_id == current_user.id
+    ))
+
+    return [
+        {
+            "job_id": row.job_id,
+            "job_title": row.title if row.title is not None else "Unknown",
+            "status": row.status,
+            "score": row.score
+        }
+        for row in rows
+    ]
 @app.get("/my-resume")
-def get_my_resume(
-    current_user: models.User = Depends(require_role(["candidate"])),
-    db: Session = Depends(get_db)
+async def get_my_resume(
+    current_user: Principal = Depends(require_role_async(["candidate"])),
+    db = Depends(get_read_db)
 ):
-    resume = db.query(models.Resume).filter(
+    resume = await read_first(db, select(
+        models.Resume.id,
+        models.Resume.created_at,
+        models.Resume.processing_status
+    ).filter(
         models.Resume.user_id == current_user.id
-    ).first()
+    ))
 
     if not resume:
         return {"message": "No resume uploaded"}
 
     return {
         "resume_id": resume.id,
-        "uploaded_at": resume.created_at
+        "uploaded_at": resume.created_at,
+        "processing_status": resume.processing_status
+    }
+
+# ---------------- STORAGE GC ----------------
+@app.post("/storage/gc")
+def run_storage_gc(
+    current_user: Principal = Depends(require_role(["admin"])),
+    db: Session = Depends(get_db)
+):
+    result = collect_garbage(db)
+    db.commit()
+    return result
+
+# ---------------- EMBEDDING CACHE ----------------
+@app.get("/embedding-cache-stats")
+def get_embedding_cache_stats(
+    current_user: Principal = Depends(require_role(["admin"]))
+):
+    return embedding_cache.stats()
+
+@app.get("/principal-cache-stats")
+def get_principal_cache_stats(
+    current_user: Principal = Depends(require_role(["admin"]))
+):
+    return principal_cache.stats()
+
+@app.get("/response-cache-stats")
+def get_response_cache_stats(
+    current_user: Principal = Depends(require_role(["admin"]))
+):
+    return response_cache.stats()
+
+@app.get("/executor-stats")
+def get_executor_stats(
+    current_user: Principal = Depends(require_role(["admin"]))
+):
+    return {
+        "heavy": heavy_executor.stats(),
+        "password": password_executor.stats()
     }
+
+@app.get("/embedding-service-stats")
+def get_embedding_service_stats(
+    current_user: Principal = Depends(require_role(["admin"]))
+):
+    return embedding_batcher.stats()
+
+@app.get("/db-pool-stats")
+def get_db_pool_stats(
+    current_user: Principal = Depends(require_role(["admin"]))
+):
+    # 🔥 Checked-out connections, checkout wait and overflow, for pool sizing
+    stats = {"sync": pool_stats(engine)}
+    if ASYNC_DB:
+        stats["async"] = pool_stats(async_engine)
+    return stats
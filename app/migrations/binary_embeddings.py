@@ -0,0 +1,62 @@
+# Convert JSON-text embeddings on resumes/jobs into the binary codec format, in place.
+# Run from the repo root: python -m app.migrations.binary_embeddings
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.services.embedding_codec import decode_embedding, encode_embedding, is_binary_embedding
+
+TABLES = ["resumes", "jobs"]
+BATCH_SIZE = 500
+
+
+def migrate_table(conn, table):
+    # TEXT -> BLOB keeps the stored JSON bytes, so rows can be converted afterwards
+    if conn.dialect.name == "mysql":
+        conn.execute(text(f"ALTER TABLE {table} MODIFY embedding BLOB"))
+
+    converted = 0
+    last_id = 0
+
+    while True:
+        rows = conn.execute(
+            text(
+                f"SELECT id, embedding FROM {table} "
+                "WHERE id > :last_id AND embedding IS NOT NULL "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).all()
+
+        if not rows:
+            break
+
+        updates = [
+            {"id": row.id, "embedding": encode_embedding(decode_embedding(row.embedding))}
+            for row in rows
+            if not is_binary_embedding(row.embedding)
+        ]
+
+        if updates:
+            conn.execute(
+                text(f"UPDATE {table} SET embedding = :embedding WHERE id = :id"),
+                updates
+            )
+
+        converted += len(updates)
+        last_id = rows[-1].id
+
+    return converted
+
+
+def main():
+    with engine.begin() as conn:
+        for table in TABLES:
+            print(f"{table}: converted {migrate_table(conn, table)} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Add resumes.content_hash and the resume_extractions cache, then move every
+# existing upload into the content-addressed layout. Old flat files are left
+# in place for the storage GC (POST /storage/gc) to remove.
+# Run from the repo root: python -m app.migrations.content_addressed_storage
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import os
+
+from sqlalchemy import inspect, text
+
+from app import models
+from app.database import SessionLocal, engine
+from app.services.resume_storage import store_upload
+
+
+def main():
+    existing = {c["name"] for c in inspect(engine).get_columns("resumes")}
+
+    with engine.begin() as conn:
+        if "content_hash" not in existing:
+            conn.execute(text("ALTER TABLE resumes ADD COLUMN content_hash VARCHAR(64)"))
+            conn.execute(text("CREATE INDEX ix_resumes_content_hash ON resumes (content_hash)"))
+            print("resumes: added content_hash")
+
+    models.ResumeExtraction.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        resumes = db.query(models.Resume).filter(
+            models.Resume.content_hash.is_(None),
+            models.Resume.file_path.isnot(None)
+        ).all()
+
+        moved = 0
+        for resume in resumes:
+            if not os.path.exists(resume.file_path):
+                continue
+            with open(resume.file_path, "rb") as f:
+                resume.content_hash, resume.file_path = store_upload(f, max_bytes=2**62)
+            moved += 1
+
+        db.commit()
+        print(f"resumes: {moved} files moved to content-addressed storage")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+# Create the job_stats rollup table and fill it from match_results.
+# Safe to re-run: every row is recomputed with GROUP BY aggregates.
+# Run from the repo root: python -m app.migrations.job_stats_backfill
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app import models
+from app.database import SessionLocal, engine
+from app.services.job_stats import rebuild_job_stats
+
+
+def main():
+    models.JobStats.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        rebuild_job_stats(db)
+        db.commit()
+        print(f"job_stats: rebuilt {db.query(models.JobStats).count()} jobs")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# Add the composite indexes used by keyset pagination and status filters.
+# Run from the repo root: python -m app.migrations.listing_indexes
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+
+INDEXES = {
+    "match_results": {
+        "ix_match_results_job_score": "job_id, score",
+        "ix_match_results_job_status_score": "job_id, status, score",
+    },
+    "jobs": {
+        "ix_jobs_recruiter_id": "recruiter_id, id",
+    },
+}
+
+
+def main():
+    inspector = inspect(engine)
+
+    with engine.begin() as conn:
+        for table, indexes in INDEXES.items():
+            existing = {i["name"] for i in inspector.get_indexes(table)}
+            for name, columns in indexes.items():
+                if name not in existing:
+                    conn.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
+                    print(f"{table}: added {name}")
+
+
+if __name__ == "__main__":
+    main()
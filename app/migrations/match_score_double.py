@@ -0,0 +1,30 @@
+# Widen match_results.score from FLOAT to DOUBLE on MySQL, where a
+# single-precision column never compares equal to the score stored in a
+# pagination cursor (tied scores were returned again on the next page).
+# Stored values are rounded back to the two decimals scores are computed with.
+# SQLite and PostgreSQL already store Float as double precision.
+# Run from the repo root: python -m app.migrations.match_score_double
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import text
+
+from app.database import engine
+
+
+def main():
+    if engine.dialect.name != "mysql":
+        print(f"match_results: {engine.dialect.name} already stores score as double, nothing to do")
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE match_results MODIFY score DOUBLE"))
+        updated = conn.execute(
+            text("UPDATE match_results SET score = ROUND(score, 2) WHERE score IS NOT NULL")
+        ).rowcount
+    print(f"match_results: score is DOUBLE, {updated} scores rounded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# Add version columns for persisted match scores and the (job_id, score) index.
+# Existing scores are left untagged, so the next /rank recomputes them once.
+# Run from the repo root: python -m app.migrations.match_score_versions
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+
+COLUMNS = {
+    "resumes": {"version": "INTEGER DEFAULT 1"},
+    "jobs": {"version": "INTEGER DEFAULT 1"},
+    "match_results": {"score_version": "VARCHAR(64)"},
+}
+
+
+def main():
+    inspector = inspect(engine)
+
+    with engine.begin() as conn:
+        for table, columns in COLUMNS.items():
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+                    print(f"{table}: added {name}")
+
+        conn.execute(text("UPDATE resumes SET version = 1 WHERE version IS NULL"))
+        conn.execute(text("UPDATE jobs SET version = 1 WHERE version IS NULL"))
+
+        indexes = {i["name"] for i in inspector.get_indexes("match_results")}
+        if "ix_match_results_job_score" not in indexes:
+            conn.execute(text("CREATE INDEX ix_match_results_job_score ON match_results (job_id, score)"))
+            print("match_results: added ix_match_results_job_score")
+
+
+if __name__ == "__main__":
+    main()
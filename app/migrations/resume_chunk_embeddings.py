@@ -0,0 +1,81 @@
+# Add resumes.chunk_embeddings / resume_extractions.chunk_embeddings and embed
+# the section-aware chunks of every resume that has text but no chunks yet.
+# The resume embedding is replaced by the mean of its chunk vectors (what new
+# uploads store) and Resume.version is bumped, so stored match scores go stale.
+# Run from the repo root: python -m app.migrations.resume_chunk_embeddings
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+from app.services.match_engine import encode_chunk_embeddings
+from app.services.model_registry import get_model
+from app.services.resume_chunker import chunk_resume
+
+TABLES = ["resumes", "resume_extractions"]
+BATCH_SIZE = 200
+ENCODE_BATCH_SIZE = 64
+
+
+def main():
+    column_type = "MEDIUMBLOB" if engine.dialect.name == "mysql" else "BLOB"
+    for table in TABLES:
+        columns = {c["name"] for c in inspect(engine).get_columns(table)}
+        if "chunk_embeddings" not in columns:
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN chunk_embeddings {column_type}"))
+            print(f"{table}: added chunk_embeddings")
+
+    model = get_model("embedding")
+    embedded = 0
+    last_id = 0
+
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT id, extracted_text FROM resumes "
+                    "WHERE id > :last_id AND chunk_embeddings IS NULL AND extracted_text IS NOT NULL "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": BATCH_SIZE}
+            ).all()
+
+            if not rows:
+                break
+
+            # One encode call for the chunks of the whole batch
+            chunks = [chunk_resume(row.extracted_text) for row in rows]
+            vectors = model.encode(
+                [chunk for resume_chunks in chunks for chunk in resume_chunks],
+                batch_size=ENCODE_BATCH_SIZE
+            )
+
+            updates = []
+            offset = 0
+            for row, resume_chunks in zip(rows, chunks):
+                embedding, chunk_embeddings = encode_chunk_embeddings(
+                    vectors[offset:offset + len(resume_chunks)]
+                )
+                offset += len(resume_chunks)
+                updates.append({"id": row.id, "embedding": embedding, "chunk_embeddings": chunk_embeddings})
+
+            conn.execute(
+                text(
+                    "UPDATE resumes SET embedding = :embedding, chunk_embeddings = :chunk_embeddings, "
+                    "version = COALESCE(version, 1) + 1 WHERE id = :id"
+                ),
+                updates
+            )
+
+        embedded += len(rows)
+        last_id = rows[-1].id
+        print(f"resumes: embedded {embedded}")
+
+    print(f"resumes: backfill done, {embedded} rows embedded")
+
+
+if __name__ == "__main__":
+    main()
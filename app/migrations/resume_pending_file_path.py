@@ -0,0 +1,23 @@
+# Add resumes.pending_file_path: the blob of a re-upload that is still being
+# ingested, so storage GC does not delete it before it becomes file_path.
+# Run from the repo root: python -m app.migrations.resume_pending_file_path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+
+
+def main():
+    existing = {c["name"] for c in inspect(engine).get_columns("resumes")}
+
+    if "pending_file_path" not in existing:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE resumes ADD COLUMN pending_file_path VARCHAR(255)"))
+        print("resumes: added pending_file_path")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# Add the ingestion processing state columns to existing resumes tables.
+# Run from the repo root: python -m app.migrations.resume_processing_state
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+
+COLUMNS = {
+    "processing_status": "VARCHAR(20) DEFAULT 'ready'",
+    "ingestion_id": "VARCHAR(36)",
+}
+
+
+def main():
+    existing = {c["name"] for c in inspect(engine).get_columns("resumes")}
+
+    with engine.begin() as conn:
+        for name, ddl in COLUMNS.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE resumes ADD COLUMN {name} {ddl}"))
+                print(f"resumes: added {name}")
+
+        if "ingestion_id" not in existing:
+            conn.execute(text("CREATE INDEX ix_resumes_ingestion_id ON resumes (ingestion_id)"))
+
+        conn.execute(text("UPDATE resumes SET processing_status = 'ready' WHERE processing_status IS NULL"))
+
+
+if __name__ == "__main__":
+    main()
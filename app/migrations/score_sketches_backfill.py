@@ -0,0 +1,28 @@
+# Create the score_sketches table and rebuild every job sketch.
+# Safe to re-run: sketches are recomputed from match_results. Also drops the
+# "global" row older versions stored; the global sketch is now merged on read.
+# Run from the repo root: python -m app.migrations.score_sketches_backfill
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app import models
+from app.database import SessionLocal, engine
+from app.services.score_sketch import rebuild_score_sketches
+
+
+def main():
+    models.ScoreSketch.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        rebuild_score_sketches(db)
+        db.query(models.ScoreSketch).filter(models.ScoreSketch.key == "global").delete()
+        db.commit()
+        print(f"score_sketches: rebuilt {db.query(models.ScoreSketch).count()} sketches")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Add resumes.skill_index and build it for every resume that has text but no index yet.
+# Run from the repo root: python -m app.migrations.skill_index_backfill
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+from app.services.skill_index import build_skill_index
+
+BATCH_SIZE = 500
+
+
+def main():
+    columns = {c["name"] for c in inspect(engine).get_columns("resumes")}
+    if "skill_index" not in columns:
+        column_type = "MEDIUMBLOB" if engine.dialect.name == "mysql" else "BLOB"
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE resumes ADD COLUMN skill_index {column_type}"))
+        print("resumes: added skill_index")
+
+    built = 0
+    last_id = 0
+
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT id, extracted_text FROM resumes "
+                    "WHERE id > :last_id AND skill_index IS NULL AND extracted_text IS NOT NULL "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": BATCH_SIZE}
+            ).all()
+
+            if not rows:
+                break
+
+            conn.execute(
+                text("UPDATE resumes SET skill_index = :skill_index WHERE id = :id"),
+                [
+                    {"id": row.id, "skill_index": build_skill_index(row.extracted_text)}
+                    for row in rows
+                ]
+            )
+
+        built += len(rows)
+        last_id = rows[-1].id
+        print(f"resumes: indexed {built}")
+
+    print(f"resumes: backfill done, {built} rows indexed")
+
+
+if __name__ == "__main__":
+    main()
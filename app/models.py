@@ -1,8 +1,8 @@
 from sqlalchemy import Column, Integer, String
 from app.database import Base
 from datetime import datetime
-from sqlalchemy import Float, DateTime
-from sqlalchemy import Text
+from sqlalchemy import Float, DateTime, Double
+from sqlalchemy import Text, LargeBinary
 from sqlalchemy.sql import func
 class User(Base):
     __tablename__ = "users"
@@ -12,7 +12,7 @@ class User(Base):
     email = Column(String(100), unique=True, index=True)
     password = Column(String(200))
     role = Column(String(50))
-from sqlalchemy import Text, ForeignKey
+from sqlalchemy import Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 class Resume(Base):
@@ -22,9 +22,16 @@ class Resume(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     extracted_text = Column(Text)
     extracted_skills = Column(Text)
-    embedding = Column(Text)
+    skill_index = Column(LargeBinary(length=2**24))  # skill_index format: sorted uint32 n-gram hashes
+    embedding = Column(LargeBinary)  # embedding_codec format
+    chunk_embeddings = Column(LargeBinary(length=2**24))  # embedding_codec matrix format, one row per resume chunk
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     file_path = Column(String(255))
+    content_hash = Column(String(64), index=True)  # sha256 of the stored file
+    pending_file_path = Column(String(255))  # re-upload being ingested; kept by storage GC
+    processing_status = Column(String(20), default="ready")  # processing / ready / failed
+    ingestion_id = Column(String(36), index=True)
+    version = Column(Integer, default=1)  # bumped whenever text / embedding change
 
 
     user = relationship("User")
@@ -35,8 +42,13 @@ class Job(Base):
     title = Column(String(200))
     description = Column(Text)
     required_skills = Column(Text)  # comma separated skills
-    embedding = Column(Text)
+    embedding = Column(LargeBinary)  # embedding_codec format
     recruiter_id = Column(Integer, ForeignKey("users.id"))  # 🔥 ADD THIS
+    version = Column(Integer, default=1)  # bump when description / skills / embedding change
+
+    __table_args__ = (
+        Index("ix_jobs_recruiter_id", "recruiter_id", "id"),
+    )
 
 class MatchResult(Base):
     __tablename__ = "match_results"
@@ -44,12 +56,75 @@ class MatchResult(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     job_id = Column(Integer, ForeignKey("jobs.id"))
-    score = Column(Float)
+    # DOUBLE, not FLOAT: on MySQL a single-precision column never compares
+    # equal to the score in a pagination cursor (pagination.after_score)
+    score = Column(Double)
+    score_version = Column(String(64))  # see match_scoring.score_version
     created_at = Column(DateTime, default=datetime.utcnow)
     status = Column(String(50), default="applied")
 
     user = relationship("User")
     job = relationship("Job")
+    # Candidates have one resume; use joins or selectinload() to avoid a query per row
+    resume = relationship(
+        "Resume",
+        primaryjoin="foreign(MatchResult.user_id) == Resume.user_id",
+        uselist=False,
+        viewonly=True
+    )
+
+    __table_args__ = (
+        Index("ix_match_results_job_score", "job_id", "score"),
+        Index("ix_match_results_job_status_score", "job_id", "status", "score"),
+    )
+class JobStats(Base):
+    # Per-job rollup of match_results, kept current by /apply, /update-status and
+    # score refreshes (see services/job_stats.py), so dashboards read O(jobs) rows
+    __tablename__ = "job_stats"
+
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+    total = Column(Integer, default=0, nullable=False)
+    applied = Column(Integer, default=0, nullable=False)
+    shortlisted = Column(Integer, default=0, nullable=False)
+    rejected = Column(Integer, default=0, nullable=False)
+    score_sum = Column(Float, default=0, nullable=False)
+    score_count = Column(Integer, default=0, nullable=False)
+
+    # Score histogram: bucket_N counts scores in [10N, 10N + 10), bucket_9 includes 100
+    bucket_0 = Column(Integer, default=0, nullable=False)
+    bucket_1 = Column(Integer, default=0, nullable=False)
+    bucket_2 = Column(Integer, default=0, nullable=False)
+    bucket_3 = Column(Integer, default=0, nullable=False)
+    bucket_4 = Column(Integer, default=0, nullable=False)
+    bucket_5 = Column(Integer, default=0, nullable=False)
+    bucket_6 = Column(Integer, default=0, nullable=False)
+    bucket_7 = Column(Integer, default=0, nullable=False)
+    bucket_8 = Column(Integer, default=0, nullable=False)
+    bucket_9 = Column(Integer, default=0, nullable=False)
+
+class ResumeExtraction(Base):
+    # Ingestion results cached by file content (services/resume_storage.py)
+    __tablename__ = "resume_extractions"
+
+    content_hash = Column(String(64), primary_key=True)
+    extraction_version = Column(String(128), primary_key=True)
+    extracted_text = Column(Text)
+    extracted_skills = Column(Text)
+    skill_index = Column(LargeBinary(length=2**24))
+    embedding = Column(LargeBinary)
+    chunk_embeddings = Column(LargeBinary(length=2**24))
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class ScoreSketch(Base):
+    # Persisted score histogram (services/score_sketch.py) for quantiles and
+    # percentile ranks; key is "job:<id>"
+    __tablename__ = "score_sketches"
+
+    key = Column(String(32), primary_key=True)
+    bins = Column(LargeBinary, nullable=False)
+    count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class Application(Base):
     __tablename__ = "applications"
 
@@ -0,0 +1,78 @@
+import base64
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+# -------- Keyset (cursor) pagination --------
+# Cursors are opaque, URL-safe encodings of the sort key of the last row on a
+# page. The next page is a range scan that starts right after that key, so a
+# deep page costs the same as page one (no OFFSET).
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+APPLICATION_STATUSES = ("applied", "shortlisted", "rejected")
+
+
+def encode_cursor(*values):
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def page_size(limit):
+    return max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+
+def check_status(status):
+    if status is not None and status not in APPLICATION_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"status must be one of: {', '.join(APPLICATION_STATUSES)}"
+        )
+
+
+def after_id(query, id_column, cursor):
+    # ORDER BY id ASC
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        query = query.filter(id_column > last_id)
+    return query.order_by(id_column.asc())
+
+
+def after_score(query, score_column, id_column, cursor):
+    # ORDER BY score DESC, id DESC
+    # Needs score == last_score to be exact, so score_column must be a
+    # double-precision column (MatchResult.score is)
+    if cursor:
+        last_score, last_id = decode_cursor(cursor, 2)
+        query = query.filter(or_(
+            score_column < last_score,
+            and_(score_column == last_score, id_column < last_id)
+        ))
+    return query.order_by(score_column.desc(), id_column.desc())
+
+
+def fetch_page(query, limit, cursor_of):
+    # Reads one extra row to know whether another page exists.
+    # cursor_of(row) -> tuple of sort key values
+    size = page_size(limit)
+    rows = query.limit(size + 1).all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(*cursor_of(rows[-1]))
+    return rows, next_cursor
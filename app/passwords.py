@@ -0,0 +1,34 @@
+import os
+
+from passlib.context import CryptContext
+
+from app.executors import password_executor, run_in
+
+# -------- Password hashing --------
+# One bcrypt context for the app. BCRYPT_ROUNDS sets the cost of new hashes;
+# existing hashes carry their own cost, so changing it never breaks logins.
+# The async helpers run bcrypt on password_executor (PASSWORD_HASH_THREADS).
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS
+)
+
+
+def hash_password(password: str):
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password, hashed_password):
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+async def hash_password_async(password: str):
+    return await run_in(password_executor, hash_password, password)
+
+
+async def verify_password_async(plain_password, hashed_password):
+    return await run_in(password_executor, verify_password, plain_password, hashed_password)
@@ -0,0 +1,80 @@
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# -------- Query counting --------
+# Counts SQL statements per request (or per block) so per-row query
+# regressions (N+1) show up in tests and, optionally, in response headers.
+
+QUERY_COUNT_HEADER = os.getenv("QUERY_COUNT_HEADER") == "1"
+
+_current = ContextVar("query_counter", default=None)  # per request
+_active = []  # count_queries() blocks: see every statement, from any thread
+_lock = threading.Lock()
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+
+def _record(counter, statement):
+    counter.count += 1
+    counter.statements.append(statement)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = _current.get()
+    if counter is not None:
+        _record(counter, statement)
+
+    if _active:
+        with _lock:
+            for counter in _active:
+                _record(counter, statement)
+
+
+def install(engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def count_queries():
+    # Counts every statement run while the block is open, including those
+    # run by the app on other threads (e.g. behind a TestClient)
+    counter = QueryCounter()
+    with _lock:
+        _active.append(counter)
+    try:
+        yield counter
+    finally:
+        with _lock:
+            _active.remove(counter)
+
+
+@contextmanager
+def assert_max_queries(limit):
+    # with assert_max_queries(3): client.get("/job-applications/1")
+    with count_queries() as counter:
+        yield counter
+    if counter.count > limit:
+        listing = "\n".join(counter.statements)
+        raise AssertionError(f"Expected at most {limit} queries, ran {counter.count}:\n{listing}")
+
+
+async def query_count_middleware(request, call_next):
+    # Sync endpoints run in the threadpool with a copy of this context,
+    # so the counter object set here sees their queries too
+    counter = QueryCounter()
+    token = _current.set(counter)
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+    response.headers["X-Query-Count"] = str(counter.count)
+    return response
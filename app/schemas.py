@@ -1,4 +1,8 @@
-from pydantic import BaseModel, EmailStr
+from typing import List
+
+from pydantic import BaseModel, EmailStr, Field
+
+MAX_BATCH_MATCH = 200
 
 class UserCreate(BaseModel):
     name: str
@@ -21,3 +25,7 @@ class JobCreate(BaseModel):
     title: str
     description: str
     required_skills: str
+class BatchMatchJobs(BaseModel):
+    job_ids: List[int] = Field(min_length=1, max_length=MAX_BATCH_MATCH)
+class BatchMatchCandidates(BaseModel):
+    user_ids: List[int] = Field(min_length=1, max_length=MAX_BATCH_MATCH)
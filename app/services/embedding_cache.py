@@ -0,0 +1,303 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from app.services.embedding_codec import decode_embedding, decode_embedding_matrix
+
+MAX_CACHE_BYTES = int(os.getenv("EMBEDDING_CACHE_MB", "256")) * 1024 * 1024
+MIN_RESUME_ROWS = 64
+
+
+class EmbeddingCache:
+    # Resident, per-process cache of decoded embeddings.
+    # Resume vectors live in one contiguous float32 matrix (row per Resume.id),
+    # resume chunk matrices and job vectors in dicts. All share one byte
+    # budget with LRU eviction; the resume matrix counts with its allocated
+    # capacity, not just its used rows.
+    # Entries are looked up by (resume_id, Resume.version) and (job_id,
+    # Job.version): an entry cached for another version is a miss and gets
+    # replaced, so a re-upload or job edit saved by any worker (or a
+    # backfill) is picked up without invalidation. Only one version per
+    # resume or job is kept.
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        self.dim = None
+        self.resume_matrix = None
+        self.resume_rows = OrderedDict()  # resume_id -> row in resume_matrix (LRU order)
+        self.row_ids = []  # row in resume_matrix -> resume_id
+        self.resume_versions = {}  # resume_id -> version of its cached row
+        self.resume_chunks = OrderedDict()  # resume_id -> (version, chunk matrix) (LRU order)
+        self.chunk_bytes = 0
+        self.job_vectors = OrderedDict()  # job_id -> (version, vector) (LRU order)
+        self.job_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # -------- Resumes --------
+    def get_resume_vectors(self, keys, loader):
+        # keys: (resume_id, version) pairs
+        # loader(missing_ids) -> {resume_id: stored embedding}
+        # Returns a (len(keys), dim) matrix; unknown or undecodable rows are zero.
+        resume_ids = [resume_id for resume_id, _ in keys]
+        versions = [version or 1 for _, version in keys]
+        result = None
+        missing = []
+
+        with self.lock:
+            if self.dim is not None:
+                result = np.zeros((len(keys), self.dim), dtype=np.float32)
+
+            for i, resume_id in enumerate(resume_ids):
+                row = self.resume_rows.get(resume_id)
+                if row is None or result is None or self.resume_versions[resume_id] != versions[i]:
+                    missing.append(i)
+                    continue
+                self.resume_rows.move_to_end(resume_id)
+                result[i] = self.resume_matrix[row]
+                self.hits += 1
+
+        if not missing:
+            return result if result is not None else np.zeros((0, 0), dtype=np.float32)
+
+        stored = loader([resume_ids[i] for i in missing])
+
+        with self.lock:
+            self.misses += len(missing)
+
+            for i in missing:
+                vector = self._decode(stored.get(resume_ids[i]))
+                if vector is None:
+                    continue
+
+                if result is None:
+                    result = np.zeros((len(resume_ids), vector.shape[0]), dtype=np.float32)
+                if vector.shape[0] != result.shape[1]:
+                    continue
+
+                result[i] = vector
+                self._put_resume(resume_ids[i], versions[i], vector)
+
+        if result is None:
+            result = np.zeros((len(keys), 0), dtype=np.float32)
+        return result
+
+    def get_resume_vector(self, resume_id, version, loader):
+        matrix = self.get_resume_vectors([(resume_id, version)], lambda ids: {resume_id: loader()})
+        return matrix[0] if matrix.shape[1] else None
+
+    def invalidate_resume(self, resume_id):
+        # Frees the memory early; correctness does not depend on it
+        with self.lock:
+            self._evict_resume(resume_id)
+            self._pop_chunks(resume_id)
+
+    # -------- Resume chunks --------
+    def get_resume_chunks(self, keys, loader):
+        # keys: (resume_id, version) pairs
+        # loader(missing_ids) -> {resume_id: stored chunk matrix}
+        # Returns one float32 (chunks, dim) matrix of unit rows per resume;
+        # resumes without chunks get an empty matrix (cached too, so they are
+        # not reloaded).
+        resume_ids = [resume_id for resume_id, _ in keys]
+        versions = [version or 1 for _, version in keys]
+        chunks = [None] * len(keys)
+        missing = []
+
+        with self.lock:
+            for i, resume_id in enumerate(resume_ids):
+                entry = self.resume_chunks.get(resume_id)
+                if entry is None or entry[0] != versions[i]:
+                    missing.append(i)
+                    continue
+                self.resume_chunks.move_to_end(resume_id)
+                chunks[i] = entry[1]
+                self.hits += 1
+
+        if not missing:
+            return chunks
+
+        stored = loader([resume_ids[i] for i in missing])
+
+        with self.lock:
+            self.misses += len(missing)
+            for i in missing:
+                matrix = self._decode_matrix(stored.get(resume_ids[i]))
+                chunks[i] = matrix
+                self._pop_chunks(resume_ids[i])
+                self.resume_chunks[resume_ids[i]] = (versions[i], matrix)
+                self.chunk_bytes += matrix.nbytes
+            self._enforce_budget()
+
+        return chunks
+
+    def _pop_chunks(self, resume_id):
+        entry = self.resume_chunks.pop(resume_id, None)
+        if entry is not None:
+            self.chunk_bytes -= entry[1].nbytes
+
+    def _put_resume(self, resume_id, version, vector):
+        if self.dim is None:
+            self.dim = vector.shape[0]
+            self.resume_matrix = np.zeros((MIN_RESUME_ROWS, self.dim), dtype=np.float32)
+
+        if vector.shape[0] != self.dim:
+            return
+
+        row = self.resume_rows.get(resume_id)
+        if row is None:
+            capacity = self.resume_matrix.shape[0]
+            if len(self.row_ids) == capacity:
+                if self._nbytes() + self.resume_matrix.nbytes > self.max_bytes:
+                    # Doubling would not fit: reuse the least recently used row
+                    self._evict_resume(next(iter(self.resume_rows)))
+                    self.evictions += 1
+                else:
+                    self._resize_resume_matrix(capacity * 2)
+            row = len(self.row_ids)
+            self.resume_rows[resume_id] = row
+            self.row_ids.append(resume_id)
+        else:
+            self.resume_rows.move_to_end(resume_id)
+
+        self.resume_versions[resume_id] = version
+        self.resume_matrix[row] = vector
+        self._enforce_budget()
+
+    def _evict_resume(self, resume_id):
+        row = self.resume_rows.pop(resume_id, None)
+        if row is None:
+            return
+        del self.resume_versions[resume_id]
+
+        # Keep the matrix contiguous: move the last row into the freed slot
+        moved_id = self.row_ids.pop()
+        if moved_id != resume_id:
+            self.resume_matrix[row] = self.resume_matrix[len(self.row_ids)]
+            self.resume_rows[moved_id] = row
+            self.row_ids[row] = moved_id
+
+        # Give memory back once three quarters of the rows are free
+        capacity = self.resume_matrix.shape[0]
+        if capacity > MIN_RESUME_ROWS and len(self.row_ids) <= capacity // 4:
+            self._resize_resume_matrix(max(capacity // 2, MIN_RESUME_ROWS))
+
+    def _resize_resume_matrix(self, capacity):
+        resized = np.zeros((capacity, self.dim), dtype=np.float32)
+        resized[:len(self.row_ids)] = self.resume_matrix[:len(self.row_ids)]
+        self.resume_matrix = resized
+
+    # -------- Jobs --------
+    def get_job_vector(self, job_id, version, loader):
+        # loader() -> stored embedding
+        return self.get_job_vectors([(job_id, version)], lambda ids: {job_id: loader()})[0]
+
+    def get_job_vectors(self, keys, loader):
+        # keys: (job_id, version) pairs
+        # loader(missing_ids) -> {job_id: stored embedding}; one call for all misses.
+        # Returns a list of vectors (None where missing or undecodable).
+        job_ids = [job_id for job_id, _ in keys]
+        versions = [version or 1 for _, version in keys]
+        vectors = [None] * len(keys)
+        missing = []
+
+        with self.lock:
+            for i, job_id in enumerate(job_ids):
+                entry = self.job_vectors.get(job_id)
+                if entry is None or entry[0] != versions[i]:
+                    missing.append(i)
+                    continue
+                self.job_vectors.move_to_end(job_id)
+                vectors[i] = entry[1]
+                self.hits += 1
+
+        if not missing:
+            return vectors
+
+        stored = loader([job_ids[i] for i in missing])
+
+        with self.lock:
+            self.misses += len(missing)
+            for i in missing:
+                vector = self._decode(stored.get(job_ids[i]))
+                if vector is None:
+                    continue
+                vectors[i] = vector
+                self._pop_job(job_ids[i])
+                self.job_vectors[job_ids[i]] = (versions[i], vector)
+                self.job_bytes += vector.nbytes
+            self._enforce_budget()
+
+        return vectors
+
+    def _pop_job(self, job_id):
+        entry = self.job_vectors.pop(job_id, None)
+        if entry is not None:
+            self.job_bytes -= entry[1].nbytes
+
+    # -------- Budget / stats --------
+    def _resume_bytes(self):
+        # Allocated capacity: that is what the process actually holds
+        return self.resume_matrix.nbytes if self.resume_matrix is not None else 0
+
+    def _nbytes(self):
+        return self._resume_bytes() + self.chunk_bytes + self.job_bytes
+
+    def _enforce_budget(self):
+        while self._nbytes() > self.max_bytes and (self.resume_rows or self.resume_chunks or self.job_vectors):
+            # Evict the least recently used entry from whichever side holds the most memory
+            largest = max(
+                (self._resume_bytes() if self.resume_rows else -1, 0),
+                (self.chunk_bytes if self.resume_chunks else -1, 1),
+                (self.job_bytes if self.job_vectors else -1, 2)
+            )[1]
+            if largest == 0:
+                self._evict_resume(next(iter(self.resume_rows)))
+            elif largest == 1:
+                self._pop_chunks(next(iter(self.resume_chunks)))
+            else:
+                self._pop_job(next(iter(self.job_vectors)))
+            self.evictions += 1
+
+    def _decode(self, stored):
+        if stored is None:
+            return None
+        try:
+            return np.asarray(decode_embedding(stored), dtype=np.float32)
+        except Exception:
+            return None
+
+    def _decode_matrix(self, stored):
+        # Normalized once here, so scoring is a plain dot product
+        if stored is not None:
+            try:
+                matrix = np.asarray(decode_embedding_matrix(stored), dtype=np.float32)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                return matrix / np.where(norms == 0, 1, norms)
+            except Exception:
+                pass
+        return np.zeros((0, 0), dtype=np.float32)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+                "evictions": self.evictions,
+                "cached_resumes": len(self.resume_rows),
+                "cached_resume_chunks": len(self.resume_chunks),
+                "cached_jobs": len(self.job_vectors),
+                "bytes": self._nbytes(),
+                "max_bytes": self.max_bytes
+            }
+
+
+embedding_cache = EmbeddingCache()
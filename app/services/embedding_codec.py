@@ -0,0 +1,132 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+# -------- Binary embedding format --------
+# 32-byte header followed by the raw vector:
+#   magic | format version | dtype code | reserved | dimension | int8 scale | model tag
+HEADER = struct.Struct("<4sBBHIf16s")
+MAGIC = b"TIQE"
+FORMAT_VERSION = 1
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_DTYPE = os.getenv("EMBEDDING_DTYPE", "float32")
+
+DTYPE_CODES = {"float32": 1, "float16": 2, "int8": 3}
+CODE_DTYPES = {1: np.float32, 2: np.float16, 3: np.int8}
+
+
+def encode_embedding(vector, model_name=DEFAULT_MODEL, dtype=DEFAULT_DTYPE):
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    scale = 1.0
+
+    if dtype == "int8":
+        max_abs = float(np.abs(vector).max()) if vector.size else 0.0
+        scale = max_abs / 127 if max_abs else 1.0
+        payload = np.round(vector / scale).astype(np.int8)
+    elif dtype in DTYPE_CODES:
+        payload = vector.astype(CODE_DTYPES[DTYPE_CODES[dtype]])
+    else:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        DTYPE_CODES[dtype],
+        0,
+        vector.size,
+        scale,
+        model_name.encode()[:16]
+    )
+    return header + payload.tobytes()
+
+
+def is_binary_embedding(blob):
+    return isinstance(blob, (bytes, bytearray, memoryview)) and bytes(blob[:4]) == MAGIC
+
+
+def decode_header(blob):
+    magic, version, code, _, dim, scale, model = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not a binary embedding")
+    return {
+        "version": version,
+        "dtype": CODE_DTYPES[code],
+        "dim": dim,
+        "scale": scale,
+        "model": model.rstrip(b"\0").decode()
+    }
+
+
+def decode_embedding(blob):
+    # Legacy rows still hold a JSON list
+    if not is_binary_embedding(blob):
+        return np.asarray(json.loads(blob), dtype=np.float32)
+
+    header = decode_header(blob)
+
+    # float32 / float16: read-only view over the stored bytes, no copy
+    vector = np.frombuffer(
+        blob,
+        dtype=header["dtype"],
+        count=header["dim"],
+        offset=HEADER.size
+    )
+
+    if header["dtype"] is np.int8:
+        return vector.astype(np.float32) * header["scale"]
+    return vector
+
+
+# -------- Binary embedding matrix format (resume chunk embeddings) --------
+# 32-byte header, then for int8 one float32 scale per row, then the rows:
+#   magic | format version | dtype code | reserved | rows | dimension | model tag
+MATRIX_HEADER = struct.Struct("<4sBBHII16s")
+MATRIX_MAGIC = b"TIQM"
+
+CHUNK_EMBEDDING_DTYPE = os.getenv("CHUNK_EMBEDDING_DTYPE", "int8")
+
+
+def encode_embedding_matrix(matrix, model_name=DEFAULT_MODEL, dtype=CHUNK_EMBEDDING_DTYPE):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    rows, dim = matrix.shape
+
+    if dtype == "int8":
+        # Per-row scale: each chunk keeps its own precision
+        max_abs = np.abs(matrix).max(axis=1) if dim else np.zeros(rows, dtype=np.float32)
+        scales = np.where(max_abs > 0, max_abs / 127, 1.0).astype(np.float32)
+        payload = scales.tobytes() + np.round(matrix / scales[:, None]).astype(np.int8).tobytes()
+    elif dtype in DTYPE_CODES:
+        payload = matrix.astype(CODE_DTYPES[DTYPE_CODES[dtype]]).tobytes()
+    else:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+
+    header = MATRIX_HEADER.pack(
+        MATRIX_MAGIC,
+        FORMAT_VERSION,
+        DTYPE_CODES[dtype],
+        0,
+        rows,
+        dim,
+        model_name.encode()[:16]
+    )
+    return header + payload
+
+
+def decode_embedding_matrix(blob):
+    magic, _, code, _, rows, dim, _ = MATRIX_HEADER.unpack_from(blob)
+    if magic != MATRIX_MAGIC:
+        raise ValueError("Not a binary embedding matrix")
+
+    dtype = CODE_DTYPES[code]
+    offset = MATRIX_HEADER.size
+
+    if dtype is np.int8:
+        scales = np.frombuffer(blob, dtype=np.float32, count=rows, offset=offset)
+        values = np.frombuffer(blob, dtype=np.int8, count=rows * dim, offset=offset + 4 * rows)
+        return values.reshape(rows, dim).astype(np.float32) * scales[:, None]
+
+    # float32 / float16: read-only view over the stored bytes, no copy
+    return np.frombuffer(blob, dtype=dtype, count=rows * dim, offset=offset).reshape(rows, dim)
@@ -0,0 +1,144 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+EMBED_MAX_BATCH = int(os.getenv("EMBED_MAX_BATCH", "32"))
+EMBED_MAX_WAIT_MS = float(os.getenv("EMBED_MAX_WAIT_MS", "10"))
+EMBED_THREADS = int(os.getenv("EMBED_THREADS", "1"))
+EMBED_TORCH_THREADS = int(os.getenv("EMBED_TORCH_THREADS", "0"))  # 0 = torch default
+
+
+class EmbeddingBatcher:
+    # Collects concurrent embedding requests into micro-batches.
+    # A batch is flushed when it reaches max_batch texts or when the oldest
+    # request has waited max_wait_ms; encode() then runs once per batch on a
+    # dedicated thread and results are fanned back out through futures.
+    # Threads do not survive fork(): a forked child starts over with a fresh
+    # queue, lock and no workers, and spawns its own on first use.
+
+    def __init__(
+        self,
+        encode,
+        max_batch=EMBED_MAX_BATCH,
+        max_wait_ms=EMBED_MAX_WAIT_MS,
+        threads=EMBED_THREADS,
+        torch_threads=EMBED_TORCH_THREADS
+    ):
+        self.encode = encode
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.threads = threads
+        self.torch_threads = torch_threads
+
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.workers = []
+
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, text):
+        self._start()
+        future = Future()
+        self.queue.put((text, future))
+        return future
+
+    def submit_many(self, texts):
+        # One future for all texts, resolved once the last of them is encoded,
+        # so callers can chain on it instead of holding a thread to wait
+        futures = [self.submit(text) for text in texts]
+        combined = Future()
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            try:
+                combined.set_result([future.result() for future in futures])
+            except Exception as e:
+                combined.set_exception(e)
+
+        if not futures:
+            combined.set_result([])
+        for future in futures:
+            future.add_done_callback(done)
+        return combined
+
+    def embed(self, text):
+        return self.submit(text).result()
+
+    def embed_many(self, texts):
+        return self.submit_many(texts).result()
+
+    def _start(self):
+        if self.workers:
+            return
+        with self.lock:
+            if self.workers:
+                return
+            if self.torch_threads:
+                import torch
+                torch.set_num_threads(self.torch_threads)
+            for i in range(self.threads):
+                worker = threading.Thread(
+                    target=self._run,
+                    name=f"embedding-batcher-{i}",
+                    daemon=True
+                )
+                worker.start()
+                self.workers.append(worker)
+
+    def _collect(self):
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for text, _ in batch]
+
+            try:
+                vectors = self.encode(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+            with self.lock:
+                self.batches += 1
+                self.items += len(batch)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0,
+                "queued": self.queue.qsize(),
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000,
+                "threads": self.threads
+            }
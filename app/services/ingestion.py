@@ -0,0 +1,170 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from uuid import uuid4
+
+from app.executors import heavy_executor
+
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+INGESTION_START_METHOD = os.getenv("INGESTION_START_METHOD", "spawn")
+MAX_TRACKED_INGESTIONS = 10000
+
+
+# -------- Worker-process stages --------
+def parse_resume(file_path):
+    from app.services.resume_parser import extract_skills, extract_text_from_pdf
+    from app.services.skill_index import build_skill_index
+
+    with open(file_path, "rb") as f:
+        text = extract_text_from_pdf(f)
+    return {
+        "text": text,
+        "skills": extract_skills(text),
+        "skill_index": build_skill_index(text)
+    }
+
+
+# -------- API-process stages --------
+def embed_text(text):
+    # Future of (resume embedding, chunk embeddings). Runs in the API process
+    # on the shared EmbeddingBatcher, so the chunks of concurrent uploads and
+    # /create-job share encode() batches and workers never load the model
+    from app.services.match_engine import submit_resume_embeddings
+
+    return submit_resume_embeddings(text)
+
+
+# -------- Pipeline --------
+class IngestionPipeline:
+    # Runs parse -> skill extraction on a process pool, then embedding on the
+    # micro-batcher, so the upload request only has to store the file.
+    # Progress is tracked in-process by ingestion ID; the Resume row carries
+    # the durable processing state. on_success / on_failure (DB writes) run
+    # on callback_executor, not on the process pool's result-handler thread,
+    # which would otherwise stall every other ingestion's results.
+
+    def __init__(self, workers=INGESTION_WORKERS, start_method=INGESTION_START_METHOD,
+                 callback_executor=heavy_executor):
+        self.workers = workers
+        self.start_method = start_method
+        self.callback_executor = callback_executor
+        self.executor = None
+        self.lock = threading.Lock()
+        self.jobs = OrderedDict()  # ingestion_id -> progress dict
+
+    def _pool(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+            return self.executor
+
+    def _submit(self, fn, *args):
+        # A worker that dies (e.g. OOM-killed) breaks the whole pool and every
+        # later submit raises: replace the pool and retry once
+        executor = self._pool()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._drop_pool(executor)
+            return self._pool().submit(fn, *args)
+
+    def _drop_pool(self, executor):
+        with self.lock:
+            if self.executor is executor:
+                self.executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def new_id(self):
+        return str(uuid4())
+
+    def submit(self, ingestion_id, file_path, user_id, on_success, on_failure):
+        # on_success(ingestion_id, result), on_failure(ingestion_id, error)
+        # result: {"text", "skills", "skill_index", "embedding", "chunk_embeddings"}
+        self._track(ingestion_id, user_id=user_id, status="queued", stage="queued")
+
+        def failed(error):
+            try:
+                on_failure(ingestion_id, error)
+            except Exception:
+                pass
+
+        def fail(error):
+            self._update(ingestion_id, status="failed", stage="failed", error=str(error))
+            try:
+                self.callback_executor.submit(failed, error)
+            except Exception:
+                pass
+
+        def save(result):
+            try:
+                on_success(ingestion_id, result)
+            except Exception as e:
+                return fail(e)
+            self._update(ingestion_id, status="completed", stage="completed")
+
+        def embedded(future, result):
+            try:
+                result["embedding"], result["chunk_embeddings"] = future.result()
+                self._update(ingestion_id, stage="saving")
+                self.callback_executor.submit(save, result)
+            except Exception as e:
+                fail(e)
+
+        def parsed(future):
+            try:
+                result = future.result()
+                self._update(ingestion_id, stage="embedding")
+                embed_text(result["text"]).add_done_callback(
+                    lambda f: embedded(f, result)
+                )
+            except Exception as e:
+                fail(e)
+
+        self._update(ingestion_id, status="processing", stage="parsing")
+        try:
+            future = self._submit(parse_resume, file_path)
+        except Exception as e:
+            # The caller has already stored the resume as processing
+            self._update(ingestion_id, status="failed", stage="failed", error=str(e))
+            on_failure(ingestion_id, e)
+            raise
+        future.add_done_callback(parsed)
+
+    def status(self, ingestion_id):
+        with self.lock:
+            job = self.jobs.get(ingestion_id)
+            return dict(job) if job else None
+
+    def _track(self, ingestion_id, **fields):
+        with self.lock:
+            self.jobs[ingestion_id] = {
+                "ingestion_id": ingestion_id,
+                "submitted_at": time.time(),
+                "error": None,
+                **fields
+            }
+            while len(self.jobs) > MAX_TRACKED_INGESTIONS:
+                self.jobs.popitem(last=False)
+
+    def _update(self, ingestion_id, **fields):
+        with self.lock:
+            job = self.jobs.get(ingestion_id)
+            if job is not None:
+                job.update(fields)
+                job["updated_at"] = time.time()
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+
+
+ingestion_pipeline = IngestionPipeline()
@@ -0,0 +1,195 @@
+from collections import Counter
+
+from sqlalchemy import case, func
+
+from app import models
+from app.services.response_cache import job_namespace, mark_changed
+from app.services.score_sketch import ScoreHistogram, job_key, update_score_sketches
+
+# -------- Per-job analytics rollup --------
+# Write paths apply small atomic deltas (UPDATE ... SET n = n + 1) to the
+# job_stats row of a job; dashboards only read job_stats. Jobs without a
+# row (created before the rollup existed) are rebuilt with GROUP BY queries.
+
+HISTOGRAM_BUCKETS = 10
+TRACKED_STATUSES = ("applied", "shortlisted", "rejected")
+BUCKET_COLUMNS = [f"bucket_{i}" for i in range(HISTOGRAM_BUCKETS)]
+
+
+def bucket_of(score):
+    return min(max(int(score // 10), 0), HISTOGRAM_BUCKETS - 1)
+
+
+def _apply_deltas(db, job_id, deltas):
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    stats = models.JobStats
+    updated = db.query(stats).filter(stats.job_id == job_id).update(
+        {getattr(stats, name): getattr(stats, name) + delta for name, delta in deltas.items()},
+        synchronize_session=False
+    )
+    mark_changed(db, "job_stats", job_namespace(job_id))
+
+    # No rollup row yet: build it from match_results (which already include this change)
+    if not updated:
+        db.flush()
+        rebuild_job_stats(db, [job_id])
+
+
+def _score_deltas(old_score, new_score):
+    deltas = Counter()
+    if old_score is not None:
+        deltas["score_sum"] -= old_score
+        deltas["score_count"] -= 1
+        deltas[BUCKET_COLUMNS[bucket_of(old_score)]] -= 1
+    if new_score is not None:
+        deltas["score_sum"] += new_score
+        deltas["score_count"] += 1
+        deltas[BUCKET_COLUMNS[bucket_of(new_score)]] += 1
+    return deltas
+
+
+def create_job_stats(db, job_id):
+    mark_changed(db, "job_stats", job_namespace(job_id))
+    db.add(models.JobStats(job_id=job_id))
+    db.add(models.ScoreSketch(key=job_key(job_id), bins=ScoreHistogram().to_bytes(), count=0))
+
+
+def record_application(db, job_id, status, score=None):
+    deltas = _score_deltas(None, score)
+    deltas["total"] += 1
+    if status in TRACKED_STATUSES:
+        deltas[status] += 1
+    _apply_deltas(db, job_id, deltas)
+
+
+def record_status_change(db, job_id, old_status, new_status):
+    if old_status == new_status:
+        return
+    deltas = Counter()
+    if old_status in TRACKED_STATUSES:
+        deltas[old_status] -= 1
+    if new_status in TRACKED_STATUSES:
+        deltas[new_status] += 1
+    _apply_deltas(db, job_id, deltas)
+
+
+def record_score_changes(db, job_id, changes):
+    # changes: iterable of (old_score, new_score) for applications of one job
+    changes = list(changes)
+    deltas = Counter()
+    for old_score, new_score in changes:
+        deltas.update(_score_deltas(old_score, new_score))
+    _apply_deltas(db, job_id, deltas)
+    update_score_sketches(db, job_id, changes)
+
+
+def rebuild_job_stats(db, job_ids=None):
+    # Recompute rollup rows from match_results with GROUP BY aggregates
+    match = models.MatchResult
+
+    counts = db.query(
+        match.job_id,
+        match.status,
+        func.count(match.id),
+        func.coalesce(func.sum(match.score), 0),
+        func.count(match.score)
+    ).group_by(match.job_id, match.status)
+
+    # CASE instead of CAST/FLOOR: portable, and MySQL's CAST rounds instead of truncating
+    bucket = case(
+        *[(match.score >= i * 10, i) for i in range(HISTOGRAM_BUCKETS - 1, 0, -1)],
+        else_=0
+    )
+    buckets = db.query(
+        match.job_id,
+        bucket,
+        func.count(match.id)
+    ).filter(
+        match.score.isnot(None)
+    ).group_by(match.job_id, bucket)
+
+    if job_ids is not None:
+        counts = counts.filter(match.job_id.in_(job_ids))
+        buckets = buckets.filter(match.job_id.in_(job_ids))
+    else:
+        job_ids = [row.id for row in db.query(models.Job.id)]
+
+    rows = {
+        job_id: {name: 0 for name in ["total", *TRACKED_STATUSES, "score_sum", "score_count", *BUCKET_COLUMNS]}
+        for job_id in job_ids
+    }
+
+    for job_id, status, count, score_sum, score_count in counts:
+        row = rows.get(job_id)
+        if row is None:
+            continue
+        row["total"] += count
+        if status in TRACKED_STATUSES:
+            row[status] += count
+        row["score_sum"] += score_sum
+        row["score_count"] += score_count
+
+    for job_id, bucket_index, count in buckets:
+        if job_id in rows:
+            rows[job_id][BUCKET_COLUMNS[bucket_index]] += count
+
+    for job_id, values in rows.items():
+        db.merge(models.JobStats(job_id=job_id, **values))
+    mark_changed(db, "job_stats", *map(job_namespace, rows))
+
+
+def ensure_job_stats(db, job_id=None, recruiter_id=None):
+    # Build rollup rows for jobs that do not have one yet (jobs created before
+    # the rollup existed); normally a no-op anti-join
+    query = db.query(models.Job.id).outerjoin(
+        models.JobStats, models.JobStats.job_id == models.Job.id
+    ).filter(
+        models.JobStats.job_id.is_(None)
+    )
+    if job_id is not None:
+        query = query.filter(models.Job.id == job_id)
+    if recruiter_id is not None:
+        query = query.filter(models.Job.recruiter_id == recruiter_id)
+
+    missing = [row.id for row in query]
+    if missing:
+        rebuild_job_stats(db, missing)
+        db.commit()
+
+
+def job_stats_summary(db, job_id=None, recruiter_id=None):
+    # One aggregate over job_stats rows: a single job, a recruiter's jobs, or everything
+    stats = models.JobStats
+    ensure_job_stats(db, job_id, recruiter_id)
+
+    query = db.query(
+        func.count(stats.job_id).label("jobs"),
+        *[
+            func.coalesce(func.sum(getattr(stats, name)), 0).label(name)
+            for name in ["total", *TRACKED_STATUSES, "score_sum", "score_count", *BUCKET_COLUMNS]
+        ]
+    )
+    if job_id is not None:
+        query = query.filter(stats.job_id == job_id)
+    if recruiter_id is not None:
+        query = query.join(models.Job, models.Job.id == stats.job_id).filter(
+            models.Job.recruiter_id == recruiter_id
+        )
+
+    row = query.one()
+
+    return {
+        "total_jobs": row.jobs,
+        "total_applications": int(row.total),
+        "shortlisted": int(row.shortlisted),
+        "rejected": int(row.rejected),
+        "applied": int(row.applied),
+        "average_score": round(row.score_sum / row.score_count, 2) if row.score_count else 0,
+        "score_distribution": [
+            {"range": f"{i * 10}-{i * 10 + 10}", "count": int(getattr(row, name))}
+            for i, name in enumerate(BUCKET_COLUMNS)
+        ]
+    }
@@ -1,69 +1,115 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-import json
+import os
+from concurrent.futures import Future
+
 import numpy as np
-import json
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
+from app.services.embedding_codec import (
+    decode_embedding,
+    decode_embedding_matrix,
+    encode_embedding,
+    encode_embedding_matrix
+)
+from app.services.embedding_service import EmbeddingBatcher
+from app.services.model_registry import get_model
+from app.services.resume_chunker import chunk_resume
+from app.services.skill_index import INDEX_DTYPE, compile_skill_query, decode_skill_index
+from app.services.skill_matcher import compile_skills
+
+# -------- Hybrid score weights --------
+SEMANTIC_WEIGHT = 0.6
+SKILL_WEIGHT = 0.4
+
+# -------- Semantic score over resume chunks --------
+# max: best-matching chunk; topk_mean: mean of the CHUNK_POOL_TOP_K best;
+# single: ignore chunks and use the one resume vector
+SEMANTIC_POOLING = os.getenv("SEMANTIC_POOLING", "max")
+CHUNK_POOL_TOP_K = int(os.getenv("CHUNK_POOL_TOP_K", "2"))
+
+# Bump SCORING_REVISION whenever the scoring logic changes, so persisted
+# MatchResult scores tagged with an older SCORING_VERSION get recomputed
+SCORING_REVISION = 1
+SCORING_VERSION = f"s{SCORING_REVISION}-{SEMANTIC_WEIGHT}-{SKILL_WEIGHT}-{SEMANTIC_POOLING}{CHUNK_POOL_TOP_K}"
 
-def calculate_match_score(resume, job):
+# 🔥 Concurrent generate_embedding calls share one encode() per micro-batch.
+# The model itself is loaded lazily on the first batch (see model_registry).
+embedding_batcher = EmbeddingBatcher(
+    lambda texts: get_model("embedding").encode(texts, batch_size=len(texts))
+)
+
+def calculate_match_score(resume, job, resume_vector=None, job_vector=None, resume_chunks=None):
+    # resume_chunks: decoded chunk matrix; read from resume.chunk_embeddings if not given
 
     try:
         # -------- Semantic Score --------
-        resume_embedding = np.array(
-            json.loads(resume.embedding)
-        ).reshape(1, -1)
+        if resume_vector is None:
+            resume_vector = decode_embedding(resume.embedding)
+        if job_vector is None:
+            job_vector = decode_embedding(job.embedding)
+
+        resume_embedding = resume_vector.reshape(1, -1)
 
-        job_embedding = np.array(
-            json.loads(job.embedding)
-        ).reshape(1, -1)
+        job_embedding = job_vector.reshape(1, -1)
 
-        semantic_score = cosine_similarity(
-            resume_embedding,
-            job_embedding
+        # cosine similarity: dot product of unit vectors
+        semantic_score = (
+            _unit_rows(resume_embedding) @ _unit_rows(job_embedding).T
         )[0][0]
 
+        # 🔥 Pooled over chunks when the resume has them
+        if resume_chunks is None and SEMANTIC_POOLING != "single":
+            resume_chunks = decode_chunks(getattr(resume, "chunk_embeddings", None))
+        pooled = chunk_semantic_scores([resume_chunks], job_embedding)[0]
+        if not np.isnan(pooled):
+            semantic_score = pooled
+
     except Exception:
         semantic_score = 0
 
 
     # -------- Skill Overlap Score --------
-    job_skills = [
-        s.strip().lower()
-        for s in job.required_skills.split(",")
-        if s.strip()
-    ]
+    skill_score = skill_overlap_score(
+        resume.extracted_text,
+        job.required_skills,
+        getattr(resume, "skill_index", None)
+    )
 
-    resume_text = resume.extracted_text.lower()
+    # -------- Hybrid Score --------
+    return hybrid_score(semantic_score, skill_score)
 
-    matched_skills = [
-        skill for skill in job_skills
-        if skill in resume_text
-    ]
 
-    skill_score = (
-        len(matched_skills) / len(job_skills)
-        if job_skills else 0
-    )
+def skill_overlap_score(resume_text, required_skills_str, skill_index=None):
+    # With a precomputed skill index this is a set intersection;
+    # without one it falls back to a single scan of the resume text
+    job_skills = _job_skill_list(required_skills_str)
 
-    # -------- Hybrid Score --------
-    final_score = (0.6 * semantic_score) + (0.4 * skill_score)
+    if not job_skills:
+        return 0
+
+    matched = compile_skill_query(tuple(job_skills)).count(skill_index, resume_text)
+
+    return matched / len(job_skills)
+
+
+def job_skill_query(required_skills_str):
+    return compile_skill_query(tuple(_job_skill_list(required_skills_str)))
 
-    return round(final_score * 100, 2)
+
+def hybrid_score(semantic_score, skill_score):
+    final_score = (SEMANTIC_WEIGHT * semantic_score) + (SKILL_WEIGHT * skill_score)
+
+    return round(float(final_score * 100), 2)
 
 
 def skill_gap_analysis(resume_text, required_skills_str):
-    required_skills = [skill.strip() for skill in required_skills_str.split(",")]
-    resume_text = resume_text.lower()
+    required_skills = [skill.strip() for skill in required_skills_str.split(",") if skill.strip()]
+
+    found = compile_skills(tuple(required_skills)).find(resume_text)
 
     matched = []
     missing = []
 
-    for skill in required_skills:
-        if skill in resume_text:
+    for index, skill in enumerate(required_skills):
+        if index in found:
             matched.append(skill)
         else:
             missing.append(skill)
@@ -76,21 +122,251 @@ def skill_gap_analysis(resume_text, required_skills_str):
         "skill_match_ratio": round(match_ratio * 100, 2)
     }
 def generate_embedding(text):
-    vector = model.encode(text)
-    return json.dumps(vector.tolist())
-def batch_rank(resume_embeddings_list, job_embedding_str):
-    # Convert job embedding
-    job_vector = np.array(json.loads(job_embedding_str)).reshape(1, -1)
+    vector = embedding_batcher.embed(text)
+    return encode_embedding(vector)
+
+
+def submit_resume_embeddings(text):
+    # Section-aware chunks of the resume, all queued at once so they share
+    # encode() batches with other uploads and /create-job. Returns a Future of
+    # (resume vector, chunk matrix) as stored blobs; the resume vector is the
+    # normalized mean of the chunk vectors (used by the job index and the
+    # rank prefilter).
+    embedded = Future()
+
+    def encoded(vectors):
+        try:
+            embedded.set_result(encode_chunk_embeddings(vectors.result()))
+        except Exception as e:
+            embedded.set_exception(e)
+
+    embedding_batcher.submit_many(chunk_resume(text)).add_done_callback(encoded)
+    return embedded
+
+
+def encode_chunk_embeddings(chunk_vectors):
+    chunk_vectors = np.asarray(chunk_vectors, dtype=np.float32)
+    mean = _unit_rows(chunk_vectors).mean(axis=0)
+    return encode_embedding(mean / (np.linalg.norm(mean) or 1)), encode_embedding_matrix(chunk_vectors)
+
+
+def decode_chunks(blob):
+    # Stored chunk matrix -> float32 unit rows, None if missing or unreadable
+    if blob is None:
+        return None
+    try:
+        return _unit_rows(np.asarray(decode_embedding_matrix(blob), dtype=np.float32))
+    except Exception:
+        return None
+
+
+def _job_skill_list(required_skills_str):
+    return [
+        s.strip().lower()
+        for s in (required_skills_str or "").split(",")
+        if s.strip()
+    ]
+
 
-    # Convert all resume embeddings into matrix
-    resume_vectors = np.array([
-        json.loads(emb) for emb in resume_embeddings_list
-    ])
+def _unit_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def rank_matrix(resume_matrix, resume_texts, job_vector, required_skills_str, resume_skill_indexes=None, resume_chunks=None):
+    # Vectorized calculate_match_score over many resumes for one job, on
+    # already decoded embeddings (e.g. served from the embedding cache).
+    # Returns one hybrid score per resume, in input order. Resumes with a
+    # skill index are scored from it; resume_texts is only read for the
+    # others. Resumes with chunk matrices (resume_chunks[i]) get the pooled
+    # chunk similarity.
+    n = len(resume_texts)
+    if resume_skill_indexes is None:
+        resume_skill_indexes = [None] * n
+    if n == 0:
+        return []
+
+    # -------- Semantic Scores (one matrix product) --------
+    try:
+        semantic = semantic_scores(resume_matrix, job_vector)
+    except Exception:
+        semantic = np.zeros(n)
+
+    if resume_chunks is not None:
+        try:
+            pooled = chunk_semantic_scores(resume_chunks, job_vector.reshape(1, -1))
+            semantic = np.where(np.isnan(pooled), semantic, pooled)
+        except Exception:
+            pass
+
+    # -------- Skill Overlap Scores --------
+    job_skills = _job_skill_list(required_skills_str)
+
+    if job_skills:
+        # Index lookups, or one pass over the text, whatever the number of skills
+        query = compile_skill_query(tuple(job_skills))
+        skill_scores = np.array([
+            query.count(skill_index, text)
+            for skill_index, text in zip(resume_skill_indexes, resume_texts)
+        ]) / len(job_skills)
+    else:
+        skill_scores = np.zeros(n)
+
+    # -------- Hybrid Scores --------
+    return [
+        hybrid_score(semantic_score, skill)
+        for semantic_score, skill in zip(semantic, skill_scores)
+    ]
+
+
+def semantic_scores(resume_matrix, job_vector):
+    # Cosine similarity of every resume row with the job
+    return _unit_rows(resume_matrix) @ _unit_rows(job_vector.reshape(1, -1))[0]
+
+
+def chunk_semantic_scores(resume_chunks, job_matrix, pooling=SEMANTIC_POOLING, k=CHUNK_POOL_TOP_K):
+    # Pooled cosine similarity of resume i's chunks with job row i (a single
+    # job row is broadcast). Chunk rows must be unit vectors, as decode_chunks
+    # and the embedding cache return them. All chunks are stacked into one
+    # matrix, so this is one product plus a segment reduction, whatever the
+    # number of resumes. NaN where a resume has no usable chunks (callers
+    # fall back to the single resume vector).
+    n = len(resume_chunks)
+    scores = np.full(n, np.nan)
+    dim = job_matrix.shape[1]
+    owners = [
+        i for i, chunks in enumerate(resume_chunks)
+        if chunks is not None and chunks.ndim == 2 and chunks.shape[0] and chunks.shape[1] == dim
+    ]
+    if pooling == "single" or not owners:
+        return scores
+
+    counts = np.array([resume_chunks[i].shape[0] for i in owners])
+    stacked = np.concatenate([resume_chunks[i] for i in owners])
+    jobs = _unit_rows(job_matrix)
+    if jobs.shape[0] == 1:
+        similarities = stacked @ jobs[0]
+    else:
+        similarities = np.einsum("ij,ij->i", stacked, jobs[np.repeat(owners, counts)])
+    scores[owners] = pool_segments(similarities, counts, pooling, k)
+    return scores
+
+
+def pool_segments(values, counts, pooling=SEMANTIC_POOLING, k=CHUNK_POOL_TOP_K):
+    # values holds consecutive segments of the given lengths (all > 0)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    if pooling == "max":
+        return np.maximum.reduceat(values, starts)
+    if pooling == "topk_mean":
+        # Sort each segment descending (segments stay in place), keep its first k
+        segment = np.repeat(np.arange(len(counts)), counts)
+        ordered = values[np.lexsort((-values, segment))]
+        keep = np.arange(values.size) - starts[segment] < k
+        return np.bincount(segment[keep], weights=ordered[keep], minlength=len(counts)) / np.minimum(counts, k)
+    raise ValueError(f"Unknown pooling: {pooling}")
+
+
+# -------- Two-stage ranking: cheap prefilter --------
+PREFILTER_MODES = ("embedding", "skills")
+
+
+def skill_coverage(resume_skill_indexes, required_skills_str):
+    # Index-only skill coverage for many resumes at once: resume i's hashes
+    # are shifted into their own 2**32 range of one sorted uint64 array, so
+    # every (resume, skill) lookup is a single searchsorted. Resumes without
+    # an index and skills longer than MAX_NGRAM tokens count as not found.
+    n = len(resume_skill_indexes)
+    query = job_skill_query(required_skills_str)
+    if n == 0 or not query.skills:
+        return np.zeros(n)
+
+    empty = np.zeros(0, dtype=INDEX_DTYPE)
+    indexes = [decode_skill_index(blob) if blob is not None else empty for blob in resume_skill_indexes]
+    lengths = [index.size for index in indexes]
+    if not sum(lengths):
+        return np.zeros(n)
+
+    rows = np.arange(n, dtype=np.uint64)
+    keys = (np.repeat(rows, lengths) << np.uint64(32)) | np.concatenate(indexes).astype(np.uint64)
+    wanted = (rows[:, None] << np.uint64(32)) | query.hashes.astype(np.uint64)[None, :]
+
+    positions = np.minimum(np.searchsorted(keys, wanted), keys.size - 1)
+    found = (keys[positions] == wanted) & query.indexable
+    return found.sum(axis=1) / len(query.skills)
+
+
+def prefilter_scores(mode, resume_matrix, job_vector, resume_skill_indexes, required_skills_str):
+    # Stage-one score used only to pick which resumes get the exact hybrid score
+    if mode == "skills":
+        return skill_coverage(resume_skill_indexes, required_skills_str)
+    if mode == "embedding":
+        try:
+            return semantic_scores(resume_matrix, job_vector)
+        except Exception:
+            return np.zeros(len(resume_skill_indexes))
+    raise ValueError(f"Unknown prefilter: {mode}")
+
+
+def top_n(scores, n):
+    # Positions of the n highest scores, unordered
+    scores = np.asarray(scores)
+    if n >= scores.size:
+        return np.arange(scores.size)
+    return np.argpartition(-scores, n - 1)[:n]
+
+
+def vector_matrix(vectors, dim):
+    # Stack decoded vectors; None or wrong-sized entries become zero rows (score 0)
+    matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+    for i, vector in enumerate(vectors):
+        if vector is not None and vector.shape == (dim,):
+            matrix[i] = vector
+    return matrix
+
+
+def batch_match(resume_matrix, job_matrix, resume_texts, resume_skill_indexes, required_skills_strs, resume_chunks=None):
+    # Pairwise calculate_match_score + skill_gap_analysis: entry i scores resume
+    # row i against job row i. Either matrix may be a single row, which is
+    # broadcast (one candidate vs many jobs, or many candidates vs one job);
+    # the text / skill index / skills lists always have one entry per pair,
+    # and so does resume_chunks when given.
+    n = len(required_skills_strs)
+    if n == 0:
+        return []
+
+    # -------- Semantic Scores (row-wise dot products of unit vectors) --------
+    try:
+        semantic_scores = np.einsum(
+            "ij,ij->i",
+            *np.broadcast_arrays(_unit_rows(resume_matrix), _unit_rows(job_matrix))
+        )
+    except Exception:
+        semantic_scores = np.zeros(n)
+
+    if resume_chunks is not None:
+        try:
+            pooled = chunk_semantic_scores(resume_chunks, job_matrix)
+            semantic_scores = np.where(np.isnan(pooled), semantic_scores, pooled)
+        except Exception:
+            pass
+
+    results = []
+    for i, required_skills_str in enumerate(required_skills_strs):
+        # -------- Skill Overlap / Gap --------
+        job_skills = _job_skill_list(required_skills_str)
+        if job_skills:
+            found = compile_skill_query(tuple(job_skills)).found(resume_skill_indexes[i], resume_texts[i])
+        else:
+            found = np.zeros(0, dtype=bool)
 
-    # Compute cosine similarity in one shot
-    similarities = cosine_similarity(resume_vectors, job_vector)
+        skill_ratio = found.sum() / len(job_skills) if job_skills else 0
 
-    # Flatten results
-    scores = similarities.flatten() * 100
+        results.append({
+            "match_percentage": hybrid_score(semantic_scores[i], skill_ratio),
+            "matched_skills": [skill for skill, ok in zip(job_skills, found) if ok],
+            "missing_skills": [skill for skill, ok in zip(job_skills, found) if not ok],
+            "skill_match_ratio": round(float(skill_ratio) * 100, 2)
+        })
 
-    return scores.tolist()
\ No newline at end of file
+    return results
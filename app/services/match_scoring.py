@@ -0,0 +1,238 @@
+import os
+
+from sqlalchemy import String, cast, func, literal, or_, update
+from sqlalchemy.orm import defer
+
+from app import models
+from app.services.embedding_cache import embedding_cache
+from app.services.job_stats import record_score_changes
+from app.services.match_engine import (
+    SCORING_VERSION,
+    SEMANTIC_POOLING,
+    job_skill_query,
+    prefilter_scores,
+    rank_matrix,
+    top_n
+)
+
+RANK_PREFILTER = os.getenv("RANK_PREFILTER", "embedding")  # embedding | skills
+RANK_PREFILTER_FACTOR = int(os.getenv("RANK_PREFILTER_FACTOR", "4"))  # default prefilter_n = factor * top_k
+
+# -------- Persisted match scores --------
+# MatchResult.score_version records which job embedding, resume embedding and
+# scoring weights a stored score was computed from:
+#     "<SCORING_VERSION>:<Job.version>:<Resume.version>"
+# A row is stale when its tag differs from the current one.
+
+
+def score_version(job_version, resume_version):
+    return f"{SCORING_VERSION}:{job_version or 1}:{resume_version or 1}"
+
+
+def _score_version_expr(job):
+    return (
+        literal(f"{SCORING_VERSION}:{job.version or 1}:", String)
+        + cast(func.coalesce(models.Resume.version, 1), String)
+    )
+
+
+def load_resume_embeddings(db, resume_ids):
+    rows = db.query(models.Resume.id, models.Resume.embedding).filter(
+        models.Resume.id.in_(resume_ids)
+    ).all()
+    return {row.id: row.embedding for row in rows}
+
+
+def load_resume_chunk_embeddings(db, resume_ids):
+    rows = db.query(models.Resume.id, models.Resume.chunk_embeddings).filter(
+        models.Resume.id.in_(resume_ids)
+    ).all()
+    return {row.id: row.chunk_embeddings for row in rows}
+
+
+def resume_chunks_for(db, keys):
+    # keys: (resume_id, version) pairs -> chunk matrices for pooled semantic
+    # scores (None when pooling is off)
+    if SEMANTIC_POOLING == "single":
+        return None
+    return embedding_cache.get_resume_chunks(
+        keys,
+        lambda ids: load_resume_chunk_embeddings(db, ids)
+    )
+
+
+def resume_keys(rows):
+    # Embedding cache keys for rows with resume_id and resume_version
+    return [(row.resume_id, row.resume_version) for row in rows]
+
+
+def load_job_embeddings(db, job_ids):
+    rows = db.query(models.Job.id, models.Job.embedding).filter(
+        models.Job.id.in_(job_ids)
+    ).all()
+    return {row.id: row.embedding for row in rows}
+
+
+def load_resume_texts(db, resume_ids):
+    if not resume_ids:
+        return {}
+    rows = db.query(models.Resume.id, models.Resume.extracted_text).filter(
+        models.Resume.id.in_(resume_ids)
+    ).all()
+    return {row.id: row.extracted_text for row in rows}
+
+
+def score_resumes(db, job, rows):
+    # rows: objects with resume_id, resume_version and skill_index -> one
+    # hybrid score per row
+    if not rows:
+        return []
+
+    # 🔥 Embeddings come from the resident cache; only misses hit MySQL
+    job_vector = embedding_cache.get_job_vector(job.id, job.version, lambda: job.embedding)
+    resume_matrix = embedding_cache.get_resume_vectors(
+        resume_keys(rows),
+        lambda ids: load_resume_embeddings(db, ids)
+    )
+
+    # 🔥 Skill overlap comes from the precomputed skill index; resume text is
+    # only loaded for rows that are not indexed yet (or very long skill names)
+    needs_text = job_skill_query(job.required_skills).needs_text
+    texts = load_resume_texts(db, [
+        row.resume_id for row in rows
+        if needs_text or row.skill_index is None
+    ])
+
+    return rank_matrix(
+        resume_matrix,
+        [texts.get(row.resume_id) for row in rows],
+        job_vector,
+        job.required_skills,
+        [row.skill_index for row in rows],
+        resume_chunks_for(db, resume_keys(rows))
+    )
+
+
+def refresh_stale_scores(db, job, user_id=None):
+    # Recompute only the applications of this job whose score is missing or stale.
+    # Returns the number of rows rescored; the caller commits.
+    query = db.query(
+        models.MatchResult.id,
+        models.MatchResult.score.label("old_score"),
+        models.Resume.id.label("resume_id"),
+        models.Resume.skill_index,
+        models.Resume.version.label("resume_version")
+    ).join(
+        models.MatchResult.resume
+    ).filter(
+        models.MatchResult.job_id == job.id,
+        or_(
+            models.MatchResult.score_version.is_(None),
+            models.MatchResult.score_version != _score_version_expr(job)
+        )
+    )
+
+    if user_id is not None:
+        query = query.filter(models.MatchResult.user_id == user_id)
+
+    rows = query.all()
+    save_scores(db, job, rows, score_resumes(db, job, rows))
+
+    return len(rows)
+
+
+def save_scores(db, job, rows, scores):
+    # rows: objects with id, old_score and resume_version
+    if not rows:
+        return
+
+    # 🔥 Bulk UPDATE of all scores by primary key
+    db.execute(
+        update(models.MatchResult),
+        [
+            {
+                "id": row.id,
+                "score": score,
+                "score_version": score_version(job.version, row.resume_version)
+            }
+            for row, score in zip(rows, scores)
+        ]
+    )
+    record_score_changes(db, job.id, [
+        (row.old_score, score) for row, score in zip(rows, scores)
+    ])
+
+
+def rank_top_candidates(db, job, top_k, prefilter_n, status=None, prefilter=RANK_PREFILTER):
+    # Two-stage ranking for large applicant pools. Stage one scores every
+    # application with a cheap prefilter score and keeps the best prefilter_n;
+    # stage two ranks only those by their exact hybrid score. A survivor whose
+    # stored score is current already holds that exact score; stale survivors
+    # are rescored (and persisted). Applications cut in stage one are neither
+    # ranked nor rescored.
+    # Returns (rows of (id, user_id, name, score) best first, number rescored).
+    query = db.query(
+        models.MatchResult.id,
+        models.MatchResult.user_id,
+        models.User.name,
+        models.MatchResult.score.label("old_score"),
+        (models.MatchResult.score_version == _score_version_expr(job)).label("is_current"),
+        models.Resume.id.label("resume_id"),
+        models.Resume.skill_index,
+        models.Resume.version.label("resume_version")
+    ).join(
+        models.MatchResult.user
+    ).join(
+        models.MatchResult.resume
+    ).filter(
+        models.MatchResult.job_id == job.id
+    )
+    if status:
+        query = query.filter(models.MatchResult.status == status)
+    rows = query.all()
+
+    # -------- Stage one: cheap score over the whole applicant pool --------
+    if len(rows) > prefilter_n:
+        resume_matrix = job_vector = None
+        if prefilter == "embedding":
+            job_vector = embedding_cache.get_job_vector(job.id, job.version, lambda: job.embedding)
+            resume_matrix = embedding_cache.get_resume_vectors(
+                resume_keys(rows),
+                lambda ids: load_resume_embeddings(db, ids)
+            )
+        scores = prefilter_scores(
+            prefilter,
+            resume_matrix,
+            job_vector,
+            [row.skill_index for row in rows],
+            job.required_skills
+        )
+        rows = [rows[i] for i in top_n(scores, prefilter_n)]
+
+    # -------- Stage two: exact hybrid score for the survivors --------
+    stale = [row for row in rows if not row.is_current]
+    rescored = score_resumes(db, job, stale)
+    save_scores(db, job, stale, rescored)
+    exact = dict(zip((row.id for row in stale), rescored))
+
+    ranking = [
+        (row.id, row.user_id, row.name, exact[row.id] if row.id in exact else row.old_score)
+        for row in rows
+    ]
+    ranking.sort(key=lambda row: (row[3], row[0]), reverse=True)
+    return ranking[:top_k], len(stale)
+
+
+def refresh_user_scores(db, user_id):
+    # After a resume re-upload: rescore every application of that candidate.
+    # Jobs go in id order, so concurrent multi-job writers lock per-job rows
+    # in the same order.
+    jobs = db.query(models.Job).options(
+        defer(models.Job.embedding)
+    ).join(
+        models.MatchResult, models.MatchResult.job_id == models.Job.id
+    ).filter(
+        models.MatchResult.user_id == user_id
+    ).order_by(models.Job.id).all()
+
+    return sum(refresh_stale_scores(db, job, user_id=user_id) for job in jobs)
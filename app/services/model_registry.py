@@ -0,0 +1,53 @@
+import os
+import threading
+
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+# PRELOAD_MODELS=1: load at import time, e.g. in a gunicorn --preload master,
+# so forked workers share the weights copy-on-write.
+# WARM_UP_MODELS=1: load (and run one encode) in each worker at startup.
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS") == "1"
+WARM_UP_MODELS = os.getenv("WARM_UP_MODELS") == "1"
+
+_loaders = {}
+_models = {}
+_lock = threading.Lock()
+
+
+def register_model(name, loader):
+    _loaders[name] = loader
+
+
+def get_model(name):
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _lock:
+        if name not in _models:
+            _models[name] = _loaders[name]()
+        return _models[name]
+
+
+def is_loaded(name):
+    return name in _models
+
+
+def warm_up(names=None, run_inference=True):
+    for name in names or list(_loaders):
+        model = get_model(name)
+        # Running inference initialises torch thread pools; skip it before a fork
+        if run_inference and name == "embedding":
+            model.encode(["warm up"])
+
+
+def _load_embedding_model():
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+
+register_model("embedding", _load_embedding_model)
+
+if PRELOAD_MODELS:
+    warm_up(run_inference=False)
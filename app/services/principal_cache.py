@@ -0,0 +1,72 @@
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+PRINCIPAL_CACHE_TTL_S = float(os.getenv("PRINCIPAL_CACHE_TTL_S", "60"))  # 0 disables
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+# What authenticated endpoints need from the users row
+Principal = namedtuple("Principal", ["id", "email", "role", "name"])
+
+
+class PrincipalCache:
+    # Per-process LRU of token subject (email) -> Principal with a TTL.
+    # Saves the users lookup on every authenticated request. Nothing evicts
+    # an entry early: a role change or deleted user is seen by each worker
+    # within ttl_s (a password change does not revoke issued tokens anyway).
+
+    def __init__(self, ttl_s=PRINCIPAL_CACHE_TTL_S, max_entries=PRINCIPAL_CACHE_SIZE):
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # subject -> (expires_at, principal)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, subject):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(subject)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self.entries[subject]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(subject)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, subject, principal):
+        if self.ttl_s <= 0:
+            return
+        with self.lock:
+            self.entries[subject] = (time.monotonic() + self.ttl_s, principal)
+            self.entries.move_to_end(subject)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "ttl_s": self.ttl_s,
+                "max_entries": self.max_entries
+            }
+
+
+principal_cache = PrincipalCache()
+
+
+def principal_of(user):
+    return Principal(id=user.id, email=user.email, role=user.role, name=user.name)
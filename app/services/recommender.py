@@ -0,0 +1,91 @@
+import numpy as np
+
+from app.services.match_engine import chunk_semantic_scores, hybrid_score, skill_overlap_score
+
+CANDIDATE_FACTOR = 4
+
+
+def recommend_jobs(
+    index,
+    resume_vector,
+    resume_text,
+    resume_skill_index,
+    load_jobs,
+    k=10,
+    resume_chunks=None,
+    load_job_vectors=None
+):
+    # Top-k jobs for one resume by the hybrid score.
+    # load_jobs(job_ids) -> {job_id: job row with title / required_skills / version}
+    # load_job_vectors((job_id, version) pairs) -> [job vector or None], needed
+    # with resume_chunks
+    #
+    # The index ranks jobs by similarity to the single resume vector. With
+    # resume chunks it only generates candidates: fetched jobs are rescored
+    # with the pooled chunk similarity, as /match and /batch-match do.
+    #
+    # Stopping: any job not yet fetched has index similarity <= the last one
+    # fetched and skill overlap <= 1. Without chunks that bound is exact (for
+    # an exact index). The pooled similarity is not bounded by the index
+    # similarity, so with chunks the bound adds the largest uplift (pooled -
+    # index similarity) seen among fetched jobs: a heuristic, not a guarantee.
+    fetch = k * CANDIDATE_FACTOR
+    jobs = {}
+    pooled = {}  # job_id -> pooled chunk similarity (NaN: use the index one)
+
+    while True:
+        ids, sims = index.search(resume_vector, fetch)
+
+        new_ids = [job_id for job_id in ids if job_id not in jobs]
+        if new_ids:
+            jobs.update(load_jobs(new_ids))
+            pooled.update(_pooled_similarities(
+                [(job_id, jobs[job_id].version) for job_id in new_ids if job_id in jobs],
+                resume_chunks,
+                load_job_vectors
+            ))
+
+        scored = []
+        uplift = 0.0
+        for job_id, semantic_score in zip(ids, sims):
+            job = jobs.get(job_id)
+            if job is None:
+                continue
+            semantic_score = float(semantic_score)
+            if not np.isnan(pooled.get(job_id, np.nan)):
+                uplift = max(uplift, pooled[job_id] - semantic_score)
+                semantic_score = pooled[job_id]
+            scored.append({
+                "job_id": job_id,
+                "title": job.title,
+                "required_skills": job.required_skills,
+                "match_percentage": hybrid_score(
+                    semantic_score,
+                    skill_overlap_score(resume_text, job.required_skills, resume_skill_index)
+                )
+            })
+
+        scored.sort(key=lambda x: x["match_percentage"], reverse=True)
+
+        exhausted = len(ids) < fetch
+        if exhausted or (
+            len(scored) >= k
+            and scored[k - 1]["match_percentage"] >= hybrid_score(min(float(sims[-1]) + uplift, 1.0), 1)
+        ):
+            return scored[:k]
+
+        fetch *= 4
+
+
+def _pooled_similarities(job_keys, resume_chunks, load_job_vectors):
+    if not job_keys or resume_chunks is None or load_job_vectors is None:
+        return {}
+    vectors = load_job_vectors(job_keys)
+    found = [i for i, vector in enumerate(vectors) if vector is not None]
+    if not found:
+        return {}
+    scores = chunk_semantic_scores(
+        [resume_chunks] * len(found),
+        np.stack([vectors[i] for i in found])
+    )
+    return {job_keys[i][0]: float(score) for i, score in zip(found, scores)}
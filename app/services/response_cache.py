@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "lru")  # lru | redis | off
+RESPONSE_CACHE_TTL_S = int(os.getenv("RESPONSE_CACHE_TTL_S", "30"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "5000"))
+REDIS_URL = os.getenv("REDIS_URL")
+
+# -------- Versioned response cache --------
+# Rendered JSON responses are cached under a key that embeds the current
+# version of every namespace they depend on ("jobs", "job_stats", "job:<id>").
+# Write paths call mark_changed(db, ...) and the versions are bumped once the
+# session commits, so a changed namespace simply stops matching old keys.
+# Versions live in the backend: with "lru" they are per process and the TTL
+# bounds staleness across workers; with "redis" all workers share them.
+
+
+class LRUBackend:
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.versions = {}
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl_s):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl_s, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_versions(self, namespaces):
+        with self.lock:
+            return [self.versions.get(ns, 0) for ns in namespaces]
+
+    def bump(self, namespaces):
+        with self.lock:
+            for ns in namespaces:
+                self.versions[ns] = self.versions.get(ns, 0) + 1
+
+    def size(self):
+        with self.lock:
+            return len(self.entries)
+
+
+class LocalRedis:
+    # In-process stand-in for the subset of the redis-py client used by
+    # RedisBackend (get / set with ex / mget / incr / dbsize)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = {}  # key -> (expires_at or None, bytes)
+
+    def _live(self, key):
+        entry = self.data.get(key)
+        if entry and entry[0] is not None and entry[0] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self.lock:
+            entry = self._live(key)
+            return entry[1] if entry else None
+
+    def set(self, key, value, ex=None):
+        if isinstance(value, str):
+            value = value.encode()
+        with self.lock:
+            self.data[key] = (time.monotonic() + ex if ex else None, value)
+        return True
+
+    def mget(self, keys):
+        with self.lock:
+            return [entry[1] if entry else None for entry in map(self._live, keys)]
+
+    def incr(self, key):
+        with self.lock:
+            entry = self._live(key)
+            value = int(entry[1]) + 1 if entry else 1
+            self.data[key] = (None, str(value).encode())
+            return value
+
+    def dbsize(self):
+        with self.lock:
+            return len(self.data)
+
+
+class RedisBackend:
+    def __init__(self, client, prefix="resp:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return value.decode() if value is not None else None
+
+    def set(self, key, value, ttl_s):
+        self.client.set(self.prefix + key, value, ex=ttl_s)
+
+    def get_versions(self, namespaces):
+        values = self.client.mget([self.prefix + "v:" + ns for ns in namespaces])
+        return [int(v) if v is not None else 0 for v in values]
+
+    def bump(self, namespaces):
+        for ns in namespaces:
+            self.client.incr(self.prefix + "v:" + ns)
+
+    def size(self):
+        return self.client.dbsize()
+
+
+def make_backend(kind=RESPONSE_CACHE_BACKEND):
+    if kind == "off":
+        return None
+    if kind == "lru":
+        return LRUBackend()
+    if kind == "redis":
+        # Needs the redis package and REDIS_URL; otherwise the in-process stand-in
+        if REDIS_URL:
+            import redis
+            return RedisBackend(redis.Redis.from_url(REDIS_URL))
+        return RedisBackend(LocalRedis())
+    raise ValueError(f"Unknown response cache backend: {kind}")
+
+
+class ResponseCache:
+    # Entries are {"etag", "body", "headers", "meta"}; body is the rendered JSON
+
+    def __init__(self, backend, ttl_s=RESPONSE_CACHE_TTL_S):
+        self.backend = backend
+        self.ttl_s = ttl_s
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, name, namespaces, *parts):
+        if self.backend is None:
+            return None
+        versions = self.backend.get_versions(namespaces)
+        return ":".join([name, *map(str, parts)]) + "@" + ".".join(map(str, versions))
+
+    def get(self, key):
+        if key is None:
+            return None
+        value = self.backend.get(key)
+        with self.lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(value)
+
+    def put(self, key, content, headers=None, meta=None):
+        # Renders content like FastAPI's JSONResponse and returns the entry
+        body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+        entry = {
+            "etag": '"' + hashlib.sha1(body.encode()).hexdigest() + '"',
+            "body": body,
+            "headers": headers or {},
+            "meta": meta
+        }
+        if key is not None:
+            self.backend.set(key, json.dumps(entry), self.ttl_s)
+        return entry
+
+    def bump(self, namespaces):
+        if self.backend is not None and namespaces:
+            self.backend.bump(sorted(namespaces))
+
+    def stats(self):
+        with self.lock:
+            return {
+                "backend": type(self.backend).__name__ if self.backend else None,
+                "entries": self.backend.size() if self.backend else 0,
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl_s": self.ttl_s
+            }
+
+
+response_cache = ResponseCache(make_backend())
+
+
+# -------- Invalidation from write paths --------
+PENDING_KEY = "response_cache_changed"
+
+
+def mark_changed(db, *namespaces):
+    # Bumped after db commits; dropped if it rolls back
+    db.info.setdefault(PENDING_KEY, set()).update(namespaces)
+
+
+def _after_commit(session):
+    response_cache.bump(session.info.pop(PENDING_KEY, None))
+
+
+def _after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+def track_invalidations(session_factory):
+    if not event.contains(session_factory, "after_commit", _after_commit):
+        event.listen(session_factory, "after_commit", _after_commit)
+        event.listen(session_factory, "after_rollback", _after_rollback)
+
+
+def job_namespace(job_id):
+    return f"job:{job_id}"
@@ -0,0 +1,83 @@
+import os
+import re
+
+# -------- Section-aware resume chunking --------
+# The embedding model truncates its input (MiniLM: 256 word pieces), so a
+# whole resume embedded at once mostly loses everything after the first
+# section. Resumes are split at section headings, then into overlapping
+# word windows that fit the model; each chunk is prefixed with its section
+# name so e.g. "aws" under "certifications" keeps that context.
+
+CHUNK_WORDS = int(os.getenv("RESUME_CHUNK_WORDS", "120"))
+CHUNK_OVERLAP_WORDS = int(os.getenv("RESUME_CHUNK_OVERLAP_WORDS", "20"))
+MAX_RESUME_CHUNKS = int(os.getenv("MAX_RESUME_CHUNKS", "16"))
+MIN_SECTION_WORDS = 15  # shorter sections are merged into the next one
+
+SECTION_HEADINGS = {
+    "summary", "profile", "objective", "about me",
+    "experience", "work experience", "professional experience", "employment history",
+    "education", "skills", "technical skills", "core competencies",
+    "projects", "personal projects", "certifications", "certificates",
+    "achievements", "awards", "publications", "languages", "interests", "volunteering"
+}
+
+# Part of the extraction cache key: changing any of these re-chunks resumes
+CHUNKING_VERSION = f"chunks{CHUNK_WORDS}-{CHUNK_OVERLAP_WORDS}-{MAX_RESUME_CHUNKS}"
+
+_HEADING_RE = re.compile(r"^[\s\W]*([a-z][a-z &]{1,40}?)[\s:\-–|]*$")
+
+
+def section_of(line):
+    # Heading name if the line is a section heading, else None
+    match = _HEADING_RE.match(line.lower())
+    if match and match.group(1).strip() in SECTION_HEADINGS:
+        return match.group(1).strip()
+    return None
+
+
+def split_sections(text):
+    # [(heading, words)], heading None for text before the first heading
+    sections = [[None, []]]
+    for line in (text or "").splitlines():
+        heading = section_of(line)
+        if heading:
+            sections.append([heading, []])
+        else:
+            sections[-1][1].extend(line.split())
+
+    merged = []
+    carry_heading, carry = None, []
+    for heading, words in sections:
+        # A merged section keeps the heading of its larger part
+        if len(carry) > len(words) or not heading:
+            heading = carry_heading or heading
+        words = carry + words
+        if len(words) < MIN_SECTION_WORDS:
+            carry_heading, carry = heading, words
+            continue
+        merged.append((heading, words))
+        carry_heading, carry = None, []
+
+    if carry:
+        if merged:
+            merged[-1] = (merged[-1][0], merged[-1][1] + carry)
+        else:
+            merged.append((carry_heading, carry))
+    return merged
+
+
+def chunk_resume(text, chunk_words=CHUNK_WORDS, overlap=CHUNK_OVERLAP_WORDS, max_chunks=MAX_RESUME_CHUNKS):
+    # Always returns at least one chunk (possibly empty) so every resume has an embedding
+    step = max(chunk_words - overlap, 1)
+    chunks = []
+
+    for heading, words in split_sections(text):
+        prefix = f"{heading}: " if heading else ""
+        for start in range(0, max(len(words) - overlap, 1), step):
+            chunks.append(prefix + " ".join(words[start:start + chunk_words]))
+
+    if len(chunks) > max_chunks:
+        # Keep the spread of the resume rather than only its beginning
+        keep = [round(i * (len(chunks) - 1) / (max_chunks - 1)) for i in range(max_chunks)] if max_chunks > 1 else [0]
+        chunks = [chunks[i] for i in keep]
+    return chunks or [(text or "").strip()]
@@ -1,7 +1,12 @@
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
 import PyPDF2
-import spacy
 
-nlp = spacy.load("en_core_web_sm")
+from app.services.skill_matcher import compile_skills
 
 COMMON_SKILLS = [
     "python", "java", "sql", "django", "fastapi",
@@ -9,16 +14,45 @@ COMMON_SKILLS = [
     "mysql", "aws", "docker"
 ]
 
-def extract_text_from_pdf(file):
+PDF_EXTRACT_TIMEOUT_S = float(os.getenv("PDF_EXTRACT_TIMEOUT_S", "30"))
+
+@contextmanager
+def time_limit(seconds):
+    # Hard limit: SIGALRM interrupts the parser mid-page. Signals only reach
+    # the main thread of a Unix process (the ingestion and bulk import
+    # workers); elsewhere this is a no-op and the deadline check between
+    # pages in iter_pdf_pages is the fallback.
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expired(signum, frame):
+        raise TimeoutError(f"PDF text extraction exceeded {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def iter_pdf_pages(file, timeout=PDF_EXTRACT_TIMEOUT_S):
+    # Yields the text of every page, one at a time; pages are parsed lazily
+    # by PyPDF2, so only the current page is held in memory however long
+    # the PDF is. The deadline is checked between pages (see time_limit).
     reader = PyPDF2.PdfReader(file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() or ""
-    return text.lower()
+    deadline = time.monotonic() + timeout
+
+    for i, page in enumerate(reader.pages):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"PDF text extraction exceeded {timeout}s after {i} pages")
+        yield page.extract_text() or ""
+
+def extract_text_from_pdf(file, timeout=PDF_EXTRACT_TIMEOUT_S):
+    # 🔥 Join once instead of text += page (quadratic in page count)
+    with time_limit(timeout):
+        return "".join(iter_pdf_pages(file, timeout)).lower()
 
 def extract_skills(text):
-    found_skills = []
-    for skill in COMMON_SKILLS:
-        if skill in text:
-            found_skills.append(skill)
-    return list(set(found_skills))
+    return compile_skills(tuple(COMMON_SKILLS)).matched(text)
@@ -0,0 +1,148 @@
+import hashlib
+import os
+import time
+import zlib
+from datetime import datetime
+from uuid import uuid4
+
+from app import models
+from app.services.embedding_codec import CHUNK_EMBEDDING_DTYPE, DEFAULT_DTYPE
+from app.services.model_registry import EMBEDDING_MODEL_NAME
+from app.services.resume_chunker import CHUNKING_VERSION
+from app.services.resume_parser import COMMON_SKILLS
+from app.services.skill_index import MAX_NGRAM
+
+# -------- Content-addressed resume storage --------
+# Uploads are stored once per distinct content under
+#     <root>/<sha256[:2]>/<sha256[2:4]>/<sha256>.pdf
+# and parse/skill/embedding results are cached per (content hash,
+# EXTRACTION_VERSION), so a duplicate upload skips all CPU work.
+# Blobs no Resume references any more are removed by collect_garbage.
+
+STORAGE_ROOT = os.getenv("RESUME_STORAGE_DIR", "uploaded_resumes")
+STORAGE_GC_GRACE_S = int(os.getenv("STORAGE_GC_GRACE_S", "3600"))
+CHUNK_BYTES = 1024 * 1024
+
+# Anything that changes what ingestion produces for the same bytes
+EXTRACTION_VERSION = ":".join([
+    "v1",
+    "pagesall",
+    f"skills{zlib.crc32(','.join(COMMON_SKILLS).encode()):08x}",
+    f"ngram{MAX_NGRAM}",
+    EMBEDDING_MODEL_NAME,
+    DEFAULT_DTYPE,
+    CHUNKING_VERSION,
+    CHUNK_EMBEDDING_DTYPE
+])
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def blob_path(content_hash, root=STORAGE_ROOT):
+    return os.path.join(root, content_hash[:2], content_hash[2:4], f"{content_hash}.pdf")
+
+
+def store_upload(stream, max_bytes, root=STORAGE_ROOT):
+    # Streams into a temp file while hashing, then moves it into place.
+    # Returns (content_hash, path); an existing blob is reused.
+    os.makedirs(root, exist_ok=True)
+    tmp_path = os.path.join(root, f".upload-{uuid4()}.tmp")
+    digest = hashlib.sha256()
+    written = 0
+
+    try:
+        with open(tmp_path, "wb") as out:
+            while chunk := stream.read(CHUNK_BYTES):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadTooLarge(f"Resume exceeds {max_bytes // (1024 * 1024)} MB")
+                digest.update(chunk)
+                out.write(chunk)
+
+        content_hash = digest.hexdigest()
+        path = blob_path(content_hash, root)
+
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            os.utime(path)  # fresh mtime keeps it out of the GC grace window
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+
+        return content_hash, path
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# -------- Extraction cache --------
+def load_extraction(db, content_hash):
+    row = db.query(models.ResumeExtraction).filter(
+        models.ResumeExtraction.content_hash == content_hash,
+        models.ResumeExtraction.extraction_version == EXTRACTION_VERSION
+    ).first()
+
+    if not row:
+        return None
+
+    return {
+        "text": row.extracted_text,
+        "skills": row.extracted_skills.split(", ") if row.extracted_skills else [],
+        "skill_index": row.skill_index,
+        "embedding": row.embedding,
+        "chunk_embeddings": row.chunk_embeddings
+    }
+
+
+def save_extraction(db, content_hash, result):
+    # The caller commits; concurrent duplicates may race on the primary key
+    db.merge(models.ResumeExtraction(
+        content_hash=content_hash,
+        extraction_version=EXTRACTION_VERSION,
+        extracted_text=result["text"],
+        extracted_skills=", ".join(result["skills"]),
+        skill_index=result["skill_index"],
+        embedding=result["embedding"],
+        chunk_embeddings=result.get("chunk_embeddings"),
+        created_at=datetime.utcnow()
+    ))
+
+
+# -------- Garbage collection --------
+def collect_garbage(db, grace_s=STORAGE_GC_GRACE_S, root=STORAGE_ROOT):
+    # Deletes blobs (and pre-CAS flat uploads) no Resume points at. Uploads
+    # still being ingested are referenced by pending_file_path; grace_s only
+    # covers the moment between storing a blob and committing its row.
+    # Also drops extraction cache rows from older EXTRACTION_VERSIONs.
+    referenced = set()
+    for file_path, pending_file_path in db.query(models.Resume.file_path, models.Resume.pending_file_path):
+        referenced.update(os.path.normpath(path) for path in (file_path, pending_file_path) if path)
+    cutoff = time.time() - grace_s
+    removed = 0
+    freed = 0
+
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.normpath(os.path.join(dirpath, name))
+            if path in referenced:
+                continue
+            if not (name.endswith(".pdf") or name.endswith(".tmp")):
+                continue
+            try:
+                stat = os.stat(path)
+                if stat.st_mtime > cutoff:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+            freed += stat.st_size
+
+    stale = db.query(models.ResumeExtraction).filter(
+        models.ResumeExtraction.extraction_version != EXTRACTION_VERSION
+    ).delete(synchronize_session=False)
+
+    return {"removed_files": removed, "freed_bytes": freed, "stale_extractions": stale}
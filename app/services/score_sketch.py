@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+from app import models
+
+# -------- Score distribution sketches --------
+# Match scores live in [0, 100] with two decimals, so a fixed-bin histogram
+# (0.1 wide bins) is an exact-enough quantile sketch: quantiles are within
+# half a bin, sketches merge by adding bins, and unlike t-digest / KLL a
+# score can be removed again when it is recomputed. One sketch per job,
+# persisted in score_sketches so nothing is rebuilt on restart. The global
+# sketch is not stored: it is the merge of all job sketches, built on read,
+# so score writes only ever lock their own job's row.
+
+SKETCH_BINS = 1000
+SKETCH_MAX_SCORE = 100.0
+BIN_WIDTH = SKETCH_MAX_SCORE / SKETCH_BINS
+BINS_PER_POINT = SKETCH_BINS / SKETCH_MAX_SCORE  # multiply, not divide: 0.3 / 0.1 < 3
+BINS_DTYPE = np.dtype("<u4")
+GLOBAL_SKETCH_TTL_S = int(os.getenv("GLOBAL_SKETCH_TTL_S", "30"))  # 0: merge on every read
+JOB_KEY_PREFIX = "job:"
+
+
+def job_key(job_id):
+    return f"{JOB_KEY_PREFIX}{job_id}"
+
+
+def bin_of(score):
+    return min(max(int(score * BINS_PER_POINT), 0), SKETCH_BINS - 1)
+
+
+class ScoreHistogram:
+
+    def __init__(self, bins=None):
+        self.bins = np.zeros(SKETCH_BINS, dtype=np.int64) if bins is None else bins
+
+    @classmethod
+    def from_bytes(cls, blob):
+        return cls(np.frombuffer(blob, dtype=BINS_DTYPE).astype(np.int64))
+
+    @classmethod
+    def from_scores(cls, scores):
+        sketch = cls()
+        sketch.add_many(scores)
+        return sketch
+
+    def to_bytes(self):
+        return np.maximum(self.bins, 0).astype(BINS_DTYPE).tobytes()
+
+    @property
+    def count(self):
+        return int(self.bins.sum())
+
+    def add(self, score, n=1):
+        self.bins[bin_of(score)] += n
+
+    def add_many(self, scores):
+        scores = np.asarray([s for s in scores if s is not None], dtype=np.float64)
+        if scores.size:
+            idx = np.clip((scores * BINS_PER_POINT).astype(np.int64), 0, SKETCH_BINS - 1)
+            self.bins += np.bincount(idx, minlength=SKETCH_BINS)
+
+    def merge(self, other):
+        self.bins += other.bins
+        return self
+
+    def quantile(self, q):
+        total = self.count
+        if not total:
+            return None
+        cumulative = np.cumsum(self.bins)
+        i = int(np.searchsorted(cumulative, q * total))
+        i = min(i, SKETCH_BINS - 1)
+        return round((i + 0.5) * BIN_WIDTH, 2)
+
+    def percentile_rank(self, score):
+        # Share of scores below this one (ties count half), 0-100
+        total = self.count
+        if not total:
+            return None
+        i = bin_of(score)
+        below = int(self.bins[:i].sum())
+        return round(100 * (below + self.bins[i] / 2) / total, 2)
+
+    def histogram(self, buckets=10):
+        per_bucket = SKETCH_BINS // buckets
+        counts = self.bins.reshape(buckets, per_bucket).sum(axis=1)
+        width = SKETCH_MAX_SCORE / buckets
+        return [
+            {"range": f"{i * width:g}-{(i + 1) * width:g}", "count": int(count)}
+            for i, count in enumerate(counts)
+        ]
+
+
+# -------- Persistence --------
+def load_sketch(db, key):
+    row = db.query(models.ScoreSketch.bins).filter(models.ScoreSketch.key == key).first()
+    return ScoreHistogram.from_bytes(row.bins) if row else None
+
+
+class _GlobalSketch:
+    # Per-process memo of the merged global sketch
+    lock = threading.Lock()
+    sketch = None
+    expires_at = 0.0
+
+
+def load_global_sketch(db, ttl_s=GLOBAL_SKETCH_TTL_S):
+    # Sum of every job sketch, one pass over score_sketches
+    with _GlobalSketch.lock:
+        if _GlobalSketch.sketch is not None and _GlobalSketch.expires_at > time.monotonic():
+            return _GlobalSketch.sketch
+
+    rows = db.query(models.ScoreSketch.bins).filter(
+        models.ScoreSketch.key.like(f"{JOB_KEY_PREFIX}%")
+    ).yield_per(1000)
+    bins = np.zeros(SKETCH_BINS, dtype=np.int64)
+    for (blob,) in rows:
+        bins += np.frombuffer(blob, dtype=BINS_DTYPE)
+    sketch = ScoreHistogram(bins)
+
+    with _GlobalSketch.lock:
+        _GlobalSketch.sketch = sketch
+        _GlobalSketch.expires_at = time.monotonic() + ttl_s
+    return sketch
+
+
+def _save(db, key, sketch):
+    db.merge(models.ScoreSketch(
+        key=key,
+        bins=sketch.to_bytes(),
+        count=sketch.count,
+        updated_at=datetime.utcnow()
+    ))
+
+
+def update_score_sketches(db, job_id, changes):
+    # changes: iterable of (old_score, new_score) for applications of one job.
+    # Each change is O(1) bin arithmetic; only the job's row is read (locked)
+    # and written. A missing sketch is rebuilt from match_results, which the
+    # caller has already updated.
+    deltas = Counter()
+    for old_score, new_score in changes:
+        if old_score is not None:
+            deltas[bin_of(old_score)] -= 1
+        if new_score is not None:
+            deltas[bin_of(new_score)] += 1
+    deltas = {i: d for i, d in deltas.items() if d}
+    if not deltas:
+        return
+
+    row = db.query(models.ScoreSketch).filter(
+        models.ScoreSketch.key == job_key(job_id)
+    ).with_for_update().first()
+
+    if row is None:
+        db.flush()
+        rebuild_score_sketches(db, [job_id])
+        return
+
+    sketch = ScoreHistogram.from_bytes(row.bins)
+    for i, delta in deltas.items():
+        sketch.bins[i] += delta
+    row.bins = sketch.to_bytes()
+    row.count = sketch.count
+    row.updated_at = datetime.utcnow()
+
+
+def rebuild_score_sketches(db, job_ids=None):
+    # Recompute sketches from match_results (job_ids=None: every job)
+    match = models.MatchResult
+    if job_ids is None:
+        job_ids = [row.id for row in db.query(models.Job.id)]
+
+    sketches = {job_id: ScoreHistogram() for job_id in job_ids}
+    if job_ids:
+        rows = db.query(match.job_id, match.score).filter(
+            match.score.isnot(None),
+            match.job_id.in_(job_ids)
+        ).yield_per(10000)
+        for job_id, score in rows:
+            sketches[job_id].add(score)
+
+    for job_id, sketch in sketches.items():
+        _save(db, job_key(job_id), sketch)
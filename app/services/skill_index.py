@@ -0,0 +1,95 @@
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from app.services.skill_matcher import SKILL_MATCHER_CACHE_SIZE, compile_skills, tokenize
+
+# -------- Per-resume skill token index --------
+# Every 1..MAX_NGRAM token n-gram of the resume text, hashed to 32 bits,
+# de-duplicated and stored sorted as little-endian uint32 bytes.
+# Tokens come from skill_matcher.tokenize, so an index lookup agrees with
+# the token-trie matcher for every skill of up to MAX_NGRAM tokens.
+MAX_NGRAM = 3
+INDEX_DTYPE = np.dtype("<u4")
+
+
+def ngram_hash(tokens):
+    return zlib.crc32(" ".join(tokens).encode())
+
+
+def build_skill_index(text):
+    tokens = tokenize(text)
+    hashes = {
+        ngram_hash(tokens[i:i + n])
+        for n in range(1, MAX_NGRAM + 1)
+        for i in range(len(tokens) - n + 1)
+    }
+    return np.array(sorted(hashes), dtype=INDEX_DTYPE).tobytes()
+
+
+def decode_skill_index(blob):
+    # Read-only view over the stored bytes, no copy
+    return np.frombuffer(blob, dtype=INDEX_DTYPE)
+
+
+class SkillQuery:
+    # A job's skill list compiled for lookups against resume skill indexes.
+    # Skills longer than MAX_NGRAM tokens cannot be answered from the index;
+    # needs_text tells the caller to supply the resume text for those.
+
+    def __init__(self, skills):
+        self.skills = list(skills)
+        self.hashes = np.zeros(len(self.skills), dtype=INDEX_DTYPE)
+        self.indexable = np.zeros(len(self.skills), dtype=bool)
+
+        for i, skill in enumerate(self.skills):
+            tokens = tokenize(skill)
+            if 0 < len(tokens) <= MAX_NGRAM:
+                self.hashes[i] = ngram_hash(tokens)
+                self.indexable[i] = True
+
+        # Rows of self.skills that only a text scan can answer
+        self.text_rows = [
+            i for i, (skill, ok) in enumerate(zip(self.skills, self.indexable))
+            if not ok and tokenize(skill)
+        ]
+        long_skills = tuple(self.skills[i] for i in self.text_rows)
+        self.needs_text = bool(long_skills)
+        self.text_matcher = compile_skills(long_skills)
+
+    def found_mask(self, index):
+        # index: decoded skill index (sorted uint32 array)
+        if index.size == 0:
+            return np.zeros(len(self.skills), dtype=bool)
+        positions = np.minimum(np.searchsorted(index, self.hashes), index.size - 1)
+        return (index[positions] == self.hashes) & self.indexable
+
+    def count(self, skill_index_blob=None, text=None):
+        # Number of skills present in the resume; prefers the index
+        if skill_index_blob is None:
+            return len(compile_skills(tuple(self.skills)).find(text))
+
+        found = int(self.found_mask(decode_skill_index(skill_index_blob)).sum())
+        if self.needs_text:
+            found += len(self.text_matcher.find(text))
+        return found
+
+    def found(self, skill_index_blob=None, text=None):
+        # Boolean mask over self.skills, same sources as count()
+        if skill_index_blob is None:
+            mask = np.zeros(len(self.skills), dtype=bool)
+            mask[list(compile_skills(tuple(self.skills)).find(text))] = True
+            return mask
+
+        mask = self.found_mask(decode_skill_index(skill_index_blob))
+        if self.needs_text:
+            for j in self.text_matcher.find(text):
+                mask[self.text_rows[j]] = True
+        return mask
+
+
+@lru_cache(maxsize=SKILL_MATCHER_CACHE_SIZE)
+def compile_skill_query(skills):
+    # skills: tuple of skill names
+    return SkillQuery(skills)
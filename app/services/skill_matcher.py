@@ -0,0 +1,67 @@
+import os
+import re
+from functools import lru_cache
+
+SKILL_MATCHER_CACHE_SIZE = int(os.getenv("SKILL_MATCHER_CACHE_SIZE", "1024"))
+
+# Word tokens, keeping the punctuation that belongs to skill names:
+# "c++", "c#", "node.js", "asp.net". A trailing "." (end of sentence) is dropped.
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+_END = None  # trie key holding the skill indices that end at a node
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+class SkillMatcher:
+    # Multi-pattern skill matcher over a token trie.
+    # Skills match whole tokens only, so "java" does not match inside
+    # "javascript" and "sql" does not match inside "mysql". A text is scanned
+    # once, whatever the number of skills.
+
+    def __init__(self, skills):
+        self.skills = list(skills)
+        self.trie = {}
+
+        for index, skill in enumerate(self.skills):
+            tokens = tokenize(skill)
+            if not tokens:
+                continue
+            node = self.trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(_END, []).append(index)
+
+    def find_tokens(self, tokens):
+        # Indices (into self.skills) of every skill present in the token list
+        found = set()
+        trie = self.trie
+        n = len(tokens)
+
+        for i in range(n):
+            node = trie.get(tokens[i])
+            j = i + 1
+            while node is not None:
+                if _END in node:
+                    found.update(node[_END])
+                if j == n:
+                    break
+                node = node.get(tokens[j])
+                j += 1
+
+        return found
+
+    def find(self, text):
+        return self.find_tokens(tokenize(text))
+
+    def matched(self, text):
+        found = self.find(text)
+        return [skill for index, skill in enumerate(self.skills) if index in found]
+
+
+@lru_cache(maxsize=SKILL_MATCHER_CACHE_SIZE)
+def compile_skills(skills):
+    # skills: tuple of skill names; compiled matchers are cached per skill list
+    return SkillMatcher(skills)
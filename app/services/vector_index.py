@@ -0,0 +1,175 @@
+import os
+import threading
+
+import numpy as np
+
+VECTOR_INDEX = os.getenv("VECTOR_INDEX", "exact")  # exact | ivf
+IVF_N_PROBE = int(os.getenv("IVF_N_PROBE", "8"))
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class BruteForceIndex:
+    # Exact cosine search: one matrix-vector product over every stored vector.
+    # Vectors are stored unit-normalized, so dot product == cosine similarity.
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.matrix = None
+        self.ids = []
+        self.rows = {}  # item_id -> row
+        self.max_id = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, item_id, vector):
+        vector = _unit(vector)
+
+        with self.lock:
+            if self.matrix is None:
+                self.matrix = np.zeros((1024, vector.shape[0]), dtype=np.float32)
+            if vector.shape[0] != self.matrix.shape[1]:
+                return
+
+            row = self.rows.get(item_id)
+            if row is None:
+                row = len(self.ids)
+                if row == self.matrix.shape[0]:
+                    grown = np.zeros((row * 2, self.matrix.shape[1]), dtype=np.float32)
+                    grown[:row] = self.matrix
+                    self.matrix = grown
+                self.rows[item_id] = row
+                self.ids.append(item_id)
+
+            self.matrix[row] = vector
+            self.max_id = max(self.max_id, item_id)
+            self._on_add(item_id, row)
+
+    def _on_add(self, item_id, row):
+        pass
+
+    def search(self, query, k):
+        # Returns (ids, similarities) sorted by similarity, best first
+        query = _unit(query)
+
+        with self.lock:
+            if not self.ids or query.shape[0] != self.matrix.shape[1]:
+                return [], np.zeros(0, dtype=np.float32)
+
+            rows = self._candidate_rows(query)
+            if rows is None:
+                sims = self.matrix[:len(self.ids)] @ query
+            else:
+                sims = self.matrix[rows] @ query
+
+            k = min(k, sims.shape[0])
+            if k == 0:
+                return [], sims[:0]
+            top = np.argpartition(-sims, k - 1)[:k]
+            top = top[np.argsort(-sims[top])]
+
+            top_rows = top if rows is None else rows[top]
+            return [self.ids[r] for r in top_rows], sims[top]
+
+    def _candidate_rows(self, query):
+        # None means "every row"
+        return None
+
+
+class IVFIndex(BruteForceIndex):
+    # Inverted-file index: vectors are bucketed by their nearest k-means centroid,
+    # and a search only scans the n_probe buckets closest to the query.
+    # Until enough vectors exist to train, it answers exactly like BruteForceIndex.
+    # Centroids are retrained whenever the index has doubled since the last training.
+
+    def __init__(self, n_probe=IVF_N_PROBE, min_train_size=2048, kmeans_iters=10, seed=0):
+        super().__init__()
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.kmeans_iters = kmeans_iters
+        self.rng = np.random.default_rng(seed)
+
+        self.centroids = None
+        self.lists = []  # centroid -> list of rows
+        self.list_arrays = {}  # centroid -> np.array of rows (rebuilt lazily)
+        self.assignment = {}  # row -> centroid
+        self.trained_size = 0
+
+    def _on_add(self, item_id, row):
+        if self.centroids is None or len(self.ids) >= 2 * self.trained_size:
+            if len(self.ids) >= self.min_train_size:
+                self._train()
+            return
+
+        self._assign(row)
+
+    def _assign(self, row):
+        centroid = int(np.argmax(self.centroids @ self.matrix[row]))
+
+        previous = self.assignment.get(row)
+        if previous == centroid:
+            return
+        if previous is not None:
+            self.lists[previous].remove(row)
+            self.list_arrays.pop(previous, None)
+
+        self.assignment[row] = centroid
+        self.lists[centroid].append(row)
+        self.list_arrays.pop(centroid, None)
+
+    def _train(self):
+        n = len(self.ids)
+        data = self.matrix[:n]
+        n_lists = max(1, int(np.sqrt(n)))
+
+        # Spherical k-means on a sample, then assign every row in one pass
+        sample = data[self.rng.choice(n, size=min(n, 64 * n_lists), replace=False)]
+        centroids = sample[self.rng.choice(sample.shape[0], size=n_lists, replace=False)].copy()
+
+        for _ in range(self.kmeans_iters):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1)
+            moved = norms > 0
+            centroids[moved] = sums[moved] / norms[moved, None]
+
+        labels = np.argmax(data @ centroids.T, axis=1)
+
+        self.centroids = centroids
+        self.lists = [[] for _ in range(n_lists)]
+        self.list_arrays = {}
+        self.assignment = {}
+        for row, centroid in enumerate(labels):
+            self.assignment[row] = int(centroid)
+            self.lists[centroid].append(row)
+        self.trained_size = n
+
+    def _candidate_rows(self, query):
+        if self.centroids is None:
+            return None
+
+        n_probe = min(self.n_probe, self.centroids.shape[0])
+        probes = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+
+        arrays = []
+        for c in probes:
+            array = self.list_arrays.get(c)
+            if array is None:
+                array = np.array(self.lists[c], dtype=np.int64)
+                self.list_arrays[c] = array
+            arrays.append(array)
+        return np.concatenate(arrays)
+
+
+def make_index(kind=VECTOR_INDEX):
+    if kind == "exact":
+        return BruteForceIndex()
+    if kind == "ivf":
+        return IVFIndex()
+    raise ValueError(f"Unknown vector index: {kind}")
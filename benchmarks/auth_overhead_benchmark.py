@@ -0,0 +1,65 @@
+# Benchmark: per-request cost of get_current_user (JWT decode + users lookup)
+# with the principal cache disabled vs enabled, on a throwaway SQLite database
+# Run from the repo root: python -m benchmarks.auth_overhead_benchmark
+import os
+import tempfile
+import time
+
+TMP = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{TMP}/auth_bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app import models, query_counter
+from app.auth import create_access_token, get_current_user
+from app.database import SessionLocal, engine
+from app.services.principal_cache import principal_cache
+
+USERS = 1000
+REQUESTS = 20000
+
+
+def seed():
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add_all([
+            models.User(name=f"user{i}", email=f"user{i}@example.com", password="x", role="candidate")
+            for i in range(USERS)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(tokens):
+    # One session per request, as get_db does
+    query_counter.install(engine)
+    with query_counter.count_queries() as counter:
+        start = time.perf_counter()
+        for i in range(REQUESTS):
+            db = SessionLocal()
+            try:
+                get_current_user(tokens[i % len(tokens)], db)
+            finally:
+                db.close()
+        elapsed = time.perf_counter() - start
+    return elapsed, counter.count
+
+
+def main():
+    seed()
+    tokens = [
+        create_access_token({"sub": f"user{i}@example.com", "role": "candidate"})
+        for i in range(USERS)
+    ]
+
+    print(f"{'mode':>10} {'us/request':>11} {'queries':>8}")
+    for mode, ttl in [("no cache", 0), ("cached", 60)]:
+        principal_cache.ttl_s = ttl
+        principal_cache.clear()
+        elapsed, queries = run(tokens)
+        print(f"{mode:>10} {elapsed / REQUESTS * 1e6:>11.1f} {queries:>8}")
+
+
+if __name__ == "__main__":
+    main()
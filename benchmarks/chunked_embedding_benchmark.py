@@ -0,0 +1,132 @@
+# Benchmark: single-vector resume embeddings vs section-aware chunk embeddings
+# pooled with max / top-k mean.
+#   quality: each job should rank "its" resume first; the distinguishing
+#            section sits after a long generic preamble, past the model's
+#            input limit (recall@1, MRR). Needs the embedding model.
+#   latency: encode time per resume, and semantic scoring time for one job
+#            over N resumes (random vectors, no model needed)
+# Run from the repo root: python -m benchmarks.chunked_embedding_benchmark
+import random
+import time
+
+import numpy as np
+
+from app.services.match_engine import (
+    CHUNK_POOL_TOP_K,
+    _unit_rows,
+    chunk_semantic_scores,
+    decode_chunks,
+    encode_chunk_embeddings,
+    semantic_scores
+)
+from app.services.model_registry import get_model
+from app.services.resume_chunker import MAX_RESUME_CHUNKS, chunk_resume
+
+DIM = 384
+FILLER = ["team", "player", "communication", "stakeholders", "delivered", "projects", "on", "time",
+          "collaborated", "across", "functions", "motivated", "detail", "oriented", "results", "driven"]
+DOMAINS = {
+    "data engineering": "built spark and airflow pipelines loading terabytes into a snowflake warehouse with dbt models",
+    "mobile": "shipped ios and android apps in swift and kotlin with offline sync and push notifications",
+    "security": "ran penetration tests, threat modelling and incident response, hardened iam policies and siem alerts",
+    "frontend": "developed react and typescript single page apps with accessible design systems and storybook",
+    "ml": "trained pytorch transformer models, ran hyperparameter sweeps and served models with triton",
+    "devops": "managed kubernetes clusters with terraform and helm, built ci pipelines and prometheus alerting",
+    "embedded": "wrote c firmware for arm microcontrollers, rtos scheduling, can bus drivers and jtag debugging",
+    "finance": "built risk models for fixed income portfolios, var calculations and regulatory capital reports",
+}
+JOBS = {
+    "data engineering": "Data engineer: Spark, Airflow, dbt, Snowflake warehouse pipelines",
+    "mobile": "Mobile developer: Swift iOS and Kotlin Android apps",
+    "security": "Security engineer: penetration testing, incident response, SIEM",
+    "frontend": "Frontend engineer: React, TypeScript, design systems",
+    "ml": "Machine learning engineer: PyTorch transformers, model serving",
+    "devops": "DevOps engineer: Kubernetes, Terraform, Helm, Prometheus",
+    "embedded": "Embedded engineer: C firmware, ARM microcontrollers, RTOS",
+    "finance": "Quantitative analyst: fixed income risk models, VaR",
+}
+
+
+def make_resume(domain, preamble_words, rng):
+    return "\n".join([
+        "Summary",
+        " ".join(rng.choices(FILLER, k=preamble_words)),
+        "Experience",
+        " ".join(rng.choices(FILLER, k=preamble_words // 2)),
+        "Projects",
+        DOMAINS[domain],
+        " ".join(rng.choices(FILLER, k=30))
+    ])
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def quality(model):
+    rng = random.Random(0)
+    domains = list(DOMAINS)
+    job_matrix = model.encode([JOBS[d] for d in domains])
+
+    print(f"{'preamble':>8} {'method':>10} {'recall@1':>9} {'MRR':>6} {'encode ms/resume':>17}")
+    for preamble_words in [50, 200, 400]:
+        resumes = [make_resume(d, preamble_words, rng) for d in domains for _ in range(5)]
+        owners = np.repeat(np.arange(len(domains)), 5)
+
+        single, single_s = timed(lambda: model.encode(resumes))
+        chunks = [chunk_resume(text) for text in resumes]
+        flat, chunk_s = timed(lambda: model.encode([c for resume_chunks in chunks for c in resume_chunks]))
+        offsets = np.cumsum([0] + [len(c) for c in chunks])
+        # Stored form: pooled vector + int8 chunk matrix
+        stored = [encode_chunk_embeddings(flat[offsets[i]:offsets[i + 1]]) for i in range(len(resumes))]
+        chunk_matrices = [decode_chunks(blob) for _, blob in stored]
+
+        methods = {
+            "single": lambda job: semantic_scores(single, job),
+            "max": lambda job: chunk_semantic_scores(chunk_matrices, job.reshape(1, -1), "max"),
+            "topk_mean": lambda job: chunk_semantic_scores(chunk_matrices, job.reshape(1, -1), "topk_mean")
+        }
+        for name, score in methods.items():
+            hits, reciprocal = [], []
+            for j, job in enumerate(job_matrix):
+                order = np.argsort(-score(job))
+                rank = int(np.nonzero(owners[order] == j)[0][0]) + 1
+                hits.append(rank == 1)
+                reciprocal.append(1 / rank)
+            seconds = single_s if name == "single" else chunk_s
+            print(
+                f"{preamble_words:>8} {name:>10} {np.mean(hits):>9.2f} {np.mean(reciprocal):>6.2f} "
+                f"{seconds * 1000 / len(resumes):>17.1f}"
+            )
+
+
+def scoring_latency():
+    rng = np.random.default_rng(0)
+    job = rng.standard_normal(DIM).astype(np.float32)
+
+    print(f"\n{'resumes':>8} {'chunks':>6} {'single (ms)':>12} {'max (ms)':>9} {'topk_mean (ms)':>15}")
+    for n in [1000, 10000, 30000]:
+        matrix = rng.standard_normal((n, DIM)).astype(np.float32)
+        for per_resume in [4, MAX_RESUME_CHUNKS]:
+            # Unit rows, as the embedding cache holds them
+            chunks = [_unit_rows(rng.standard_normal((per_resume, DIM)).astype(np.float32)) for _ in range(n)]
+            _, single_s = timed(lambda: semantic_scores(matrix, job))
+            _, max_s = timed(lambda: chunk_semantic_scores(chunks, job.reshape(1, -1), "max"))
+            _, topk_s = timed(lambda: chunk_semantic_scores(chunks, job.reshape(1, -1), "topk_mean", CHUNK_POOL_TOP_K))
+            print(f"{n:>8} {per_resume:>6} {single_s * 1000:>12.1f} {max_s * 1000:>9.1f} {topk_s * 1000:>15.1f}")
+
+
+def main():
+    try:
+        model = get_model("embedding")
+    except Exception as e:
+        print(f"quality: skipped, embedding model unavailable ({e})")
+    else:
+        quality(model)
+    scoring_latency()
+
+
+if __name__ == "__main__":
+    main()
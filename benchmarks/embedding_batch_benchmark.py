@@ -0,0 +1,93 @@
+# Benchmark: one-at-a-time model.encode vs the micro-batching EmbeddingBatcher,
+# for single texts (/create-job) and for resume uploads, whose chunks are
+# queued together and share batches with other concurrent uploads
+# Run from the repo root: python -m benchmarks.embedding_batch_benchmark
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services import match_engine
+from app.services.embedding_service import EmbeddingBatcher
+from app.services.model_registry import get_model
+from app.services.resume_chunker import chunk_resume
+
+WORDS = ["python", "backend", "engineer", "data", "pipelines", "react", "cloud",
+         "docker", "led", "team", "built", "services", "sql", "ml", "apis"]
+TEXTS = 512
+RESUMES = 64
+
+
+def make_texts(n):
+    rng = random.Random(0)
+    return [" ".join(rng.choices(WORDS, k=120)) for _ in range(n)]
+
+
+def make_resumes(n):
+    rng = random.Random(1)
+    return [
+        "\n".join(f"{heading}\n{' '.join(rng.choices(WORDS, k=150))}" for heading in ["Summary", "Experience", "Projects"])
+        for _ in range(n)
+    ]
+
+
+def resume_uploads(model):
+    resumes = make_resumes(RESUMES)
+
+    start = time.perf_counter()
+    for text in resumes:
+        model.encode(chunk_resume(text))
+    baseline = RESUMES / (time.perf_counter() - start)
+    print(f"\nresume uploads, one encode per resume: {baseline:6.1f} resumes/s")
+
+    for clients in [1, 4, 16]:
+        # The ingestion pipeline's path: submit_resume_embeddings on the shared batcher
+        match_engine.embedding_batcher = EmbeddingBatcher(
+            lambda batch: model.encode(batch, batch_size=len(batch))
+        )
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            start = time.perf_counter()
+            list(pool.map(lambda text: match_engine.submit_resume_embeddings(text).result(), resumes))
+            throughput = RESUMES / (time.perf_counter() - start)
+
+        stats = match_engine.embedding_batcher.stats()
+        print(
+            f"concurrent uploads={clients:<3}: {throughput:6.1f} resumes/s ({throughput / baseline:.1f}x), "
+            f"avg batch {stats['avg_batch_size']}"
+        )
+
+
+def main():
+    model = get_model("embedding")
+    texts = make_texts(TEXTS)
+    model.encode(texts[:8])  # warm-up
+
+    start = time.perf_counter()
+    for text in texts:
+        model.encode(text)
+    baseline = TEXTS / (time.perf_counter() - start)
+    print(f"one-at-a-time: {baseline:8.1f} texts/s")
+
+    for clients in [1, 8, 32]:
+        for max_batch, max_wait_ms in [(16, 5), (32, 10), (64, 20)]:
+            batcher = EmbeddingBatcher(
+                lambda batch: model.encode(batch, batch_size=len(batch)),
+                max_batch=max_batch,
+                max_wait_ms=max_wait_ms
+            )
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                start = time.perf_counter()
+                list(pool.map(batcher.embed, texts))
+                throughput = TEXTS / (time.perf_counter() - start)
+
+            stats = batcher.stats()
+            print(
+                f"clients={clients:<3} max_batch={max_batch:<3} wait={max_wait_ms:>2}ms: "
+                f"{throughput:8.1f} texts/s ({throughput / baseline:.1f}x), "
+                f"avg batch {stats['avg_batch_size']}"
+            )
+
+    resume_uploads(model)
+
+
+if __name__ == "__main__":
+    main()
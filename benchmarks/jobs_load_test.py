@@ -0,0 +1,93 @@
+# Load test: /jobs latency (p50/p90/p99) on its own, then while resume uploads
+# are in flight. Runs against a live server, e.g.
+#   uvicorn app.main:app --port 8000            (or ASYNC_DB=1 uvicorn ...)
+#   python -m benchmarks.jobs_load_test --base-url http://localhost:8000 --pdf sample.pdf
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+import httpx
+import numpy as np
+
+
+async def register(client, role):
+    name = f"load-{role}-{uuid4().hex[:8]}"
+    email = f"{name}@example.com"
+    r = await client.post("/register", json={"name": name, "email": email, "password": "pw", "role": role})
+    r.raise_for_status()
+    r = await client.post("/login", data={"username": email, "password": "pw"})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def poll_jobs(client, headers, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        r = await client.get("/jobs", params={"limit": 50}, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        r.raise_for_status()
+
+
+async def upload_loop(client, headers, pdf_bytes, stop, counts):
+    while not stop.is_set():
+        # A little noise per upload so content-addressed dedup does not short-circuit it
+        body = pdf_bytes + f"\n% {uuid4()}\n".encode()
+        r = await client.post(
+            "/upload-resume",
+            files={"file": ("resume.pdf", body, "application/pdf")},
+            headers=headers
+        )
+        counts.append(r.status_code)
+
+
+async def phase(client, readers, uploaders, pdf_bytes, seconds):
+    stop = asyncio.Event()
+    latencies = []
+    uploads = []
+
+    tasks = [asyncio.create_task(poll_jobs(client, h, stop, latencies)) for h in readers]
+    tasks += [asyncio.create_task(upload_loop(client, h, pdf_bytes, stop, uploads)) for h in uploaders]
+
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": len(ms),
+        "p50": np.percentile(ms, 50),
+        "p90": np.percentile(ms, 90),
+        "p99": np.percentile(ms, 99),
+        "uploads": len(uploads)
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--pdf", required=True)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--uploaders", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    with open(args.pdf, "rb") as f:
+        pdf_bytes = f.read()
+
+    limits = httpx.Limits(max_connections=args.readers + args.uploaders + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120, limits=limits) as client:
+        readers = [await register(client, "candidate") for _ in range(args.readers)]
+        uploaders = [await register(client, "candidate") for _ in range(args.uploaders)]
+
+        for label, active_uploaders in [("idle", []), ("with uploads", uploaders)]:
+            result = await phase(client, readers, active_uploaders, pdf_bytes, args.seconds)
+            print(
+                f"/jobs {label:>13}: {result['requests']:6d} requests  "
+                f"p50 {result['p50']:7.1f}ms  p90 {result['p90']:7.1f}ms  p99 {result['p99']:7.1f}ms  "
+                f"({result['uploads']} uploads)"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+# Load test: /jobs latency (p50/p90/p99) on its own, then during a burst of
+# /login requests (bcrypt verification). Runs against a live server, e.g.
+#   uvicorn app.main:app --port 8000
+#   python -m benchmarks.login_burst_load_test --base-url http://localhost:8000 --logins 500
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks.jobs_load_test import poll_jobs, register
+
+
+def percentiles(latencies):
+    ms = np.array(latencies) * 1000
+    return len(ms), np.percentile(ms, 50), np.percentile(ms, 90), np.percentile(ms, 99)
+
+
+async def login_burst(client, email, logins, concurrency, statuses, latencies):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            start = time.perf_counter()
+            r = await client.post("/login", data={"username": email, "password": "pw"})
+            latencies.append(time.perf_counter() - start)
+            statuses.append(r.status_code)
+
+    await asyncio.gather(*(one() for _ in range(logins)))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.readers + args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=300, limits=limits) as client:
+        readers = [await register(client, "candidate") for _ in range(args.readers)]
+        email = f"burst-{time.time_ns()}@example.com"
+        r = await client.post("/register", json={"name": "burst", "email": email, "password": "pw", "role": "candidate"})
+        r.raise_for_status()
+
+        # Idle baseline
+        stop = asyncio.Event()
+        idle = []
+        tasks = [asyncio.create_task(poll_jobs(client, h, stop, idle)) for h in readers]
+        await asyncio.sleep(args.seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+        # Same readers while the login burst runs
+        stop = asyncio.Event()
+        busy, statuses, login_latencies = [], [], []
+        tasks = [asyncio.create_task(poll_jobs(client, h, stop, busy)) for h in readers]
+        start = time.perf_counter()
+        await login_burst(client, email, args.logins, args.concurrency, statuses, login_latencies)
+        burst_s = time.perf_counter() - start
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    for label, latencies in [("idle", idle), ("login burst", busy)]:
+        n, p50, p90, p99 = percentiles(latencies)
+        print(f"/jobs  {label:>12}: {n:6d} requests  p50 {p50:7.1f}ms  p90 {p90:7.1f}ms  p99 {p99:7.1f}ms")
+
+    n, p50, p90, p99 = percentiles(login_latencies)
+    failed = sum(1 for s in statuses if s != 200)
+    print(
+        f"/login {'burst':>12}: {n:6d} requests  p50 {p50:7.1f}ms  p90 {p90:7.1f}ms  p99 {p99:7.1f}ms  "
+        f"({n / burst_s:.1f}/s, {failed} failed)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
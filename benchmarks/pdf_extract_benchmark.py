@@ -0,0 +1,115 @@
+# Benchmark: text extraction from synthetic 20-200 page PDFs (string += vs page generator)
+# plus peak memory of buffering an upload vs streaming it to disk in chunks
+# Run from the repo root: python -m benchmarks.pdf_extract_benchmark
+import io
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import PyPDF2
+
+from app.services.resume_parser import extract_text_from_pdf
+
+PAGE_COUNTS = [20, 50, 100, 200]
+LINES_PER_PAGE = 50
+WORDS = ["python", "sql", "docker", "experience", "team", "project", "built", "api",
+         "data", "cloud", "lead", "designed", "services", "scalable", "production"]
+
+
+def make_pdf(pages, rng):
+    # Minimal hand-written PDF: one Helvetica text stream per page
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+
+    for _ in range(pages):
+        lines = [" ".join(rng.choices(WORDS, k=12)) for _ in range(LINES_PER_PAGE)]
+        stream = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        stream = stream.encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        page_ids.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (i, body))
+
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def legacy_extract(file):
+    reader = PyPDF2.PdfReader(file)
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text() or ""
+    return text.lower()
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'pages':>6} {'size':>8} {'legacy':>10} {'generator':>10} {'legacy peak':>12} {'gen peak':>10}")
+        for pages in PAGE_COUNTS:
+            path = os.path.join(tmp, f"{pages}.pdf")
+            with open(path, "wb") as f:
+                f.write(make_pdf(pages, rng))
+
+            with open(path, "rb") as f:
+                old, old_time, old_peak = measure(lambda: legacy_extract(f))
+            with open(path, "rb") as f:
+                new, new_time, new_peak = measure(lambda: extract_text_from_pdf(f))
+            assert old == new
+
+            print(
+                f"{pages:>6} {os.path.getsize(path) / 1024:>6.0f}KB "
+                f"{old_time * 1000:>8.0f}ms {new_time * 1000:>8.0f}ms "
+                f"{old_peak / 2**20:>10.1f}MB {new_peak / 2**20:>8.1f}MB"
+            )
+
+        # Upload copy: read() everything vs 1 MB chunks (as in save_upload)
+        upload = os.path.join(tmp, "upload.bin")
+        with open(upload, "wb") as f:
+            f.write(os.urandom(20 * 2**20))
+
+        def buffered():
+            with open(upload, "rb") as src, open(os.path.join(tmp, "a"), "wb") as dst:
+                dst.write(src.read())
+
+        def chunked():
+            with open(upload, "rb") as src, open(os.path.join(tmp, "b"), "wb") as dst:
+                while chunk := src.read(2**20):
+                    dst.write(chunk)
+
+        _, _, buffered_peak = measure(buffered)
+        _, _, chunked_peak = measure(chunked)
+        print(f"20MB upload copy peak: read() {buffered_peak / 2**20:.1f}MB, chunked {chunked_peak / 2**20:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Benchmark: per-candidate calculate_match_score loop vs vectorized rank_matrix
+# (the scorer behind score_resumes); both decode the stored embeddings
+# Run from the repo root: python -m benchmarks.rank_benchmark
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.embedding_codec import decode_embedding, encode_embedding
+from app.services.match_engine import calculate_match_score, rank_matrix, vector_matrix
+
+DIM = 384
+SKILLS = ["python", "java", "sql", "django", "fastapi", "react", "docker", "aws"]
+WORDS = ["experience", "team", "project", "built", "api", "data", "cloud", "lead"]
+
+
+def make_resume(rng):
+    words = rng.choices(WORDS + SKILLS, k=400)
+    return SimpleNamespace(
+        embedding=encode_embedding(np.random.rand(DIM)),
+        extracted_text=" ".join(words)
+    )
+
+
+def main():
+    rng = random.Random(0)
+    job = SimpleNamespace(
+        embedding=encode_embedding(np.random.rand(DIM)),
+        required_skills="python, sql, docker, kubernetes"
+    )
+
+    print(f"{'applicants':>10} {'loop (s)':>10} {'batch (s)':>10} {'speedup':>8}")
+    for n in [100, 500, 1000, 2000, 5000]:
+        resumes = [make_resume(rng) for _ in range(n)]
+
+        start = time.perf_counter()
+        loop_scores = [calculate_match_score(r, job) for r in resumes]
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_scores = rank_matrix(
+            vector_matrix([decode_embedding(r.embedding) for r in resumes], DIM),
+            [r.extracted_text for r in resumes],
+            decode_embedding(job.embedding),
+            job.required_skills
+        )
+        batch_time = time.perf_counter() - start
+
+        assert np.allclose(loop_scores, batch_scores, atol=0.01)
+        print(f"{n:>10} {loop_time:>10.4f} {batch_time:>10.4f} {loop_time / batch_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Benchmark: the /rank endpoint, exhaustive vs two-stage (top_k), on a
+# throwaway SQLite database. Two states of the applicant pool:
+#   stale: first rank after a job edit or scoring change, every score stale
+#   fresh: every stored score current (the usual case, scores are stored at
+#          apply time)
+# Reports latency, rows rescored and overlap of the two-stage top_k with the
+# exhaustive top_k.
+# Run from the repo root: python -m benchmarks.rank_endpoint_benchmark
+import os
+import random
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='rank-benchmark-')}/rank.db"
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("WARM_UP_MODELS", "0")
+
+import numpy as np
+from fastapi import Response
+
+from app import models
+from app.database import Base, SessionLocal, engine
+from app.main import rank_candidates
+from app.services.embedding_codec import encode_embedding
+from app.services.match_engine import encode_chunk_embeddings
+from app.services.match_scoring import refresh_stale_scores
+from app.services.skill_index import build_skill_index
+from benchmarks.two_stage_rank_benchmark import DIM, REQUIRED, make_pool
+
+TOP_K = 50
+CHUNKS = 4
+
+# The endpoint without the heavy-executor wrapper
+rank = rank_candidates.__wrapped__
+
+
+def make_job(db, n, rng, np_rng):
+    job_vector = np_rng.standard_normal(DIM).astype(np.float32)
+    job = models.Job(title=f"Pool {n}", description="", required_skills=REQUIRED,
+                     embedding=encode_embedding(job_vector), version=1)
+    db.add(job)
+    db.flush()
+
+    matrix, texts, _ = make_pool(n, job_vector, rng, np_rng)
+    users = [{"name": f"c{job.id}-{i}", "email": f"c{job.id}-{i}@example.com", "role": "candidate"} for i in range(n)]
+    db.execute(models.User.__table__.insert(), users)
+    user_ids = [row.id for row in db.query(models.User.id).filter(models.User.name.like(f"c{job.id}-%")).order_by(models.User.id)]
+
+    resumes = []
+    for user_id, vector, text in zip(user_ids, matrix, texts):
+        chunks = vector + np_rng.standard_normal((CHUNKS, DIM)).astype(np.float32)
+        embedding, chunk_embeddings = encode_chunk_embeddings(chunks)
+        resumes.append({
+            "user_id": user_id, "extracted_text": text, "skill_index": build_skill_index(text),
+            "embedding": embedding, "chunk_embeddings": chunk_embeddings,
+            "processing_status": "ready", "version": 1
+        })
+    db.execute(models.Resume.__table__.insert(), resumes)
+    db.execute(models.MatchResult.__table__.insert(), [
+        {"user_id": user_id, "job_id": job.id, "status": "applied"} for user_id in user_ids
+    ])
+    db.commit()
+    return job.id
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def mark_stale(db, job_id):
+    db.query(models.MatchResult).filter(models.MatchResult.job_id == job_id).update({"score_version": None})
+    db.commit()
+
+
+def top_users(response):
+    return {row["user_id"] for row in response["ranked_candidates"]}
+
+
+def main():
+    Base.metadata.create_all(engine)
+    # MySQL (InnoDB) indexes foreign keys implicitly, SQLite does not; without
+    # this the MatchResult -> Resume join on user_id is a full scan per row
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE INDEX ix_resumes_user_id ON resumes (user_id)")
+    rng = random.Random(0)
+    np_rng = np.random.default_rng(0)
+    db = SessionLocal()
+
+    print(f"{'applicants':>10} {'state':>6} {'prefilter_n':>11} {'exhaustive (s)':>15} "
+          f"{'two-stage (s)':>14} {'speedup':>8} {'rescored':>9} {'overlap@' + str(TOP_K):>11}")
+    for n in [500, 2000]:
+        job_id = make_job(db, n, rng, np_rng)
+        # Warm the embedding cache and compute the exact ranking
+        refresh_stale_scores(db, db.get(models.Job, job_id))
+        db.commit()
+
+        for prefilter_n in [200, 1000]:
+            for state in ["stale", "fresh"]:
+                if state == "stale":
+                    mark_stale(db, job_id)
+                exhaustive, exhaustive_s = timed(lambda: rank(
+                    job_id, Response(), limit=TOP_K, db=db, current_user=None
+                ))
+
+                if state == "stale":
+                    mark_stale(db, job_id)
+                two_stage, two_stage_s = timed(lambda: rank(
+                    job_id, Response(), limit=TOP_K, top_k=TOP_K, prefilter_n=prefilter_n, db=db, current_user=None
+                ))
+                # Leave every score current for the next state
+                refresh_stale_scores(db, db.get(models.Job, job_id))
+                db.commit()
+
+                overlap = len(top_users(exhaustive) & top_users(two_stage)) / TOP_K
+                print(
+                    f"{n:>10} {state:>6} {prefilter_n:>11} {exhaustive_s:>15.4f} {two_stage_s:>14.4f} "
+                    f"{exhaustive_s / two_stage_s:>7.1f}x {two_stage['rescored']:>9} {overlap:>11.2f}"
+                )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Benchmark: import time and peak RSS of app.main with lazy vs eager model loading
+# Run from the repo root: python -m benchmarks.startup_benchmark
+# PRELOAD_MODELS=1 reproduces the old behaviour of loading the model at import time.
+import json
+import os
+import subprocess
+import sys
+
+SNIPPET = """
+import json, resource, time
+start = time.perf_counter()
+import app.main
+from app.services.model_registry import is_loaded
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "model_loaded": is_loaded("embedding"),
+}))
+"""
+
+MODES = [
+    ("lazy (default)", {}),
+    ("eager (PRELOAD_MODELS=1)", {"PRELOAD_MODELS": "1"}),
+]
+RUNS = 3
+
+
+def measure(extra_env):
+    env = {**os.environ, **extra_env}
+    env.setdefault("DATABASE_URL", "sqlite://")
+    out = subprocess.run(
+        [sys.executable, "-c", SNIPPET],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    for label, extra_env in MODES:
+        runs = [measure(extra_env) for _ in range(RUNS)]
+        seconds = min(r["seconds"] for r in runs)
+        rss = min(r["max_rss_mb"] for r in runs)
+        print(f"{label:<28} import {seconds:6.2f}s  max RSS {rss:7.1f} MB  model loaded: {runs[0]['model_loaded']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Benchmark: exhaustive hybrid ranking vs two-stage ranking (cheap prefilter,
+# exact rescoring of the top prefilter_n) — time, speedup and overlap of the
+# top_k with the exhaustive top_k
+# Run from the repo root: python -m benchmarks.two_stage_rank_benchmark
+import random
+import time
+
+import numpy as np
+
+from app.services.match_engine import prefilter_scores, rank_matrix, top_n
+from app.services.skill_index import build_skill_index
+
+DIM = 384
+TOP_K = 50
+SKILLS = ["python", "java", "sql", "django", "fastapi", "react", "docker", "aws",
+          "kubernetes", "machine learning", "go", "rust", "spark", "airflow", "terraform"]
+WORDS = ["experience", "team", "project", "built", "api", "data", "cloud", "lead",
+         "designed", "services", "scalable", "production", "customers", "platform"]
+REQUIRED = "python, sql, docker, kubernetes, aws"
+
+
+def make_pool(n, job_vector, rng, np_rng):
+    # Candidates closer to the job in embedding space tend to list more of its skills
+    affinity = np_rng.random(n)
+    noise = np_rng.standard_normal((n, DIM)).astype(np.float32)
+    matrix = affinity[:, None] * job_vector * 3 + noise
+
+    texts, indexes = [], []
+    required = [s.strip() for s in REQUIRED.split(",")]
+    for a in affinity:
+        skills = [s for s in required if rng.random() < 0.2 + 0.6 * a]
+        skills += rng.sample(SKILLS, 3)
+        text = " ".join(rng.choices(WORDS, k=250) + skills)
+        texts.append(text)
+        indexes.append(build_skill_index(text))
+    return matrix, texts, indexes
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(0)
+    np_rng = np.random.default_rng(0)
+    job_vector = np_rng.standard_normal(DIM).astype(np.float32)
+
+    print(f"{'applicants':>10} {'prefilter':>10} {'n':>6} {'exhaustive (s)':>15} {'two-stage (s)':>14} {'speedup':>8} {'overlap@' + str(TOP_K):>11}")
+    for n in [2000, 10000, 30000]:
+        matrix, texts, indexes = make_pool(n, job_vector, rng, np_rng)
+
+        scores, exhaustive_s = timed(lambda: rank_matrix(matrix, texts, job_vector, REQUIRED, indexes))
+        exact_top = set(top_n(scores, TOP_K).tolist())
+
+        for mode in ["embedding", "skills"]:
+            for prefilter_n in [200, 1000]:
+                def two_stage():
+                    cheap = prefilter_scores(mode, matrix, job_vector, indexes, REQUIRED)
+                    keep = top_n(cheap, prefilter_n)
+                    rescored = rank_matrix(
+                        matrix[keep],
+                        [texts[i] for i in keep],
+                        job_vector,
+                        REQUIRED,
+                        [indexes[i] for i in keep]
+                    )
+                    return keep[top_n(rescored, TOP_K)]
+
+                top, two_stage_s = timed(two_stage)
+                overlap = len(exact_top & set(top.tolist())) / TOP_K
+                print(
+                    f"{n:>10} {mode:>10} {prefilter_n:>6} {exhaustive_s:>15.4f} {two_stage_s:>14.4f} "
+                    f"{exhaustive_s / two_stage_s:>7.1f}x {overlap:>11.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
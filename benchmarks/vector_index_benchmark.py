@@ -0,0 +1,62 @@
+# Benchmark: recall@10 and query latency of the exact vs IVF job index
+# Run from the repo root: python -m benchmarks.vector_index_benchmark
+import time
+
+import numpy as np
+
+from app.services.vector_index import BruteForceIndex, IVFIndex
+
+DIM = 384
+K = 10
+QUERIES = 200
+
+
+def clustered_vectors(rng, n, n_clusters=200):
+    # Job descriptions cluster by role/domain; uniform noise would make any ANN look bad
+    centers = rng.standard_normal((n_clusters, DIM)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, size=n)
+    return centers[labels] + 0.6 * rng.standard_normal((n, DIM)).astype(np.float32)
+
+
+def build(index, vectors):
+    start = time.perf_counter()
+    for i, vector in enumerate(vectors):
+        index.add(i + 1, vector)
+    return time.perf_counter() - start
+
+
+def run_queries(index, queries):
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        ids, _ = index.search(query, K)
+        results.append(set(ids))
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    for n in [10_000, 100_000]:
+        vectors = clustered_vectors(rng, n)
+        queries = clustered_vectors(rng, QUERIES)
+
+        exact = BruteForceIndex()
+        exact_build = build(exact, vectors)
+        truth, exact_ms = run_queries(exact, queries)
+        print(f"\n{n} jobs  exact: build {exact_build:.2f}s, {exact_ms:.3f} ms/query")
+
+        for n_probe in [4, 8, 16, 32]:
+            ivf = IVFIndex(n_probe=n_probe)
+            ivf_build = build(ivf, vectors)
+            found, ivf_ms = run_queries(ivf, queries)
+            recall = np.mean([len(f & t) / K for f, t in zip(found, truth)])
+            print(
+                f"  ivf n_probe={n_probe:<3} build {ivf_build:.2f}s, "
+                f"{ivf_ms:.3f} ms/query, recall@{K} {recall:.3f}, "
+                f"speedup {exact_ms / ivf_ms:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
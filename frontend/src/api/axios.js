@@ -32,4 +32,18 @@ API.interceptors.response.use(
   }
 );
 
+// Listings are paginated: follow the X-Next-Cursor header until the last page
+export const getAllPages = async (url, params = {}) => {
+  const items = [];
+  let cursor;
+
+  do {
+    const res = await API.get(url, { params: { ...params, cursor } });
+    items.push(...res.data);
+    cursor = res.headers["x-next-cursor"];
+  } while (cursor);
+
+  return items;
+};
+
 export default API;
@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import API from "../api/axios";
+import API, { getAllPages } from "../api/axios";
 import useAuth from "../hooks/useAuth";
 import { useNavigate } from "react-router-dom";
 
@@ -30,8 +30,7 @@ const CandidateDashboard = () => {
   // 🔥 Fetch Jobs
   const fetchJobs = async () => {
     try {
-      const res = await API.get("/jobs");
-      setJobs(res.data);
+      setJobs(await getAllPages("/jobs"));
     } catch (err) {
       console.error(err);
     }
@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import API from "../api/axios";
+import API, { getAllPages } from "../api/axios";
 import useAuth from "../hooks/useAuth";
 import { useNavigate } from "react-router-dom";
 
@@ -26,8 +26,7 @@ const RecruiterDashboard = () => {
 
   const loadJobs = async () => {
     try {
-      const res = await API.get("/my-jobs");
-      setJobs(res.data);
+      setJobs(await getAllPages("/my-jobs"));
     } catch (err) {
       console.error(err);
     }
@@ -71,8 +70,7 @@ const RecruiterDashboard = () => {
   const fetchApplications = async (jobId) => {
     try {
       setSelectedJob(jobId);
-      const res = await API.get(`/job-applications/${jobId}`);
-      setApplications(res.data);
+      setApplications(await getAllPages(`/job-applications/${jobId}`));
     } catch (err) {
       console.error(err);
     }
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import zlib
+
+import numpy as np
+import pytest
+
+# The app reads its settings at import time
+_TMP = tempfile.mkdtemp(prefix="resume-matcher-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/test.db"
+os.environ["RESUME_STORAGE_DIR"] = os.path.join(_TMP, "uploads")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("ASYNC_DB", "0")
+os.environ.setdefault("WARM_UP_MODELS", "0")
+
+
+class FakeEmbeddingModel:
+    # Deterministic stand-in for the sentence-transformers model
+    def encode(self, texts, batch_size=None):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        vectors = np.array([
+            np.random.default_rng(zlib.crc32(text.encode())).random(384, dtype=np.float32)
+            for text in texts
+        ])
+        return vectors[0] if single else vectors
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.services import model_registry
+    model_registry.register_model("embedding", lambda: FakeEmbeddingModel())
+
+    from app.main import app
+
+    # One client for the whole session: shutdown stops the shared executors
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(client):
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
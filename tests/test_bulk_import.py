@@ -0,0 +1,57 @@
+import pytest
+
+from app import models
+from app.bulk_import import insert_extractions, read_candidates, resolve_users
+
+
+def write_csv(tmp_path, text):
+    path = tmp_path / "candidates.csv"
+    path.write_text(text)
+    return str(path)
+
+
+def test_read_candidates(tmp_path):
+    path = write_csv(tmp_path, "email,filename,name\nAda@Example.com,a.pdf,Ada L\nbob@example.com,dir/b.pdf,\n")
+    assert read_candidates(path) == {
+        "a.pdf": ("ada@example.com", "Ada L"),
+        "dir/b.pdf": ("bob@example.com", "bob")
+    }
+
+
+@pytest.mark.parametrize("text", [
+    "email,name\na@example.com,A\n",
+    "email,filename\na@example.com,a.pdf\nb@example.com,a.pdf\n",
+    "email,filename\na@example.com,a.pdf\nA@example.com,b.pdf\n",
+    "email,filename\n,a.pdf\n"
+])
+def test_read_candidates_rejects_bad_rows(tmp_path, text):
+    with pytest.raises(ValueError):
+        read_candidates(write_csv(tmp_path, text))
+
+
+def test_resolve_users_creates_and_links_candidates(db):
+    db.add(models.User(name="Old", email="import-old@example.com", password="x", role="candidate"))
+    db.add(models.User(name="Rec", email="import-rec@example.com", password="x", role="recruiter"))
+    db.commit()
+
+    emails = {"import-old@example.com": "Old", "import-new@example.com": "New", "import-rec@example.com": "Rec"}
+    user_ids = resolve_users(db, emails, "hash")
+    db.commit()
+
+    assert set(user_ids) == {"import-old@example.com", "import-new@example.com"}
+    created = db.get(models.User, user_ids["import-new@example.com"])
+    assert (created.name, created.role) == ("New", "candidate")
+    # Reruns link the same accounts
+    assert resolve_users(db, emails, "hash") == user_ids
+
+
+def test_insert_extractions_skips_rows_cached_concurrently(db):
+    def row(text):
+        return {"content_hash": "f" * 64, "extraction_version": "test", "extracted_text": text}
+
+    insert_extractions(db, [row("from the API")])
+    insert_extractions(db, [row("from the import")])
+    db.commit()
+
+    cached = db.query(models.ResumeExtraction).filter(models.ResumeExtraction.content_hash == "f" * 64).one()
+    assert cached.extracted_text == "from the API"
@@ -0,0 +1,24 @@
+import numpy as np
+
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embedding_codec import encode_embedding
+
+
+def test_job_vector_of_another_version_is_reloaded():
+    cache = EmbeddingCache()
+    stored = {1: encode_embedding(np.ones(4, dtype=np.float32))}
+    loads = []
+
+    def loader(job_ids):
+        loads.append(job_ids)
+        return {job_id: stored[job_id] for job_id in job_ids}
+
+    assert cache.get_job_vectors([(1, 1)], loader)[0].tolist() == [1.0] * 4
+    cache.get_job_vectors([(1, 1)], loader)
+    assert loads == [[1]]
+
+    # A job edit bumps Job.version: the old entry is a miss and gets replaced
+    stored[1] = encode_embedding(np.full(4, 2, dtype=np.float32))
+    assert cache.get_job_vector(1, 2, lambda: stored[1]).tolist() == [2.0] * 4
+    assert cache.stats()["cached_jobs"] == 1
+    assert cache.job_bytes == 16
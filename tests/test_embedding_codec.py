@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+import pytest
+
+from app.services.embedding_codec import (
+    HEADER,
+    decode_embedding,
+    decode_embedding_matrix,
+    decode_header,
+    encode_embedding,
+    encode_embedding_matrix,
+    is_binary_embedding
+)
+
+VECTOR = np.random.default_rng(0).standard_normal(384).astype(np.float32)
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("float32", 0), ("float16", 1e-2), ("int8", 2e-2)])
+def test_vector_round_trip(dtype, tolerance):
+    blob = encode_embedding(VECTOR, dtype=dtype)
+    assert is_binary_embedding(blob)
+    assert decode_header(blob)["dim"] == 384
+    np.testing.assert_allclose(decode_embedding(blob), VECTOR, atol=tolerance * np.abs(VECTOR).max())
+
+
+def test_float32_blob_size():
+    assert len(encode_embedding(VECTOR, dtype="float32")) == HEADER.size + 384 * 4
+
+
+def test_legacy_json_embeddings_still_decode():
+    legacy = json.dumps(VECTOR.tolist())
+    assert not is_binary_embedding(legacy)
+    np.testing.assert_allclose(decode_embedding(legacy), VECTOR, rtol=1e-6)
+
+
+def test_unknown_dtype_is_rejected():
+    with pytest.raises(ValueError):
+        encode_embedding(VECTOR, dtype="int4")
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_matrix_round_trip(dtype):
+    matrix = np.random.default_rng(1).standard_normal((5, 384)).astype(np.float32)
+    matrix[2] *= 100  # int8 rows are scaled one by one
+    decoded = decode_embedding_matrix(encode_embedding_matrix(matrix, dtype=dtype))
+    assert decoded.shape == (5, 384)
+    if dtype == "float32":
+        np.testing.assert_array_equal(decoded, matrix)
+    for row, expected in zip(decoded, matrix):
+        np.testing.assert_allclose(row, expected, atol=2e-2 * np.abs(expected).max())
+
+
+def test_matrix_rejects_vector_blob():
+    with pytest.raises(ValueError):
+        decode_embedding_matrix(encode_embedding(VECTOR))
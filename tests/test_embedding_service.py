@@ -0,0 +1,35 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.services.embedding_service import EmbeddingBatcher
+
+
+def test_concurrent_submissions_share_a_batch():
+    release = threading.Event()
+    batches = []
+
+    def encode(texts):
+        release.wait(5)
+        batches.append(list(texts))
+        return np.array([[len(text)] for text in texts], dtype=np.float32)
+
+    batcher = EmbeddingBatcher(encode, max_batch=32, max_wait_ms=50)
+    first = batcher.submit_many(["a", "bb"])
+    second = batcher.submit_many(["ccc"])
+    release.set()
+
+    assert [v[0] for v in first.result(5)] == [1, 2]
+    assert [v[0] for v in second.result(5)] == [3]
+    assert batches == [["a", "bb", "ccc"]]
+    assert batcher.submit_many([]).result() == []
+
+
+def test_encode_errors_reach_every_caller():
+    def encode(texts):
+        raise RuntimeError("model unavailable")
+
+    batcher = EmbeddingBatcher(encode, max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        batcher.embed_many(["a", "b"])
@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app import main, models
+from app.services.ingestion import IngestionPipeline
+from tests.test_query_counts import make_candidate
+
+
+def test_rescore_errors_do_not_fail_a_saved_resume(client, db, monkeypatch):
+    user, _ = make_candidate(db)
+    resume = db.query(models.Resume).filter(models.Resume.user_id == user.id).one()
+    resume.ingestion_id = "ingestion-1"
+    db.commit()
+
+    def broken_refresh(db, user_id):
+        raise RuntimeError("scoring unavailable")
+    monkeypatch.setattr(main, "refresh_user_scores", broken_refresh)
+
+    result = {
+        "text": "new text",
+        "skills": ["python"],
+        "skill_index": resume.skill_index,
+        "embedding": resume.embedding,
+        "chunk_embeddings": resume.chunk_embeddings
+    }
+    main.on_resume_ingested(resume.id, "new.pdf", "hash-1", cache_result=False)("ingestion-1", result)
+
+    db.refresh(resume)
+    assert (resume.processing_status, resume.extracted_text, resume.version) == ("ready", "new text", 2)
+
+
+
+def broken_pool():
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    with pytest.raises(BrokenProcessPool):
+        executor.submit(os._exit, 1).result()
+    return executor
+
+
+def test_broken_pool_is_replaced(client):
+    pipeline = IngestionPipeline(workers=1)
+    dead = broken_pool()
+    pipeline.executor = dead
+    failures = queue.Queue()
+
+    pipeline.submit("ingestion-2", "/nonexistent.pdf", 1, lambda *args: None, lambda i, e: failures.put(e))
+
+    # The replacement pool ran the parse, which fails on the missing file
+    assert isinstance(failures.get(timeout=60), FileNotFoundError)
+    assert pipeline.executor is not dead
+    pipeline.shutdown()
+
+
+def test_upload_marks_resume_failed_when_the_pool_stays_broken(client, db, monkeypatch):
+    user, headers = make_candidate(db)
+    pipeline = main.ingestion_pipeline
+    monkeypatch.setattr(pipeline, "_pool", broken_pool)
+
+    with pytest.raises(BrokenProcessPool):
+        client.post(
+            "/upload-resume",
+            files={"file": ("resume.pdf", b"%PDF-1.4 not cached " + os.urandom(8), "application/pdf")},
+            headers=headers
+        )
+
+    resume = db.query(models.Resume).filter(models.Resume.user_id == user.id).one()
+    assert resume.processing_status == "failed"
+    assert pipeline.status(resume.ingestion_id)["status"] == "failed"
@@ -0,0 +1,76 @@
+import pytest
+from fastapi import HTTPException
+
+from app import models
+from app.pagination import (
+    MAX_PAGE_SIZE,
+    after_id,
+    after_score,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    page_size
+)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(34.62, 17)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == [34.62, 17]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(1), encode_cursor("a", "b", "c")])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 2)
+    assert error.value.status_code == 400
+
+
+def test_page_size_is_clamped():
+    assert page_size(0) > 0
+    assert page_size(10 ** 6) == MAX_PAGE_SIZE
+
+
+def collect_pages(make_query, paginate, cursor_of, limit):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = fetch_page(paginate(make_query(), cursor), limit, cursor_of)
+        seen.extend(row.id for row in rows)
+        if cursor is None:
+            return seen
+
+
+def test_score_pages_with_ties_return_every_row_once(db):
+    job = models.Job(title="Pagination", description="", required_skills="")
+    db.add(job)
+    db.flush()
+    # Large tie groups, larger than a page
+    scores = [34.62] * 7 + [80.1] * 5 + [12.0, None]
+    db.add_all([models.MatchResult(job_id=job.id, score=score) for score in scores])
+    db.commit()
+
+    def make_query():
+        return db.query(models.MatchResult.id, models.MatchResult.score).filter(
+            models.MatchResult.job_id == job.id,
+            models.MatchResult.score.isnot(None)
+        )
+
+    seen = collect_pages(
+        make_query,
+        lambda query, cursor: after_score(query, models.MatchResult.score, models.MatchResult.id, cursor),
+        lambda row: (row.score, row.id),
+        limit=3
+    )
+    expected = [row.id for row in make_query().order_by(
+        models.MatchResult.score.desc(), models.MatchResult.id.desc()
+    )]
+    assert seen == expected
+    assert len(seen) == 13
+
+    by_id = collect_pages(
+        make_query,
+        lambda query, cursor: after_id(query, models.MatchResult.id, cursor),
+        lambda row: (row.id,),
+        limit=4
+    )
+    assert by_id == sorted(expected)
@@ -0,0 +1,120 @@
+import itertools
+
+from app import models
+from app.auth import create_access_token
+from app.passwords import hash_password
+from app.query_counter import assert_max_queries, count_queries
+from app.services.match_engine import encode_chunk_embeddings
+from app.services.resume_chunker import chunk_resume
+from app.services.skill_index import build_skill_index
+from tests.conftest import FakeEmbeddingModel
+
+_ids = itertools.count()
+RESUME_TEXT = "Summary\nBackend engineer, python sql docker\nExperience\nBuilt fastapi services on aws {n}"
+
+
+def make_user(db, role):
+    n = next(_ids)
+    user = models.User(
+        name=f"{role}{n}",
+        email=f"{role}{n}@example.com",
+        password=hash_password("pw"),
+        role=role
+    )
+    db.add(user)
+    db.commit()
+    return user, {"Authorization": "Bearer " + create_access_token({"sub": user.email})}
+
+
+def make_candidate(db):
+    user, headers = make_user(db, "candidate")
+    text = RESUME_TEXT.format(n=user.id)
+    embedding, chunk_embeddings = encode_chunk_embeddings(
+        FakeEmbeddingModel().encode(chunk_resume(text))
+    )
+    db.add(models.Resume(
+        user_id=user.id,
+        extracted_text=text,
+        extracted_skills="python, sql, docker",
+        skill_index=build_skill_index(text),
+        embedding=embedding,
+        chunk_embeddings=chunk_embeddings,
+        processing_status="ready",
+        version=1
+    ))
+    db.commit()
+    return user, headers
+
+
+def make_job(client, recruiter_headers):
+    response = client.post(
+        "/create-job",
+        params={"title": "Backend", "description": "python services", "required_skills": "python, sql, kubernetes"},
+        headers=recruiter_headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["job_id"]
+
+
+def job_with_applicants(client, db, applicants):
+    _, recruiter = make_user(db, "recruiter")
+    job_id = make_job(client, recruiter)
+    for _ in range(applicants):
+        _, headers = make_candidate(db)
+        assert client.post(f"/apply/{job_id}", headers=headers).status_code == 200
+    return job_id, recruiter
+
+
+def queries_for(request):
+    with count_queries() as counter:
+        response = request()
+    assert response.status_code == 200, response.text
+    return counter.count
+
+
+def test_job_applications_query_count_is_constant(client, db):
+    counts = []
+    for applicants in (2, 8):
+        job_id, recruiter = job_with_applicants(client, db, applicants)
+        for sort in ("id", "score"):
+            counts.append(queries_for(
+                lambda: client.get(f"/job-applications/{job_id}", params={"sort": sort}, headers=recruiter)
+            ))
+    assert counts[:2] == counts[2:]
+
+    with assert_max_queries(counts[0]):
+        client.get(f"/job-applications/{job_id}", headers=recruiter)
+
+
+def test_my_applications_query_count_is_constant(client, db):
+    _, recruiter = make_user(db, "recruiter")
+    _, candidate = make_candidate(db)
+
+    counts = {}
+    applied = 0
+    for jobs in (2, 8):
+        while applied < jobs:
+            job_id = make_job(client, recruiter)
+            assert client.post(f"/apply/{job_id}", headers=candidate).status_code == 200
+            applied += 1
+        counts[jobs] = queries_for(lambda: client.get("/my-applications", headers=candidate))
+    assert counts[2] == counts[8]
+
+
+def test_rank_query_count_is_constant(client, db):
+    fresh, stale = [], []
+    for applicants in (2, 8):
+        job_id, recruiter = job_with_applicants(client, db, applicants)
+        fresh.append(queries_for(lambda: client.post(f"/rank/{job_id}", headers=recruiter)))
+
+        # Stale scores are recomputed in bulk, not per row
+        db.query(models.MatchResult).filter(models.MatchResult.job_id == job_id).update(
+            {"score_version": None}
+        )
+        db.commit()
+        stale.append(queries_for(lambda: client.post(f"/rank/{job_id}", headers=recruiter)))
+
+        ranked = client.post(f"/rank/{job_id}", headers=recruiter).json()["ranked_candidates"]
+        assert len(ranked) == applicants
+    assert fresh[0] == fresh[1]
+    assert stale[0] == stale[1]
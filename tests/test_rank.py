@@ -0,0 +1,51 @@
+from app import models
+from tests.test_query_counts import job_with_applicants
+
+
+def two_stage(client, job_id, recruiter, **params):
+    response = client.post(f"/rank/{job_id}", params=params, headers=recruiter)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_two_stage_matches_the_full_ranking_without_a_prefilter_cut(client, db):
+    job_id, recruiter = job_with_applicants(client, db, 6)
+    full = client.post(f"/rank/{job_id}", headers=recruiter).json()["ranked_candidates"]
+
+    result = two_stage(client, job_id, recruiter, top_k=3, prefilter_n=6)
+    assert result["ranked_candidates"] == full[:3]
+    assert result["rescored"] == 0
+
+
+def test_prefilter_covers_current_and_stale_scores(client, db):
+    job_id, recruiter = job_with_applicants(client, db, 6)
+
+    # Scores stored at apply time are current: stage one still cuts the pool
+    result = two_stage(client, job_id, recruiter, top_k=2, prefilter_n=3)
+    assert len(result["ranked_candidates"]) == 2
+    assert result["rescored"] == 0
+
+    # Only the prefilter survivors are rescored
+    db.query(models.MatchResult).filter(models.MatchResult.job_id == job_id).update({"score_version": None})
+    db.commit()
+    result = two_stage(client, job_id, recruiter, top_k=2, prefilter_n=3)
+    assert result["rescored"] == 3
+    stale = db.query(models.MatchResult).filter(
+        models.MatchResult.job_id == job_id, models.MatchResult.score_version.is_(None)
+    ).count()
+    assert stale == 3
+
+
+def test_rank_pages_follow_the_cursor_header(client, db):
+    job_id, recruiter = job_with_applicants(client, db, 5)
+    full = client.post(f"/rank/{job_id}", headers=recruiter).json()["ranked_candidates"]
+
+    pages, params = [], {"limit": 2}
+    while True:
+        response = client.post(f"/rank/{job_id}", params=params, headers=recruiter)
+        assert "next_cursor" not in response.json()
+        pages.extend(response.json()["ranked_candidates"])
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert pages == full
@@ -0,0 +1,52 @@
+import io
+import threading
+import time
+
+import PyPDF2
+import pytest
+
+from app.services.resume_parser import extract_text_from_pdf, iter_pdf_pages, time_limit
+
+
+def test_time_limit_interrupts_a_running_call():
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        with time_limit(0.2):
+            while True:
+                pass
+    assert time.monotonic() - started < 2
+
+
+def test_time_limit_is_cleared_on_exit():
+    with time_limit(0.1):
+        pass
+    time.sleep(0.2)
+
+
+def blank_pdf(pages):
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_every_page_is_streamed():
+    assert len(list(iter_pdf_pages(blank_pdf(120)))) == 120
+
+
+def test_page_deadline_applies_outside_the_main_thread():
+    errors = []
+
+    def extract():
+        try:
+            extract_text_from_pdf(blank_pdf(3), timeout=0)
+        except TimeoutError as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=extract)
+    worker.start()
+    worker.join()
+    assert len(errors) == 1
@@ -0,0 +1,25 @@
+import io
+
+from app import models
+from app.services.resume_storage import collect_garbage, store_upload
+from tests.test_query_counts import make_candidate
+
+
+def test_gc_keeps_blobs_of_uploads_still_being_ingested(db, tmp_path):
+    root = str(tmp_path)
+    _, current = store_upload(io.BytesIO(b"%PDF current"), 1024, root)
+    _, pending = store_upload(io.BytesIO(b"%PDF re-upload"), 1024, root)
+    _, orphan = store_upload(io.BytesIO(b"%PDF orphan"), 1024, root)
+
+    user, _ = make_candidate(db)
+    resume = db.query(models.Resume).filter(models.Resume.user_id == user.id).one()
+    resume.file_path = current
+    resume.pending_file_path = pending
+    resume.processing_status = "processing"
+    db.commit()
+
+    result = collect_garbage(db, grace_s=-1, root=root)
+    db.commit()
+
+    assert result["removed_files"] == 1
+    assert [path for path in (current, pending, orphan) if (tmp_path / path).exists()] == [current, pending]
@@ -0,0 +1,82 @@
+import numpy as np
+
+from app import models
+from app.services.score_sketch import (
+    BIN_WIDTH,
+    ScoreHistogram,
+    job_key,
+    load_global_sketch,
+    load_sketch,
+    rebuild_score_sketches,
+    update_score_sketches
+)
+from tests.test_query_counts import make_candidate, make_job, make_user
+
+
+def test_quantiles_are_within_half_a_bin():
+    scores = np.random.default_rng(0).uniform(0, 100, 5000)
+    sketch = ScoreHistogram.from_scores(scores)
+    assert sketch.count == 5000
+    for q in (0.1, 0.5, 0.9, 0.99):
+        assert abs(sketch.quantile(q) - np.quantile(scores, q)) <= BIN_WIDTH
+
+
+def test_empty_sketch():
+    sketch = ScoreHistogram()
+    assert sketch.quantile(0.5) is None
+    assert sketch.percentile_rank(50) is None
+
+
+def test_percentile_rank_and_histogram():
+    sketch = ScoreHistogram.from_scores([10, 20, 30, 40, None])
+    assert sketch.count == 4
+    assert sketch.percentile_rank(30) == 62.5  # two below, ties count half
+    assert [bucket["count"] for bucket in sketch.histogram()][:5] == [0, 1, 1, 1, 1]
+
+
+def test_merge_and_bytes_round_trip():
+    a = ScoreHistogram.from_scores([1, 2, 3])
+    b = ScoreHistogram.from_scores([99.99, 100])
+    merged = ScoreHistogram.from_bytes(a.merge(b).to_bytes())
+    assert merged.count == 5
+    assert merged.quantile(1.0) == 99.95
+
+
+def test_updates_and_global_merge(db):
+    job = models.Job(title="Sketch", description="", required_skills="")
+    db.add(job)
+    db.flush()
+    db.add_all([models.MatchResult(job_id=job.id, score=score) for score in (40, 60)])
+    db.flush()
+    rebuild_score_sketches(db, [job.id])
+    db.commit()
+
+    # 60 -> 90 and one new application at 75
+    update_score_sketches(db, job.id, [(60, 90), (None, 75)])
+    db.commit()
+
+    sketch = load_sketch(db, job_key(job.id))
+    assert sketch.count == 3
+    assert sketch.percentile_rank(90) > sketch.percentile_rank(75) > sketch.percentile_rank(40)
+
+    overall = load_global_sketch(db, ttl_s=0)
+    assert overall.count == sum(
+        row.count for row in db.query(models.ScoreSketch.count).filter(models.ScoreSketch.key.like("job:%"))
+    )
+
+
+def test_distribution_is_limited_to_the_job_owner_and_admins(client, db):
+    _, recruiter = make_user(db, "recruiter")
+    job_id = make_job(client, recruiter)
+    candidate, candidate_headers = make_candidate(db)
+    assert client.post(f"/apply/{job_id}", headers=candidate_headers).status_code == 200
+    _, other_recruiter = make_user(db, "recruiter")
+    _, admin = make_user(db, "admin")
+
+    url = f"/job-analytics/{job_id}/distribution"
+    assert client.get(url, headers=candidate_headers).status_code == 403
+    assert client.get(url, headers=other_recruiter).status_code == 403
+    assert client.get(url, headers=admin).status_code == 200
+    response = client.get(url, params={"user_id": candidate.id}, headers=recruiter)
+    assert response.status_code == 200
+    assert response.json()["candidate"]["user_id"] == candidate.id
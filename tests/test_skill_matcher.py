@@ -0,0 +1,26 @@
+from app.services.skill_matcher import SkillMatcher, compile_skills, tokenize
+
+
+def test_tokenize_keeps_skill_punctuation():
+    assert tokenize("C++, C# and Node.js. Then ASP.NET.") == ["c++", "c#", "and", "node.js", "then", "asp.net"]
+
+
+def test_matches_whole_tokens_only():
+    matcher = SkillMatcher(["java", "sql", "c++"])
+    assert matcher.matched("JavaScript and MySQL") == []
+    assert matcher.matched("Java, SQL and C++") == ["java", "sql", "c++"]
+
+
+def test_multi_word_skills():
+    matcher = SkillMatcher(["machine learning", "machine vision", "learning"])
+    assert matcher.matched("applied machine learning") == ["machine learning", "learning"]
+    assert matcher.matched("a machine that is learning") == ["learning"]
+
+
+def test_empty_skills_and_text():
+    assert SkillMatcher(["", "  "]).matched("anything") == []
+    assert SkillMatcher(["python"]).matched(None) == []
+
+
+def test_compiled_matchers_are_cached():
+    assert compile_skills(("python", "go")) is compile_skills(("python", "go"))
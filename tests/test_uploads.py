@@ -0,0 +1,16 @@
+from app.main import MAX_UPLOAD_BYTES
+from tests.test_query_counts import make_user
+
+
+def test_oversized_upload_is_refused_before_the_body_is_read(client, db):
+    _, headers = make_user(db, "candidate")
+    response = client.post(
+        "/upload-resume",
+        content=b"",
+        headers={
+            **headers,
+            "Content-Length": str(MAX_UPLOAD_BYTES * 2),
+            "Content-Type": "multipart/form-data; boundary=x"
+        }
+    )
+    assert response.status_code == 413